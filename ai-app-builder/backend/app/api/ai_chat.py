@@ -1,15 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
+import asyncio
+import json
+import time
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
-from app.services.ai_agent import AIAgentService
+from app.services.ai_agent import get_ai_agent
+from app.services.llm_scheduler import Priority, llm_priority_floor
+from app.services.usage_ledger import usage_ledger
+from app.services.project_index import project_index
 from app.api.auth import oauth2_scheme
 from app.core.security import verify_token
 
 router = APIRouter()
-ai_agent = AIAgentService()
+ai_agent = get_ai_agent()
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """Get current user from token."""
@@ -60,9 +68,11 @@ async def chat_with_user(
         
         # Add user ID to context
         context["user_id"] = str(current_user.id)
+        # Files of the user's project most relevant to the message are added to the prompt
+        project_id = project_index.load_for_user(context["project_id"], current_user.id, db) if context.get("project_id") else None
         
         # Use AI agent to generate response
-        response = await ai_agent.chat_with_user(message, context)
+        response = await ai_agent.chat_with_user(message, context, project_id)
         
         return {
             "success": True,
@@ -82,6 +92,44 @@ async def chat_with_user(
             detail=f"Chat failed: {str(e)}"
         )
 
+@router.post("/chat/stream")
+async def chat_with_user_stream(
+    message_data: Dict[str, Any],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Chat with AI assistant, streaming the reply as Server-Sent Events.
+    Each event is a JSON object: {"type": "token", "content": ...}, then {"type": "done"}.
+    """
+    message = message_data.get("message", "")
+    context = message_data.get("context", {})
+    
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Message is required"
+        )
+    
+    # Add user ID to context
+    context["user_id"] = str(current_user.id)
+    # Files of the user's project most relevant to the message are added to the prompt
+    project_id = project_index.load_for_user(context["project_id"], current_user.id, db) if context.get("project_id") else None
+    
+    async def event_stream():
+        try:
+            async for chunk in ai_agent.chat_with_user_stream(message, context, project_id):
+                yield f"data: {json.dumps({'type': 'token', 'content': chunk})}\n\n"
+            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'type': 'error', 'message': f'Chat failed: {str(e)}'})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/explain")
 async def explain_concept(
     explanation_data: Dict[str, Any],
@@ -105,7 +153,9 @@ async def explain_concept(
         context["user_id"] = str(current_user.id)
         
         # Use AI agent to explain concept
-        explanation = await ai_agent.explain_concept(concept, context)
+        explanation = await ai_agent.explain_concept(
+            concept, context, use_cache=explanation_data.get("use_cache", True)
+        )
         
         return {
             "success": True,
@@ -286,7 +336,9 @@ async def generate_documentation(
         context = {"user_id": str(current_user.id)}
         
         # Use AI agent to generate documentation
-        documentation = await ai_agent.generate_documentation(project_data)
+        documentation = await ai_agent.generate_documentation(
+            project_data, use_cache=doc_data.get("use_cache", True)
+        )
         
         return {
             "success": True,
@@ -329,4 +381,171 @@ async def suggest_improvements(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Improvement suggestions failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+async def run_batch_operation(operation: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """Run one /batch item through the same agent method as its single endpoint."""
+    name = operation.get("operation", "")
+    context = dict(operation.get("context") or {})
+    context["user_id"] = user_id
+    
+    if name in ("debug", "optimize", "security-review") and not operation.get("code"):
+        raise ValueError("Code is required")
+    
+    if name == "debug":
+        debug_result = await ai_agent.debug_code(operation["code"], operation.get("error", ""), context)
+        return {"debug_result": debug_result}
+    elif name == "optimize":
+        optimization_result = await ai_agent.optimize_code(operation["code"], context)
+        return {
+            "optimized_code": optimization_result.get("optimized_code", ""),
+            "improvements": optimization_result.get("improvements", [])
+        }
+    elif name == "security-review":
+        security_review_result = await ai_agent.review_code_security(operation["code"], context)
+        return {
+            "security_review": security_review_result.get("review", ""),
+            "vulnerabilities": security_review_result.get("vulnerabilities_found", [])
+        }
+    elif name == "explain":
+        if not operation.get("concept"):
+            raise ValueError("Concept to explain is required")
+        explanation = await ai_agent.explain_concept(
+            operation["concept"], context, use_cache=operation.get("use_cache", True)
+        )
+        return {"explanation": explanation}
+    elif name == "architecture-analysis":
+        if not operation.get("description"):
+            raise ValueError("Project description is required")
+        architecture_result = await ai_agent.analyze_project_architecture(
+            operation["description"], operation.get("tech_stack", {})
+        )
+        return {"architecture_analysis": architecture_result.get("analysis", "")}
+    elif name == "generate-documentation":
+        documentation = await ai_agent.generate_documentation(
+            operation.get("project_data", {}), use_cache=operation.get("use_cache", True)
+        )
+        return {"documentation": documentation}
+    elif name == "suggest-improvements":
+        suggestions_result = await ai_agent.suggest_improvements(
+            operation.get("project_data", {}), operation.get("feedback", "")
+        )
+        return {"suggestions": suggestions_result.get("suggestions", "")}
+    
+    raise ValueError(f"Unsupported operation: {name or '(missing)'}")
+
+@router.post("/batch")
+async def run_batch(
+    batch_data: Dict[str, Any],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Run many AI operations in one request, streaming results as NDJSON.
+    Body: {"operations": [{"id": ..., "operation": "debug" | "optimize" | "security-review" | "explain" |
+    "architecture-analysis" | "generate-documentation" | "suggest-improvements", ...fields of that endpoint}],
+    "concurrency": n}. One line is emitted per operation as it completes, then a summary line.
+    """
+    operations = batch_data.get("operations")
+    if not isinstance(operations, list) or not operations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A non-empty list of operations is required"
+        )
+    if len(operations) > settings.AI_BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.AI_BATCH_MAX_OPERATIONS} operations are allowed per batch"
+        )
+    try:
+        concurrency = int(batch_data.get("concurrency", settings.AI_BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        concurrency = settings.AI_BATCH_CONCURRENCY
+    concurrency = max(1, min(concurrency, settings.AI_BATCH_CONCURRENCY))
+    
+    user_id = str(current_user.id)
+    
+    async def result_stream():
+        # Everything this batch triggers queues behind interactive traffic
+        llm_priority_floor.set(Priority.BATCH)
+        semaphore = asyncio.Semaphore(concurrency)
+        started_at = time.monotonic()
+        
+        async def run(index: int, operation: Any) -> Dict[str, Any]:
+            item = {
+                "type": "result",
+                "index": index,
+                "id": operation.get("id") if isinstance(operation, dict) else None,
+                "operation": operation.get("operation") if isinstance(operation, dict) else None
+            }
+            async with semaphore:
+                item_started_at = time.monotonic()
+                try:
+                    if not isinstance(operation, dict):
+                        raise ValueError("Each operation must be an object")
+                    item["result"] = await run_batch_operation(operation, user_id)
+                    item["success"] = True
+                except Exception as e:
+                    item["success"] = False
+                    item["error"] = str(e)
+                item["duration_ms"] = round((time.monotonic() - item_started_at) * 1000)
+            return item
+        
+        tasks = [asyncio.ensure_future(run(index, operation)) for index, operation in enumerate(operations)]
+        succeeded = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                item = await next_result
+                succeeded += 1 if item["success"] else 0
+                yield json.dumps(item) + "\n"
+            yield json.dumps({
+                "type": "summary",
+                "total": len(tasks),
+                "succeeded": succeeded,
+                "failed": len(tasks) - succeeded,
+                "duration_ms": round((time.monotonic() - started_at) * 1000)
+            }) + "\n"
+        finally:
+            # Stop outstanding work if the client disconnects
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+@router.get("/usage")
+async def get_llm_usage(
+    period: str = "hour",
+    group_by: str = "endpoint",
+    since_hours: int = 24,
+    limit: int = 20,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    LLM token usage and latency from the hourly/daily rollups, heaviest first.
+    group_by: endpoint, user_id, provider or model. Superusers see every user, others only themselves.
+    """
+    if period not in ("hour", "day"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="period must be 'hour' or 'day'")
+    if group_by not in ("endpoint", "user_id", "provider", "model"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="group_by must be one of endpoint, user_id, provider, model"
+        )
+    
+    user_filter = None if current_user.is_superuser else current_user.id
+    rows = usage_ledger.summarize(
+        db,
+        period=period,
+        group_by=group_by,
+        since_hours=max(1, since_hours),
+        user_id=user_filter,
+        limit=max(1, min(limit, 100))
+    )
+    return {
+        "success": True,
+        "period": period,
+        "group_by": group_by,
+        "since_hours": since_hours,
+        "usage": rows
+    }
@@ -1,24 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 from typing import List, Dict, Any
 import json
-import os
 from sqlalchemy.orm import Session
-from pathlib import Path
 
 # Fix the import paths - use absolute imports
 from app.core.database import get_db
 from app.core.security import verify_token
 from app.models.user import User
 from app.models.project import Project, ProjectStatus, ProjectType
-from app.models.project_file import ProjectFile  # Add this import
-from app.services.ai_agent import AIAgentService
+from app.services.ai_agent import get_ai_agent
 from app.services.code_generator import CodeGenerator
 from app.services.deployer import DeployerService
+from app.services.analysis_pipeline import analysis_pipeline
+from app.services.project_index import project_index
+from app.services.project_files import save_project_file_stream, iter_files, stored_content_hashes, delete_project_files
 
 router = APIRouter()
 security = HTTPBearer()
-ai_agent = AIAgentService()
+ai_agent = get_ai_agent()
 code_generator = CodeGenerator()
 deployer = DeployerService()
 
@@ -41,6 +42,16 @@ async def get_current_user(token: str = Depends(security), db: Session = Depends
     
     return user
 
+def get_pipeline_run(analysis_id: str, current_user: User):
+    """Look up a stored analysis of the current user, or raise 404."""
+    run = analysis_pipeline.get(analysis_id, current_user.id)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found or expired, please analyze the request again"
+        )
+    return run
+
 @router.post("/analyze")
 async def analyze_request(
     request_data: Dict[str, Any],
@@ -49,6 +60,9 @@ async def analyze_request(
 ):
     """
     Analyze user request and provide project specification.
+    With "pipeline": true the analysis is kept under an analysis_id, and the stack
+    recommendations and next steps start computing right away in the background
+    (fetch them from /analysis/{analysis_id}, or pass analysis_id to /generate).
     """
     try:
         user_request = request_data.get("request", "")
@@ -59,21 +73,44 @@ async def analyze_request(
             )
         
         # Use AI agent to analyze the request
-        analysis = await ai_agent.analyze_request(user_request)
+        analysis = await ai_agent.analyze_request(
+            user_request, use_cache=request_data.get("use_cache", True)
+        )
         
-        return {
+        response_data = {
             "success": True,
             "analysis": analysis,
             "estimated_time": "2-5 minutes",
             "complexity": analysis.get("complexity", "medium")
         }
+        if request_data.get("pipeline"):
+            run = analysis_pipeline.start(ai_agent, current_user.id, user_request, analysis)
+            response_data["analysis_id"] = run.analysis_id
         
+        return response_data
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Analysis failed: {str(e)}"
         )
 
+@router.get("/analysis/{analysis_id}")
+async def get_pipeline_analysis(
+    analysis_id: str,
+    wait: float = 0,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get a pipelined analysis with its stack recommendations and next steps.
+    Waits up to `wait` seconds for background steps that are still running.
+    """
+    run = get_pipeline_run(analysis_id, current_user)
+    result = await analysis_pipeline.result(run, wait=max(0.0, min(wait, 60.0)))
+    return {"success": True, **result}
+
 @router.post("/generate")
 async def generate_project(
     project_data: Dict[str, Any],
@@ -87,6 +124,11 @@ async def generate_project(
         project_name = project_data.get("name", "")
         user_request = project_data.get("request", "")
         analysis = project_data.get("analysis", {})
+        if project_data.get("analysis_id"):
+            # Pipelined analysis from /analyze: no need to re-upload it
+            run = get_pipeline_run(project_data["analysis_id"], current_user)
+            analysis = run.analysis
+            user_request = user_request or run.user_request
         tech_stack = project_data.get("tech_stack", {})
         auto_deploy = project_data.get("auto_deploy", False)  # New parameter for auto deployment
         deploy_platform = project_data.get("deploy_platform", "docker")  # Default to docker
@@ -134,11 +176,33 @@ async def generate_project(
             project.status = ProjectStatus.BUILDING
             db.commit()
             
-            # Use AI agent to generate complete project with custom tech stack
-            generated_project = await ai_agent.generate_project(analysis, project_name, tech_stack)
+            analysis_task = None
+            if analysis:
+                # Use AI agent to generate complete project with custom tech stack; files are
+                # saved as each generation stage finishes instead of after the whole project
+                generated_project, files = await ai_agent.generate_project_stream(analysis, project_name, tech_stack)
+            else:
+                # No analysis from /analyze: stream it; generation starts once its inputs are
+                # known and the rest of the analysis arrives while the files are saved
+                analysis_task, generated_project, files = await ai_agent.analyze_and_generate_stream(
+                    user_request, project_name, tech_stack
+                )
+            project.frontend_framework = generated_project["tech_stack"]["frontend"]
+            project.backend_framework = generated_project["tech_stack"]["backend"]
+            project.database_type = generated_project["tech_stack"]["database"]
             
             # Save generated files to disk and database
-            project_path = await save_project_files(project.id, generated_project["files"], db)
+            try:
+                project_path, files_generated = await save_project_file_stream(project.id, files, db)
+                if analysis_task is not None:
+                    analysis = await analysis_task
+                    project.description = analysis.get("description", "")
+                    project.project_type = ProjectType(analysis["project_type"])
+                    project.features = analysis.get("features", [])
+                    project.integrations = analysis.get("integrations", [])
+            finally:
+                if analysis_task is not None and not analysis_task.done():
+                    analysis_task.cancel()
             
             # Update project with file path
             project.project_path = project_path
@@ -160,7 +224,7 @@ async def generate_project(
                     "created_at": project.created_at.isoformat(),
                     "project_path": project_path
                 },
-                "files_generated": len(generated_project["files"]),
+                "files_generated": files_generated,
                 "message": f"🎉 {project_name} has been successfully generated!"
             }
             
@@ -276,7 +340,8 @@ async def modify_project(
             )
         
         modification_request = modification_data.get("request", "")
-        if not modification_request:
+        changes = modification_data.get("changes")
+        if not modification_request and not changes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Modification request is required"
@@ -286,8 +351,25 @@ async def modify_project(
         project.status = ProjectStatus.BUILDING
         db.commit()
         
-        # Use AI agent to modify project
-        modification_result = await ai_agent.modify_project(project_id, modification_request)
+        # Use AI agent to work out which files the modification changes
+        modification_result = await ai_agent.modify_project(
+            project_analysis(project),
+            modification_request,
+            changes,
+            stored_content_hashes(project_id, db)
+        )
+        
+        # Write only the changed files
+        manifest = modification_result["manifest"]
+        project.project_path = await save_changed_files(project.id, modification_result["files"], manifest["removed"], db)
+        updated = modification_result["analysis"]
+        project.project_type = ProjectType(updated["project_type"])
+        project.description = updated.get("description") or project.description
+        project.features = updated.get("features", [])
+        project.integrations = updated.get("integrations", [])
+        project.frontend_framework = updated["tech_stack"]["frontend"]
+        project.backend_framework = updated["tech_stack"]["backend"]
+        project.database_type = updated["tech_stack"]["database"]
         
         # Update project status
         project.status = ProjectStatus.ACTIVE
@@ -296,8 +378,14 @@ async def modify_project(
         return {
             "success": True,
             "project_id": project_id,
-            "modifications": modification_result,
-            "message": "Project successfully modified!"
+            "modifications": {
+                "changes": modification_result["changes"],
+                "stages": modification_result["stages"],
+                "manifest": manifest
+            },
+            "files_changed": len(manifest["changed"]),
+            "files_removed": len(manifest["removed"]),
+            "message": "Project successfully modified!" if modification_result["changes"] else "No changes were needed."
         }
         
     except HTTPException:
@@ -408,8 +496,8 @@ async def create_from_template(
         project.status = ProjectStatus.BUILDING
         db.commit()
         
-        generated_project = await ai_agent.generate_project(analysis, project_name)
-        project_path = await save_project_files(project.id, generated_project["files"], db)
+        _, files = await ai_agent.generate_project_stream(analysis, project_name)
+        project_path, _ = await save_project_file_stream(project.id, files, db)
         
         project.project_path = project_path
         project.status = ProjectStatus.ACTIVE
@@ -532,7 +620,18 @@ async def recommend_technology_stack(
     Get technology stack recommendations based on project analysis.
     """
     try:
-        analysis = analysis_data.get("analysis", {})
+        if analysis_data.get("analysis_id"):
+            # Computed in the background since /analyze
+            run = get_pipeline_run(analysis_data["analysis_id"], current_user)
+            result = await analysis_pipeline.result(run, steps=["recommendations"])
+            if result["recommendations"] is not None:
+                return {
+                    "success": True,
+                    "recommendations": result["recommendations"]
+                }
+            analysis = run.analysis
+        else:
+            analysis = analysis_data.get("analysis", {})
         if not analysis:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -544,6 +643,8 @@ async def recommend_technology_stack(
             "success": True,
             "recommendations": recommendations
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -562,6 +663,8 @@ async def generate_project_with_custom_stack(
     try:
         project_name = project_data.get("name", "")
         analysis = project_data.get("analysis", {})
+        if project_data.get("analysis_id"):
+            analysis = get_pipeline_run(project_data["analysis_id"], current_user).analysis
         frontend_framework = project_data.get("frontend_framework", "react")
         backend_framework = project_data.get("backend_framework", "fastapi")
         database = project_data.get("database", "mysql")
@@ -742,46 +845,32 @@ async def save_project_files(project_id: int, files: Dict[str, str], db: Session
     """
     Save generated project files to disk and database.
     """
-    project_dir = Path(f"generated_projects/project_{project_id}")
-    project_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Clear existing files for this project
-    db.query(ProjectFile).filter(ProjectFile.project_id == project_id).delete()
-    
-    saved_files = []
-    
-    for file_path, content in files.items():
-        try:
-            full_path = project_dir / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write file to disk
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Save file info to database
-            file_record = ProjectFile(
-                project_id=project_id,
-                file_path=file_path,
-                file_name=os.path.basename(file_path),
-                file_content=content[:65535] if content else "",  # Limit content size for database
-                file_type=os.path.splitext(file_path)[1][1:] if '.' in file_path else '',
-                file_size=len(content) if content else 0
-            )
-            db.add(file_record)
-            saved_files.append(file_record)
-            
-        except Exception as e:
-            print(f"Error saving file {file_path}: {str(e)}")
-            # Continue with other files even if one fails
-    
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise Exception(f"Failed to save files to database: {str(e)}")
-    
-    return str(project_dir.absolute())
+    project_path, _ = await save_project_file_stream(project_id, iter_files(files), db)
+    return project_path
+
+def project_analysis(project: Project) -> Dict[str, Any]:
+    """The generation inputs stored on a project, in the shape of an analysis."""
+    project_type = project.project_type
+    return {
+        "project_type": project_type.value if isinstance(project_type, ProjectType) else str(project_type or "web_app"),
+        "description": project.description or "",
+        "features": project.features or [],
+        "integrations": project.integrations or [],
+        "tech_stack": {
+            "frontend": project.frontend_framework or "react",
+            "backend": project.backend_framework or "fastapi",
+            "database": project.database_type or "mysql"
+        }
+    }
+
+async def save_changed_files(project_id: int, files: Dict[str, str], removed: List[str], db: Session) -> str:
+    """
+    Write changed and new files to disk and database and delete removed ones,
+    leaving the project's other files alone.
+    """
+    project_path, _ = await save_project_file_stream(project_id, iter_files(files), db, replace=False)
+    delete_project_files(project_id, removed, db)
+    return project_path
 
 # Add the missing chat endpoint
 @router.post("/chat")
@@ -805,9 +894,11 @@ async def chat_with_ai(
         
         # Add user ID to context for conversation history tracking
         context["user_id"] = current_user.id
+        # Files of the user's project most relevant to the message are added to the prompt
+        project_id = project_index.load_for_user(context["project_id"], current_user.id, db) if context.get("project_id") else None
         
         # Use AI agent to generate response with enhanced context
-        response = await ai_agent.chat_with_user(message, context)
+        response = await ai_agent.chat_with_user(message, context, project_id)
         
         return {
             "success": True,
@@ -821,6 +912,43 @@ async def chat_with_ai(
             detail=f"Chat failed: {str(e)}"
         )
 
+@router.post("/chat/stream")
+async def chat_with_ai_stream(
+    chat_data: Dict[str, Any],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Chat with AI assistant, streaming tokens as Server-Sent Events as they arrive.
+    """
+    message = chat_data.get("message", "")
+    context = chat_data.get("context", {})
+    
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Message is required"
+        )
+    
+    # Add user ID to context for conversation history tracking
+    context["user_id"] = current_user.id
+    # Files of the user's project most relevant to the message are added to the prompt
+    project_id = project_index.load_for_user(context["project_id"], current_user.id, db) if context.get("project_id") else None
+    
+    async def event_stream():
+        try:
+            async for chunk in ai_agent.chat_with_user_stream(message, context, project_id):
+                yield f"data: {json.dumps({'type': 'token', 'content': chunk})}\n\n"
+            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'type': 'error', 'message': f'Chat failed: {str(e)}'})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/suggest-improvements")
 async def suggest_improvements(
     improvement_data: Dict[str, Any],
@@ -862,7 +990,9 @@ async def generate_documentation(
         project_data = doc_data.get("project_data", {})
         
         # Use AI agent to generate documentation
-        documentation = await ai_agent.generate_documentation(project_data)
+        documentation = await ai_agent.generate_documentation(
+            project_data, use_cache=doc_data.get("use_cache", True)
+        )
         
         return {
             "success": True,
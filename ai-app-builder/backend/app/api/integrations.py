@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from typing import List, Dict, Any
+import asyncio
 import json
 from sqlalchemy.orm import Session
 
@@ -8,11 +9,18 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import verify_token
 from app.models.user import User
-from app.services.ai_agent import AIAgentService
+from app.services.ai_agent import get_ai_agent
+from app.services.integrations.deepseek_service import DeepSeekService
+from app.services.integrations.errors import (
+    LLMProviderError,
+    ProviderNotConfiguredError,
+    ProviderRateLimitError,
+    ProviderTimeoutError
+)
 
 router = APIRouter()
 security = HTTPBearer()
-ai_agent = AIAgentService()
+ai_agent = get_ai_agent()
 
 async def get_current_user(token: str = Depends(security), db: Session = Depends(get_db)) -> User:
     """Get current authenticated user."""
@@ -33,6 +41,19 @@ async def get_current_user(token: str = Depends(security), db: Session = Depends
     
     return user
 
+def provider_http_error(error: LLMProviderError, action: str) -> HTTPException:
+    """Map a typed provider failure to the HTTP status the client should see."""
+    if isinstance(error, ProviderNotConfiguredError):
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    elif isinstance(error, ProviderRateLimitError):
+        status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    elif isinstance(error, ProviderTimeoutError):
+        status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    else:
+        # Rejected keys, exhausted quota and provider outages are upstream failures, not the caller's
+        status_code = status.HTTP_502_BAD_GATEWAY
+    return HTTPException(status_code=status_code, detail=f"{action} failed: {error.message}")
+
 @router.post("/stripe/create-payment-intent")
 async def create_stripe_payment_intent(
     payment_data: Dict[str, Any],
@@ -258,26 +279,21 @@ async def generate_code_with_deepseek(
                 detail="Prompt is required"
             )
         
-        result = await ai_agent.deepseek_service.generate_code(
-            prompt=prompt,
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature
+        result = await ai_agent.complete_with_provider(
+            "deepseek", "", prompt, model, max_tokens, temperature, endpoint="code"
         )
         
-        if not result["success"]:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Code generation failed: {result['error']}"
-            )
-        
         return {
             "success": True,
-            "code": result["code"],
-            "model": result["model"],
-            "usage": result["usage"]
+            "code": str(result),
+            "model": result.model,
+            "usage": result.usage
         }
         
+    except HTTPException:
+        raise
+    except LLMProviderError as e:
+        raise provider_http_error(e, "Code generation")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -305,28 +321,34 @@ async def explain_code_with_deepseek(
                 detail="Code and explanation request are required"
             )
         
-        result = await ai_agent.deepseek_service.explain_code(
-            code=code,
-            explanation_request=explanation_request,
-            model=model,
-            max_tokens=max_tokens
+        result = await ai_agent.complete_with_provider(
+            "deepseek", "", DeepSeekService.explain_prompt(code, explanation_request), model, max_tokens, 0.3, endpoint="explain"
         )
         
-        if not result["success"]:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Code explanation failed: {result['error']}"
-            )
-        
         return {
             "success": True,
-            "explanation": result["explanation"],
-            "model": result["model"],
-            "usage": result["usage"]
+            "explanation": str(result),
+            "model": result.model,
+            "usage": result.usage
         }
         
+    except HTTPException:
+        raise
+    except LLMProviderError as e:
+        raise provider_http_error(e, "Code explanation")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Code explanation failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/llm/health")
+async def llm_providers_health(current_user: User = Depends(get_current_user)):
+    """
+    Probe every LLM provider (a models listing call) and report reachability and latency.
+    """
+    results = await asyncio.gather(*(service.health() for service in ai_agent.llm_services.values()))
+    return {
+        "providers": {result["provider"]: result for result in results},
+        "healthy": any(result["healthy"] for result in results)
+    }
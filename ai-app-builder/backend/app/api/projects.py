@@ -10,6 +10,7 @@ from app.core.security import verify_token
 from app.models.user import User
 from app.models.project import Project, ProjectStatus, ProjectType
 from app.models.project_file import ProjectFile
+from app.services.project_index import project_index
 
 router = APIRouter()
 security = HTTPBearer()
@@ -225,6 +226,7 @@ async def delete_project(
     
     db.delete(project)
     db.commit()
+    project_index.drop(project_id)
     
     return {
         "success": True,
@@ -9,6 +9,7 @@ from ..core.database import get_db
 from ..core.security import verify_token
 from ..models.user import User
 from ..services.realtime_creator import RealTimeProjectCreator
+from ..services.usage_ledger import usage_ledger
 
 router = APIRouter()
 security = HTTPBearer()
@@ -99,7 +100,9 @@ async def websocket_project_creation(websocket: WebSocket, session_id: str):
                     project_data = message.get("project_data", {})
                     project_data["user_id"] = user.id
                     
-                    # Start real-time project creation
+                    # Start real-time project creation; the HTTP middleware does not see
+                    # websockets, so LLM usage is attributed to the user here
+                    usage_token = usage_ledger.attribute(user_id=user.id, route=websocket.url.path)
                     try:
                         await realtime_creator.create_project_realtime(
                             session_id, 
@@ -111,6 +114,8 @@ async def websocket_project_creation(websocket: WebSocket, session_id: str):
                             "type": "creation_error",
                             "message": f"Project creation failed: {str(e)}"
                         }))
+                    finally:
+                        usage_ledger.reset(usage_token)
                 
                 elif message.get("type") == "cancel_creation":
                     # Handle cancellation request
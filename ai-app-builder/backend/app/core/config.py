@@ -38,8 +38,114 @@ class Settings(BaseSettings):
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
-    # AI Services - Only OpenRouter now
+    # AI Services - OpenRouter, with DeepSeek and Gemini as optional extra providers
     OPENROUTER_API_KEY: Optional[str] = os.getenv("OPENROUTER_API_KEY")
+    DEEPSEEK_API_KEY: Optional[str] = os.getenv("DEEPSEEK_API_KEY")
+    GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
+    
+    # Shared HTTP connection pool for LLM providers
+    LLM_HTTP2: bool = os.getenv("LLM_HTTP2", "true").lower() == "true"
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    LLM_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+    LLM_REQUEST_TIMEOUT: float = float(os.getenv("LLM_REQUEST_TIMEOUT", "30"))
+    LLM_CONNECT_TIMEOUT: float = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+    LLM_POOL_TIMEOUT: float = float(os.getenv("LLM_POOL_TIMEOUT", "10"))
+    
+    # LLM transport: live, record (save exchanges to a cassette), replay (serve the cassette) or fake (synthetic)
+    LLM_TRANSPORT_MODE: str = os.getenv("LLM_TRANSPORT_MODE", "live").lower()
+    LLM_CASSETTE_PATH: str = os.getenv("LLM_CASSETTE_PATH", "llm_cassette.jsonl")
+    LLM_FAKE_LATENCY_MS: float = float(os.getenv("LLM_FAKE_LATENCY_MS", "200"))
+    LLM_FAKE_JITTER_MS: float = float(os.getenv("LLM_FAKE_JITTER_MS", "0"))
+    LLM_FAKE_TOKENS: int = int(os.getenv("LLM_FAKE_TOKENS", "200"))
+    LLM_FAKE_TOKENS_PER_SECOND: float = float(os.getenv("LLM_FAKE_TOKENS_PER_SECOND", "50"))
+    
+    # LLM response cache (in-memory LRU backed by a local SQLite file)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+    
+    # LLM rate limiting (token bucket per provider/model, priority queue in front of it)
+    LLM_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("LLM_RATE_LIMIT_PER_MINUTE", "60"))
+    LLM_RATE_LIMIT_BURST: int = int(os.getenv("LLM_RATE_LIMIT_BURST", "10"))
+    LLM_RATE_LIMIT_BACKOFF: float = float(os.getenv("LLM_RATE_LIMIT_BACKOFF", "5"))
+    LLM_RATE_LIMIT_RETRIES: int = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))
+    LLM_QUEUE_MAX_WAIT: float = float(os.getenv("LLM_QUEUE_MAX_WAIT", "20"))
+    
+    # Provider-level retries for transient failures (5xx, 408, dropped connections), full-jitter backoff
+    LLM_RETRY_ATTEMPTS: int = int(os.getenv("LLM_RETRY_ATTEMPTS", "2"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8.0"))
+    
+    # Multi-provider routing (EWMA latency/error rate) and hedged requests
+    LLM_ROUTER_ERROR_THRESHOLD: float = float(os.getenv("LLM_ROUTER_ERROR_THRESHOLD", "0.5"))
+    LLM_ROUTER_COOLDOWN: float = float(os.getenv("LLM_ROUTER_COOLDOWN", "30"))
+    LLM_HEDGING_ENABLED: bool = os.getenv("LLM_HEDGING_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_MIN_DELAY: float = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+    LLM_HEDGE_MAX_DELAY: float = float(os.getenv("LLM_HEDGE_MAX_DELAY", "8.0"))
+    
+    # Per-provider circuit breaker
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    LLM_CIRCUIT_RECOVERY_TIMEOUT: float = float(os.getenv("LLM_CIRCUIT_RECOVERY_TIMEOUT", "30"))
+    LLM_CIRCUIT_HALF_OPEN_CALLS: int = int(os.getenv("LLM_CIRCUIT_HALF_OPEN_CALLS", "1"))
+    
+    # Prompt/completion token budgets
+    LLM_MAX_PROMPT_TOKENS: int = int(os.getenv("LLM_MAX_PROMPT_TOKENS", "6000"))
+    LLM_MIN_OUTPUT_TOKENS: int = int(os.getenv("LLM_MIN_OUTPUT_TOKENS", "256"))
+    
+    # Provider prompt caching: send cache_control hints for the static system prompt prefix
+    LLM_PROMPT_CACHE_HINTS: bool = os.getenv("LLM_PROMPT_CACHE_HINTS", "true").lower() == "true"
+    
+    # LLM usage ledger (per-call rows plus hourly/daily rollups, written in batches)
+    LLM_USAGE_LEDGER_ENABLED: bool = os.getenv("LLM_USAGE_LEDGER_ENABLED", "true").lower() == "true"
+    LLM_USAGE_BATCH_SIZE: int = int(os.getenv("LLM_USAGE_BATCH_SIZE", "100"))
+    LLM_USAGE_FLUSH_INTERVAL: float = float(os.getenv("LLM_USAGE_FLUSH_INTERVAL", "2.0"))
+    LLM_USAGE_QUEUE_SIZE: int = int(os.getenv("LLM_USAGE_QUEUE_SIZE", "10000"))
+    
+    # Chat history: ring buffer per user, LRU cap on users, idle TTL; "sqlite" shares it between workers
+    CONVERSATION_STORE_BACKEND: str = os.getenv("CONVERSATION_STORE_BACKEND", "memory").lower()
+    CONVERSATION_STORE_PATH: str = os.getenv("CONVERSATION_STORE_PATH", "conversations.db")
+    CONVERSATION_MAX_MESSAGES: int = int(os.getenv("CONVERSATION_MAX_MESSAGES", "15"))
+    CONVERSATION_MAX_USERS: int = int(os.getenv("CONVERSATION_MAX_USERS", "10000"))
+    CONVERSATION_IDLE_TTL: int = int(os.getenv("CONVERSATION_IDLE_TTL", "86400"))
+    CONVERSATION_MAX_MESSAGE_CHARS: int = int(os.getenv("CONVERSATION_MAX_MESSAGE_CHARS", "8000"))
+    
+    # Rolling summary: older turns are folded into a summary by a cheap model past this many tokens
+    CONVERSATION_SUMMARY_ENABLED: bool = os.getenv("CONVERSATION_SUMMARY_ENABLED", "true").lower() == "true"
+    CONVERSATION_SUMMARY_THRESHOLD_TOKENS: int = int(os.getenv("CONVERSATION_SUMMARY_THRESHOLD_TOKENS", "1500"))
+    CONVERSATION_SUMMARY_KEEP_RECENT: int = int(os.getenv("CONVERSATION_SUMMARY_KEEP_RECENT", "4"))
+    CONVERSATION_SUMMARY_MODEL: str = os.getenv("CONVERSATION_SUMMARY_MODEL", "mistralai/mistral-7b-instruct")
+    
+    # Client-supplied chat context: whitelisted keys and size caps
+    CONTEXT_MAX_VALUE_CHARS: int = int(os.getenv("CONTEXT_MAX_VALUE_CHARS", "2000"))
+    CONTEXT_MAX_ITEMS: int = int(os.getenv("CONTEXT_MAX_ITEMS", "50"))
+    CONTEXT_MAX_CHARS: int = int(os.getenv("CONTEXT_MAX_CHARS", "12000"))
+    
+    # Project file retrieval for chat: in-memory BM25 index per project, top-k snippets per message
+    PROJECT_INDEX_MAX_PROJECTS: int = int(os.getenv("PROJECT_INDEX_MAX_PROJECTS", "100"))
+    PROJECT_INDEX_CHUNK_LINES: int = int(os.getenv("PROJECT_INDEX_CHUNK_LINES", "40"))
+    PROJECT_INDEX_TOP_K: int = int(os.getenv("PROJECT_INDEX_TOP_K", "4"))
+    PROJECT_INDEX_MAX_SNIPPET_CHARS: int = int(os.getenv("PROJECT_INDEX_MAX_SNIPPET_CHARS", "1500"))
+    
+    # Template code generator: rendered file sets memoized per (project_type, features)
+    CODEGEN_CACHE_ENABLED: bool = os.getenv("CODEGEN_CACHE_ENABLED", "true").lower() == "true"
+    CODEGEN_CACHE_SIZE: int = int(os.getenv("CODEGEN_CACHE_SIZE", "256"))
+    
+    # Generated file sets stored by content hash and reused for identical analysis + stack
+    ARTIFACT_STORE_ENABLED: bool = os.getenv("ARTIFACT_STORE_ENABLED", "true").lower() == "true"
+    ARTIFACT_STORE_PATH: str = os.getenv("ARTIFACT_STORE_PATH", "artifacts.db")
+    ARTIFACT_STORE_MAX_MANIFESTS: int = int(os.getenv("ARTIFACT_STORE_MAX_MANIFESTS", "1000"))
+    ARTIFACT_STORE_MEMORY_ENTRIES: int = int(os.getenv("ARTIFACT_STORE_MEMORY_ENTRIES", "32"))
+    
+    # Builder pipeline: analyses kept under an analysis_id with their background recommendations
+    ANALYSIS_PIPELINE_TTL: int = int(os.getenv("ANALYSIS_PIPELINE_TTL", "1800"))
+    ANALYSIS_PIPELINE_MAX_ENTRIES: int = int(os.getenv("ANALYSIS_PIPELINE_MAX_ENTRIES", "500"))
+    ANALYSIS_PIPELINE_WAIT: float = float(os.getenv("ANALYSIS_PIPELINE_WAIT", "30"))
+    
+    # /api/ai/batch limits
+    AI_BATCH_MAX_OPERATIONS: int = int(os.getenv("AI_BATCH_MAX_OPERATIONS", "200"))
+    AI_BATCH_CONCURRENCY: int = int(os.getenv("AI_BATCH_CONCURRENCY", "4"))
     
     # External APIs
     STRIPE_SECRET_KEY: Optional[str] = os.getenv("STRIPE_SECRET_KEY")
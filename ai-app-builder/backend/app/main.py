@@ -1,9 +1,11 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
+import asyncio
 import traceback
 
 from .core.config import settings
+from .core.security import verify_token
 # Import database components with error handling
 try:
     from .core.database import get_db, create_tables
@@ -24,6 +26,23 @@ except Exception as e:
         print("Database not available, skipping table creation")
 
 from .api import auth, projects, builder, deployment, realtime, ai_chat, integrations
+from .services.integrations.http_client import shared_http_client
+from .services.llm_cache import llm_cache
+from .services.single_flight import llm_single_flight
+from .services.llm_scheduler import llm_scheduler
+from .services.llm_router import llm_router
+from .services.circuit_breaker import circuit_breakers
+from .services.prompt_templates import prompt_templates
+from .services.usage_ledger import usage_ledger
+from .services.analysis_pipeline import analysis_pipeline
+from .services.conversation_store import conversation_store
+from .services.conversation_summarizer import conversation_summarizer
+from .services.context_serializer import context_serializer
+from .services.project_index import project_index
+from .services.code_generator import rendered_file_cache
+from .services.artifact_store import artifact_store
+from .services.pipeline_engine import pipeline_metrics
+from .services.framework_plugins.registry import framework_plugins
 
 # Create FastAPI app
 app = FastAPI(
@@ -44,6 +63,21 @@ app.add_middleware(
 # Security
 security = HTTPBearer()
 
+@app.middleware("http")
+async def attribute_llm_usage(request: Request, call_next):
+    """Tag LLM calls made while handling this request with the caller's user id and the route."""
+    user_id = None
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = verify_token(authorization[7:])
+        if payload and str(payload.get("sub", "")).isdigit():
+            user_id = int(payload["sub"])
+    token = usage_ledger.attribute(user_id=user_id, route=request.url.path)
+    try:
+        return await call_next(request)
+    finally:
+        usage_ledger.reset(token)
+
 # Include routers
 try:
     app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
@@ -64,6 +98,8 @@ async def startup_event():
     try:
         if DATABASE_AVAILABLE:
             create_tables()
+        # Open the pooled HTTP client used for all LLM provider calls
+        await shared_http_client.startup()
         print(f"🚀 {settings.APP_NAME} v{settings.VERSION} started successfully!")
         print(f"📖 API Documentation: http://localhost:8000/docs")
         print(f"🌐 CORS Origins: {settings.CORS_ORIGINS_LIST}")
@@ -72,6 +108,16 @@ async def startup_event():
         print(traceback.format_exc())
         print("Application will start with limited functionality")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared resources on shutdown."""
+    try:
+        # Write pending usage rows before the process exits
+        await usage_ledger.flush()
+        await shared_http_client.shutdown()
+    except Exception as e:
+        print(f"Shutdown error: {e}")
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -108,6 +154,31 @@ async def health_check(db: None = None):
         "timestamp": "2024-01-01T00:00:00Z"
     }
 
+@app.get("/stats")
+async def service_stats():
+    """Runtime statistics for monitoring the AI service layer."""
+    # The artifact store counts its SQLite rows; keep that off the event loop
+    artifact_stats = await asyncio.to_thread(artifact_store.get_stats)
+    return {
+        "http_pool": shared_http_client.get_stats(),
+        "llm_cache": llm_cache.get_stats(),
+        "llm_coalescing": llm_single_flight.get_stats(),
+        "llm_scheduler": llm_scheduler.get_stats(),
+        "llm_routing": llm_router.get_stats(),
+        "circuit_breakers": circuit_breakers.get_stats(),
+        "prompt_templates": prompt_templates.get_stats(),
+        "llm_usage_ledger": usage_ledger.get_stats(),
+        "analysis_pipeline": analysis_pipeline.get_stats(),
+        "conversation_store": conversation_store.get_stats(),
+        "conversation_summarizer": conversation_summarizer.get_stats(),
+        "context_serializer": context_serializer.get_stats(),
+        "project_index": project_index.get_stats(),
+        "rendered_file_cache": rendered_file_cache.get_stats(),
+        "artifact_store": artifact_stats,
+        "pipelines": pipeline_metrics.get_stats(),
+        "framework_plugins": framework_plugins.get_stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Index, UniqueConstraint
+from ..core.database import Base
+
+
+class LLMUsage(Base):
+    """One LLM provider call: tokens, latency and who/what it was made for."""
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(Integer, nullable=True)  # No FK: rows are written in batches off the request path
+    endpoint = Column(String(64), nullable=False)  # Agent operation (chat, analysis, code, ...)
+    route = Column(String(255), nullable=True)  # HTTP path that triggered the call
+    provider = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=True)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    cached_tokens = Column(Integer, default=0)
+    latency_ms = Column(Float, default=0.0)
+    success = Column(Boolean, default=True)
+    error = Column(String(64), nullable=True)  # Error class name for failed calls
+
+    __table_args__ = (
+        Index('idx_llm_usage_created_at', 'created_at'),
+        Index('idx_llm_usage_user_id', 'user_id'),
+    )
+
+
+class _UsageRollupMixin:
+    """
+    Aggregated usage per time bucket, user, endpoint and model.
+
+    The unique key columns are NOT NULL because NULLs never collide in a unique
+    index: calls without a user are stored under user_id 0, calls without a
+    model under model "".
+    """
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(Integer, nullable=False, default=0)
+    endpoint = Column(String(64), nullable=False)
+    provider = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=False, default="")
+    calls = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    cached_tokens = Column(Integer, default=0)
+    total_latency_ms = Column(Float, default=0.0)
+    max_latency_ms = Column(Float, default=0.0)
+
+
+class LLMUsageHourly(_UsageRollupMixin, Base):
+    __tablename__ = "llm_usage_hourly"
+    __table_args__ = (
+        UniqueConstraint('bucket', 'user_id', 'endpoint', 'provider', 'model', name='uq_llm_usage_hourly'),
+    )
+
+
+class LLMUsageDaily(_UsageRollupMixin, Base):
+    __tablename__ = "llm_usage_daily"
+    __table_args__ = (
+        UniqueConstraint('bucket', 'user_id', 'endpoint', 'provider', 'model', name='uq_llm_usage_daily'),
+    )
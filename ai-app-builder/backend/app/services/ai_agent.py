@@ -1,11 +1,43 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable, Tuple
+import asyncio
 import json
 import os
+import time
 from pathlib import Path
 from app.core.config import settings
 from app.services.integrations.openrouter_service import OpenRouterService
+from app.services.integrations.deepseek_service import DeepSeekService
+from app.services.integrations.gemini_service import GeminiService
 from app.services.code_generator import CodeGenerator  # Import the real CodeGenerator
 from app.services.framework_generator import FrameworkGenerator  # Import the real FrameworkGenerator
+from app.services.llm_cache import llm_cache
+from app.services.single_flight import llm_single_flight
+from app.services.llm_scheduler import llm_scheduler, Priority, SchedulerTimeoutError
+from app.services.llm_router import llm_router
+from app.services.circuit_breaker import CircuitBreaker, circuit_breakers
+from app.services.token_budget import token_budget, estimate_tokens, PromptSection
+from app.services.prompt_templates import prompt_templates
+from app.services.usage_ledger import usage_ledger
+from app.services.conversation_store import conversation_store
+from app.services.conversation_summarizer import conversation_summarizer
+from app.services.context_serializer import context_serializer
+from app.services.project_index import project_index, format_snippets
+from app.services.artifact_store import artifact_store
+from app.services.pipeline_engine import Pipeline, Stage
+from app.services.project_diff import LIST_FIELDS, diff_analysis, build_manifest
+from app.services.project_files import iter_files
+from app.services.integrations.completion import CompletionText
+from app.services.streaming_json import StreamingJSONParser, parse_partial_json
+from app.models.project import ProjectType
+from app.services.integrations.errors import (
+    LLMProviderError,
+    ProviderAuthError,
+    ProviderClientError,
+    ProviderQuotaError,
+    ProviderRateLimitError,
+    ProviderTimeoutError,
+    CircuitOpenError
+)
 
 class AIAgentService:
     """
@@ -13,14 +45,42 @@ class AIAgentService:
     This is the brain of the AI App Builder.
     """
     
+    # Display names used in logs and error messages
+    llm_service_names = {
+        "openrouter": "OpenRouter",
+        "deepseek": "DeepSeek",
+        "gemini": "Gemini"
+    }
+    
     def __init__(self):
-        # Remove other services and only use OpenRouter
+        # OpenRouter is the primary service; DeepSeek and Gemini join the routing pool when configured
         self.openrouter_service = OpenRouterService()
+        self.deepseek_service = DeepSeekService()
+        self.gemini_service = GeminiService()
+        self.llm_services = {
+            "openrouter": self.openrouter_service,
+            "deepseek": self.deepseek_service,
+            "gemini": self.gemini_service
+        }
         # Initialize real components
         self.code_generator = CodeGenerator()
         self.framework_generator = FrameworkGenerator()
-        # Conversation history for context
-        self.conversation_history = {}
+        # Template generation: the stages are independent, so the engine runs them side by side
+        self.generation_pipeline = Pipeline("project_files", [
+            # inputs are the analysis fields each stage reads, for incremental regeneration
+            Stage("frontend", lambda context, _: self.code_generator.generate_react_app(context["analysis"]),
+                  inputs=("project_type", "features")),
+            Stage("backend", lambda context, _: self.code_generator.generate_fastapi_app(context["analysis"]),
+                  inputs=("project_type", "features")),
+            Stage("database", lambda context, _: self.code_generator.generate_database_schema(context["analysis"]),
+                  inputs=("project_type", "features")),
+            Stage("deployment", lambda context, _: self.code_generator.generate_deployment_config(context["analysis"]),
+                  inputs=("project_type", "features")),
+            Stage("documentation", lambda context, _: self._generate_readme(context["analysis"]),
+                  inputs=("project_type", "features", "integrations", "tech_stack"))
+        ])
+        # Conversation history for context (bounded, shared by every agent instance)
+        self.conversation_store = conversation_store
         # Set OpenRouter as the active service
         self.active_llm_service = "openrouter"
         # Enhanced capabilities
@@ -36,12 +96,23 @@ class AIAgentService:
         }
         # Add model selection preferences
         self.model_preferences = {
-            "openrouter": "mistralai/mistral-7b-instruct"  # Using a free model
+            "openrouter": "mistralai/mistral-7b-instruct",  # Using a free model
+            "deepseek": "deepseek-chat",
+            "gemini": "gemini-1.5-pro-latest"
+        }
+        # Cheaper models for background work such as conversation summaries
+        self.summary_models = {
+            "openrouter": settings.CONVERSATION_SUMMARY_MODEL,
+            "deepseek": "deepseek-chat",
+            "gemini": "gemini-1.5-flash-latest"
         }
-        # Track if we've detected API issues
-        self.openrouter_api_working = True
         print(f"AI agent initialized with LLM service: {self.active_llm_service}")
     
+    @property
+    def openrouter_api_working(self) -> bool:
+        """False while OpenRouter's circuit breaker is open."""
+        return circuit_breakers.get("openrouter").state != CircuitBreaker.OPEN
+    
     def _determine_best_llm_service(self):
         """
         Determine the best available LLM service based on API key configuration.
@@ -51,49 +122,315 @@ class AIAgentService:
             print("Using OpenRouter as the LLM service")
             return "openrouter"
         
+        # Otherwise use whichever other provider is configured
+        available = self._available_llm_services()
+        if available:
+            print(f"Using {available[0]} as the LLM service")
+            return available[0]
+        
         # Default fallback
         print("No API keys configured for any LLM service")
         return "openrouter"
     
-    async def _generate_response_with_best_service(self, system_prompt: str, user_prompt: str, max_tokens: int = 4000) -> str:
+    def _available_llm_services(self) -> List[str]:
+        """Providers with an API key configured, in preference order."""
+        return [name for name, service in self.llm_services.items() if service.is_configured]
+    
+    @staticmethod
+    def _is_error_response(response: str) -> bool:
+        """Providers raise on failure, so only an empty reply counts as an error."""
+        return not response
+    
+    def _context_window(self) -> int:
+        """Smallest context window among the models a call may be routed to."""
+        providers = self._available_llm_services() or ["openrouter"]
+        return min(token_budget.context_window(self.model_preferences.get(name)) for name in providers)
+    
+    def _describe_provider_error(self, error: Exception) -> str:
+        """Short, user-facing description of a provider failure for the fallback response."""
+        if not isinstance(error, LLMProviderError):
+            return f"LLM service: {error}"
+        service_name = self.llm_service_names.get(error.provider, error.provider)
+        if isinstance(error, CircuitOpenError):
+            return f"{service_name}: Service is failing, requests are paused for {error.retry_in:.0f}s"
+        if isinstance(error, ProviderAuthError):
+            return f"{service_name}: Invalid API key or account not found"
+        if isinstance(error, (ProviderQuotaError, ProviderRateLimitError)):
+            return f"{service_name}: API quota exceeded or rate limit reached"
+        if isinstance(error, ProviderTimeoutError):
+            return f"{service_name}: Request timeout - service is taking too long to respond"
+        if isinstance(error, ProviderClientError):
+            return f"{service_name}: Request rejected (HTTP {error.status_code})"
+        return f"{service_name}: Service unavailable or returned an empty response."
+    
+    async def _generate_response_with_best_service(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = False,
+        priority: Priority = Priority.STANDARD,
+        hedge: bool = False,
+        endpoint: str = "default",
+        models: Optional[Dict[str, str]] = None
+    ) -> str:
         """
-        Generate response using OpenRouter service with fallback to local generation.
+        Generate response using the fastest healthy LLM service with fallback to local generation.
+        With use_cache=True, successful responses are stored in and served from the LLM response cache.
+        The priority decides the call's place in the rate-limit queue; hedge=True allows a second
+        provider to be raced against a slow first one. Unless max_tokens is given, it is sized from
+        the endpoint's budget and the room the prompt leaves in the context window. models overrides
+        the model per provider (e.g. cheaper ones for background work).
         """
-        try:
-            if self.active_llm_service == "openrouter" and settings.OPENROUTER_API_KEY:
-                # Use enhanced parameters for better responses
-                print("Sending request to OpenRouter service...")
-                response = await self.openrouter_service.generate_response(
-                    system_prompt, 
+        model = (models or {}).get("openrouter") or self.model_preferences.get("openrouter", "mistralai/mistral-7b-instruct")
+        temperature = 0.7
+        user_prompt, planned_max_tokens = token_budget.plan(
+            endpoint, system_prompt, user_prompt, self._context_window()
+        )
+        max_tokens = max_tokens or planned_max_tokens
+        
+        request_key = llm_cache.make_key(model, system_prompt, user_prompt, temperature, max_tokens)
+        cache_key = None
+        if use_cache and settings.LLM_CACHE_ENABLED:
+            cache_key = request_key
+            cached_response = await llm_cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
+        
+        # Identical prompts already in flight share one provider call
+        return await llm_single_flight.do(
+            request_key,
+            lambda: self._call_llm_service(
+                system_prompt, user_prompt, max_tokens, temperature, cache_key, priority, hedge, endpoint, models
+            )
+        )
+    
+    def _model_for(self, provider: str, models: Optional[Dict[str, str]] = None) -> Optional[str]:
+        return (models or {}).get(provider) or self.model_preferences.get(provider)
+    
+    @staticmethod
+    def _route_target(provider: str, model: Optional[str]) -> str:
+        """Router key for a provider and model: latency and errors are tracked per model."""
+        return f"{provider}/{model}" if model else provider
+    
+    async def _call_provider(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        priority: Priority,
+        endpoint: str = "default",
+        models: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Call one provider through its circuit breaker and the rate-limit scheduler.
+        A 429 is retried while the queue wait budget lasts. Every request that goes
+        out is recorded in the usage ledger under the endpoint.
+        """
+        service = self.llm_services[provider]
+        model = self._model_for(provider, models)
+        breaker = circuit_breakers.get(provider)
+        deadline = time.monotonic() + settings.LLM_QUEUE_MAX_WAIT
+        attempt = 0
+        while True:
+            # Fails in microseconds while the provider's circuit is open
+            breaker.before_call()
+            started_at = None
+            try:
+                await llm_scheduler.acquire(
+                    provider, model, priority, max_wait=max(0.0, deadline - time.monotonic())
+                )
+                started_at = time.monotonic()
+                llm_router.mark_sent()
+                print(f"Sending request to {self.llm_service_names.get(provider, provider)} service...")
+                response = await service.complete(
+                    system_prompt,
                     user_prompt,
-                    model=self.model_preferences.get("openrouter", "mistralai/mistral-7b-instruct"),
+                    model=model,
                     max_tokens=max_tokens,
-                    temperature=0.7
+                    temperature=temperature
                 )
-                # Check if we got a valid response (not a fallback)
-                if response and not response.startswith("// Fallback") and "insufficient_quota" not in response and "Too Many Requests" not in response and "429" not in response and "User not found" not in response and "Request timeout" not in response:
-                    return response
+            except ProviderRateLimitError as e:
+                breaker.release_probe()
+                usage_ledger.record(provider, model, endpoint, None, (time.monotonic() - started_at) * 1000, type(e).__name__)
+                # Pause the model for Retry-After, then queue up again if there is time left
+                llm_scheduler.report_rate_limited(provider, model, e.retry_after)
+                if attempt < settings.LLM_RATE_LIMIT_RETRIES and time.monotonic() < deadline:
+                    attempt += 1
+                    continue
+                raise
+            except LLMProviderError as e:
+                if started_at is not None:
+                    usage_ledger.record(provider, model, endpoint, None, (time.monotonic() - started_at) * 1000, type(e).__name__)
+                if e.trips_circuit:
+                    breaker.record_failure()
                 else:
-                    # Mark API as not working if we get specific errors
-                    if response and "User not found" in response:
-                        self.openrouter_api_working = False
-                        error_message = "OpenRouter: Invalid API key or account not found"
-                    elif response and ("insufficient_quota" in response or "Too Many Requests" in response or "429" in response):
-                        error_message = "OpenRouter: API quota exceeded or rate limit reached"
-                    elif response and "Request timeout" in response:
-                        error_message = "OpenRouter: Request timeout - service is taking too long to respond"
-                    else:
-                        error_message = "OpenRouter: Service unavailable or returned an empty response."
-                    
-                    return self._generate_fallback_response(error_message)
-                        
+                    breaker.release_probe()
+                raise
+            except BaseException:
+                # Scheduler timeouts and cancellations say nothing about the provider
+                breaker.release_probe()
+                raise
+            breaker.record_success()
+            usage_ledger.record(
+                provider,
+                getattr(response, "model", None) or model,
+                endpoint,
+                getattr(response, "usage", None),
+                (time.monotonic() - started_at) * 1000
+            )
+            return response
+    
+    async def complete_with_provider(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        endpoint: str
+    ) -> str:
+        """
+        One request to a specific provider and model, for endpoints that let the
+        user pick them. Goes through the same breaker, scheduler and usage ledger
+        as routed calls; provider errors are raised rather than mapped to fallback text.
+        """
+        return await self._call_provider(
+            provider, system_prompt, user_prompt, max_tokens, temperature, Priority.INTERACTIVE, endpoint, {provider: model}
+        )
+    
+    async def _call_llm_service(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        cache_key: Optional[str] = None,
+        priority: Priority = Priority.STANDARD,
+        hedge: bool = False,
+        endpoint: str = "default",
+        models: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Route the call to the best configured LLM service and map failures to the fallback response.
+        """
+        providers = self._available_llm_services()
+        if not providers:
+            return self._generate_fallback_response("No active LLM service configured or API key is missing.")
+        
+        # Skip providers whose circuit is open; if all are open, the first one fails fast
+        ready = [name for name in providers if circuit_breakers.get(name).is_available()]
+        targets = {self._route_target(name, self._model_for(name, models)): name for name in ready or providers[:1]}
+        
+        try:
+            target, response = await llm_router.route(
+                list(targets),
+                lambda target: self._call_provider(
+                    targets[target], system_prompt, user_prompt, max_tokens, temperature, priority, endpoint, models
+                ),
+                self._is_error_response,
+                hedge=hedge and settings.LLM_HEDGING_ENABLED
+            )
+        except SchedulerTimeoutError as e:
+            print(f"LLM request not scheduled: {e}")
+            return self._generate_fallback_response("LLM service: Too many requests queued, please try again shortly")
         except Exception as e:
-            # Mark API as not working on exception
-            self.openrouter_api_working = False
-            error_message = f"OpenRouter: {str(e)}"
-            return self._generate_fallback_response(error_message)
+            return self._generate_fallback_response(self._describe_provider_error(e))
+        
+        if not response:
+            provider = targets[target]
+            service_name = self.llm_service_names.get(provider, provider)
+            return self._generate_fallback_response(f"{service_name}: Service unavailable or returned an empty response.")
         
-        return self._generate_fallback_response("No active LLM service configured or API key is missing.")
+        if cache_key:
+            await llm_cache.set(cache_key, response)
+        return response
+    
+    async def _stream_response_with_best_service(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        endpoint: str = "chat"
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the fastest healthy provider, yielding text chunks as they arrive.
+        When no provider is ready (none configured, or every circuit open), the non-streaming
+        path answers instead and its reply is sent as a single chunk.
+        Falls back to the same guidance text as the non-streaming path.
+        """
+        ready = [name for name in self._available_llm_services() if circuit_breakers.get(name).is_available()]
+        if not ready:
+            yield await self._generate_response_with_best_service(
+                system_prompt, user_prompt, max_tokens=max_tokens, priority=priority, endpoint=endpoint
+            )
+            return
+        
+        targets = {self._route_target(name, self._model_for(name)): name for name in ready}
+        target = llm_router.rank(list(targets))[0]
+        provider = targets[target]
+        service = self.llm_services[provider]
+        service_name = self.llm_service_names.get(provider, provider)
+        breaker = circuit_breakers.get(provider)
+        model = self._model_for(provider)
+        user_prompt, planned_max_tokens = token_budget.plan(
+            endpoint, system_prompt, user_prompt, token_budget.context_window(model)
+        )
+        max_tokens = max_tokens or planned_max_tokens
+        has_content = False
+        usage: Dict[str, int] = {}
+        started_at = None
+        try:
+            breaker.before_call()
+            try:
+                await llm_scheduler.acquire(provider, model, priority)
+                started_at = time.monotonic()
+                async for chunk in service.stream(
+                    system_prompt,
+                    user_prompt,
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=0.7,
+                    usage_out=usage
+                ):
+                    has_content = True
+                    yield chunk
+            except LLMProviderError as e:
+                latency = time.monotonic() - started_at
+                usage_ledger.record(provider, model, endpoint, usage, latency * 1000, type(e).__name__)
+                llm_router.record(target, latency, False)
+                if isinstance(e, ProviderRateLimitError):
+                    llm_scheduler.report_rate_limited(provider, model, e.retry_after)
+                if e.trips_circuit:
+                    breaker.record_failure()
+                else:
+                    breaker.release_probe()
+                raise
+            except BaseException as e:
+                breaker.release_probe()
+                if started_at is not None:
+                    # Client went away mid-stream: the tokens sent so far were still paid for
+                    usage_ledger.record(provider, model, endpoint, usage, (time.monotonic() - started_at) * 1000, type(e).__name__)
+                raise
+            latency = time.monotonic() - started_at
+            usage_ledger.record(provider, model, endpoint, usage, latency * 1000)
+            llm_router.record(target, latency, has_content)
+            if has_content:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+                raise LLMProviderError(provider, f"{service_name} returned an empty response")
+        except SchedulerTimeoutError as e:
+            print(f"LLM request not scheduled: {e}")
+            yield self._generate_fallback_response(f"{service_name}: Too many requests queued, please try again shortly")
+        except LLMProviderError as e:
+            # Once content has been sent, an error just ends the stream
+            if not has_content:
+                yield self._generate_fallback_response(self._describe_provider_error(e))
     
     def _generate_fallback_response(self, error_message: str) -> str:
         """
@@ -131,57 +468,9 @@ For code generation:
 
 If you need specific help, please try again later when the AI service is available."""
     
-    async def chat_with_user(self, message: str, context: Dict[str, Any] = None) -> str:
-        """
-        Chat with the user and generate helpful responses.
-        """
-        system_prompt = """
-        You are a helpful AI assistant that can provide guidance on software development,
-        answer technical questions, and assist with coding tasks. Be concise and clear
-        in your responses.
-        """
-        
-        # Include context in the user prompt if available
-        context_str = ""
-        if context and context.get("history"):
-            context_str = "\nConversation history:\n" + "\n".join(
-                f"{msg['role']}: {msg['content']}" 
-                for msg in context["history"][-5:]  # Include last 5 messages
-            )
-        
-        user_prompt = f"{message}\n{context_str}"
-        
-        try:
-            response = await self._generate_response_with_best_service(
-                system_prompt,
-                user_prompt,
-                max_tokens=2000  # Shorter responses for chat
-            )
-            return response
-        except Exception as e:
-            print(f"Error in chat_with_user: {str(e)}")
-            raise
-
-    async def analyze_request(self, user_request: str) -> Dict[str, Any]:
-        """
-        Analyze user request and determine what kind of application to build.
-        """
-        system_prompt = """
-        You are an expert AI agent that analyzes user requests to build applications.
-        Analyze the request and return a structured response with:
-        1. Project type (web_app, mobile_app, dashboard, ecommerce, blog, crm, chat, api)
-        2. Required features
-        3. Technology recommendations
-        4. Database schema needs
-        5. API integrations needed
-        6. Deployment strategy
-        7. Security considerations
-        8. Performance requirements
-        9. Scalability needs
-        10. Estimated complexity and development time
-        
-        Return only valid JSON.
-        """
+    def _analysis_prompts(self, user_request: str) -> Tuple[str, str]:
+        """Prompts for analyze_request; the keys generation needs come first so they stream early."""
+        system_prompt = prompt_templates.render("analysis")
         
         user_prompt = f"""
         User Request: {user_request}
@@ -189,51 +478,198 @@ If you need specific help, please try again later when the AI service is availab
         Analyze this request and provide a detailed project specification.
         Include technical architecture, potential challenges, and best practices.
         """
+        return system_prompt, user_prompt
+    
+    def _parse_analysis(self, response: str, user_request: str) -> Dict[str, Any]:
+        """
+        Build the analysis dict from model output, repairing truncated or fenced JSON.
+        Fields the model did not provide come from the keyword-based fallback.
+        """
+        parsed = parse_partial_json(response)
+        if not isinstance(parsed, dict) or not parsed:
+            return self._fallback_analysis(user_request)
+        analysis = self._fallback_analysis(user_request)
+        analysis.update(parsed)
+        return self._normalize_analysis(analysis, user_request)
+    
+    # Names models commonly use for frameworks the generator knows under another key
+    framework_aliases = {
+        "next": "nextjs",
+        "node": "express",
+        "nodejs": "express",
+        "nest": "nestjs",
+        "spring": "spring_boot",
+        "springboot": "spring_boot",
+        "postgres": "postgresql",
+        "mongo": "mongodb"
+    }
+    
+    def _normalize_framework(self, value: Any, supported: Dict[str, Any], default: str) -> str:
+        name = str(value or "").strip().lower().replace(" ", "_").replace("-", "_").replace(".", "")
+        for candidate in (name, name[:-2] if name.endswith("js") else name):
+            candidate = self.framework_aliases.get(candidate, candidate)
+            if candidate in supported:
+                return candidate
+        return default
+    
+    def _normalize_analysis(self, analysis: Dict[str, Any], user_request: str) -> Dict[str, Any]:
+        """Coerce project_type and tech_stack to values ProjectType and the framework generator accept."""
+        project_type = str(analysis.get("project_type", "")).strip().lower().replace(" ", "_").replace("-", "_")
+        if project_type not in {member.value for member in ProjectType}:
+            project_type = self._fallback_analysis(user_request)["project_type"]
+        analysis["project_type"] = project_type
+        stack = analysis.get("tech_stack")
+        if isinstance(stack, dict):
+            analysis["tech_stack"] = {
+                "frontend": self._normalize_framework(stack.get("frontend"), self.framework_generator.frontend_frameworks, "react"),
+                "backend": self._normalize_framework(stack.get("backend"), self.framework_generator.backend_frameworks, "fastapi"),
+                "database": self._normalize_framework(stack.get("database"), self.framework_generator.databases, "mysql")
+            }
+        elif "tech_stack" in analysis:
+            del analysis["tech_stack"]
+        return analysis
+    
+    async def analyze_request(self, user_request: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Analyze user request and determine what kind of application to build.
+        Identical requests are served from the LLM response cache unless use_cache is False.
+        """
+        system_prompt, user_prompt = self._analysis_prompts(user_request)
         
         analysis = await self._generate_response_with_best_service(
-            system_prompt, user_prompt
+            system_prompt, user_prompt, use_cache=use_cache, hedge=True, endpoint="analysis"
         )
         
+        return self._parse_analysis(analysis, user_request)
+    
+    async def analyze_request_stream(self, user_request: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the analysis, yielding {"type": "partial", "keys", "analysis"} each time
+        top-level fields complete and a final {"type": "complete", "analysis"}.
+        Partial analyses only contain fields whose values have fully arrived.
+        """
+        system_prompt, user_prompt = self._analysis_prompts(user_request)
+        parser = StreamingJSONParser()
+        async for chunk in self._stream_response_with_best_service(
+            system_prompt, user_prompt, priority=Priority.STANDARD, endpoint="analysis"
+        ):
+            keys = parser.feed(chunk)
+            if keys:
+                analysis = self._normalize_analysis(dict(parser.fields), user_request) if "project_type" in parser.fields else dict(parser.fields)
+                yield {"type": "partial", "keys": keys, "analysis": analysis}
+        
+        yield {"type": "complete", "analysis": self._parse_analysis(parser.text, user_request)}
+    
+    def _generation_fields(self) -> List[str]:
+        """Analysis fields the generation stages declare as inputs, across both generators."""
+        return sorted(self.generation_pipeline.input_fields() | self.framework_generator.files_pipeline.input_fields())
+
+    def _generation_inputs(self, analysis: Dict[str, Any], tech_stack: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        The analysis fields generation reads, as generation sees them: the default
+        project type, missing lists as empty and the tech stack it will use.
+        """
+        inputs = {field: analysis.get(field) for field in self._generation_fields()}
+        inputs["project_type"] = analysis.get("project_type") or "web_app"
+        for field in LIST_FIELDS:
+            inputs[field] = list(analysis.get(field) or [])
+        inputs["tech_stack"] = self._selected_stack(analysis, tech_stack)
+        return inputs
+    
+    async def analyze_and_generate_stream(
+        self,
+        user_request: str,
+        project_name: str,
+        tech_stack: Optional[Dict[str, str]] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Tuple["asyncio.Task[Dict[str, Any]]", Dict[str, Any], AsyncIterator[Tuple[str, str]]]:
+        """
+        Analyze and generate in one pass. Returns as soon as every field a generation
+        stage declares as an input has streamed in (the analysis prompt asks for them
+        first), with generate_project_stream's project data and file stream. Partial
+        analyses only hold fields that have fully arrived, so generation starts from
+        final values. The rest of the analysis keeps streaming in the returned task,
+        which resolves to the final analysis; cancel it if the files are abandoned.
+        on_event receives every analysis event. Returns (analysis task, project data, files).
+        """
+        events = self.analyze_request_stream(user_request)
+        analysis: Dict[str, Any] = {}
+        complete = False
         try:
-            return json.loads(analysis)
-        except json.JSONDecodeError:
-            # Fallback analysis
-            return self._fallback_analysis(user_request)
+            async for event in events:
+                analysis = event["analysis"]
+                if on_event:
+                    await on_event(event)
+                complete = event["type"] == "complete"
+                if complete or all(field in analysis or (field == "tech_stack" and tech_stack) for field in self._generation_fields()):
+                    break
+        except BaseException:
+            await events.aclose()
+            raise
+        
+        if complete:
+            finished = asyncio.get_running_loop().create_future()
+            finished.set_result(analysis)
+        else:
+            finished = asyncio.ensure_future(self._finish_analysis(events, on_event))
+        try:
+            project_data, files = await self.generate_project_stream(dict(analysis), project_name, tech_stack)
+        except BaseException:
+            finished.cancel()
+            raise
+        return finished, project_data, files
+    
+    @staticmethod
+    async def _finish_analysis(
+        events: AsyncIterator[Dict[str, Any]],
+        on_event: Optional[Callable[[Dict[str, Any]], Awaitable[None]]]
+    ) -> Dict[str, Any]:
+        """Consume the rest of an analysis stream; returns the final analysis."""
+        analysis: Dict[str, Any] = {}
+        try:
+            async for event in events:
+                analysis = event["analysis"]
+                if on_event:
+                    await on_event(event)
+        finally:
+            await events.aclose()
+        return analysis
+    
+    async def analyze_and_generate(
+        self,
+        user_request: str,
+        project_name: str,
+        tech_stack: Optional[Dict[str, str]] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """analyze_and_generate_stream with the files collected into the project. Returns (analysis, project)."""
+        finished, project_data, files = await self.analyze_and_generate_stream(user_request, project_name, tech_stack, on_event)
+        try:
+            project_data["files"] = {path: content async for path, content in files}
+            return await finished, project_data
+        finally:
+            if not finished.done():
+                finished.cancel()
     
     async def generate_project(self, analysis: Dict[str, Any], project_name: str, tech_stack: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Generate complete project based on analysis.
         """
-        # Use provided tech stack or defaults
-        if tech_stack:
-            selected_tech_stack = tech_stack
-        else:
-            selected_tech_stack = {
-                "frontend": analysis.get("tech_stack", {}).get("frontend", "react"),
-                "backend": analysis.get("tech_stack", {}).get("backend", "fastapi"),
-                "database": analysis.get("tech_stack", {}).get("database", "mysql")
-            }
-        
-        project_data = {
-            "name": project_name,
-            "type": analysis.get("project_type", "web_app"),
-            "features": analysis.get("features", []),
-            "tech_stack": selected_tech_stack,
-            "files": {},
-            "structure": {},
-            "documentation": {
-                "setup_instructions": "Run npm install and python requirements.txt",
-                "deployment_guide": "Use Docker for deployment",
-                "api_documentation": "Available at /docs endpoint"
-            }
-        }
+        selected_tech_stack = self._selected_stack(analysis, tech_stack)
+        project_data = self._new_project_data(analysis, project_name, selected_tech_stack)
+        
+        # The same generation inputs always produce the same files: reuse a stored result
+        artifact_key = artifact_store.make_key("project", self._generation_inputs(analysis, selected_tech_stack))
+        cached = await artifact_store.get(artifact_key)
+        if cached is not None:
+            files, extra = cached
+            project_data.update(extra)
+            project_data["name"] = project_name
+            project_data["files"] = files
+            return project_data
         
         # Use advanced framework generator if non-default stack is specified
-        if (selected_tech_stack["frontend"] != "react" or 
-            selected_tech_stack["backend"] != "fastapi" or 
-            selected_tech_stack["database"] != "mysql"):
-            
-            # Use advanced framework generator
+        if not self._uses_default_generator(selected_tech_stack):
             advanced_project = await self.framework_generator.generate_project_with_frameworks(
                 selected_tech_stack["frontend"],
                 selected_tech_stack["backend"],
@@ -247,8 +683,98 @@ If you need specific help, please try again later when the AI service is availab
             project_data["structure"] = await self._generate_project_structure(analysis)
             project_data["files"] = await self._generate_all_files(analysis, project_data["structure"])
         
+        await artifact_store.put(
+            artifact_key,
+            project_data["files"],
+            {key: value for key, value in project_data.items() if key not in ("name", "files")}
+        )
         return project_data
     
+    async def generate_project_stream(
+        self,
+        analysis: Dict[str, Any],
+        project_name: str,
+        tech_stack: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, Any], AsyncIterator[Tuple[str, str]]]:
+        """
+        Like generate_project, but the files come as an async stream of (path, content).
+        Each generation stage's files are yielded as soon as that stage finishes and
+        are written to the artifact store as they go, so the whole project is never
+        held in memory. Returns the project data without its files, and the stream.
+        """
+        selected_tech_stack = self._selected_stack(analysis, tech_stack)
+        project_data = self._new_project_data(analysis, project_name, selected_tech_stack)
+        
+        artifact_key = artifact_store.make_key("project", self._generation_inputs(analysis, selected_tech_stack))
+        cached = await artifact_store.get(artifact_key)
+        if cached is not None:
+            files, extra = cached
+            project_data.update(extra)
+            project_data["name"] = project_name
+            return project_data, iter_files(files)
+        
+        if not self._uses_default_generator(selected_tech_stack):
+            advanced_project, stages = await self.framework_generator.generate_project_stream(
+                selected_tech_stack["frontend"],
+                selected_tech_stack["backend"],
+                selected_tech_stack["database"],
+                analysis,
+                project_name
+            )
+            project_data.update(advanced_project)
+        else:
+            project_data["structure"] = await self._generate_project_structure(analysis)
+            stages = self.generation_pipeline.stream({"analysis": analysis, "structure": project_data["structure"]})
+        
+        extra = {key: value for key, value in project_data.items() if key not in ("name", "files")}
+        return project_data, self._stream_stage_files(stages, artifact_store.writer(artifact_key), extra)
+    
+    @staticmethod
+    async def _stream_stage_files(stages: AsyncIterator[Tuple[str, Dict[str, str]]], writer, extra: Dict[str, Any]) -> AsyncIterator[Tuple[str, str]]:
+        """Files of each pipeline stage as it finishes; the artifact manifest is written once all have streamed."""
+        try:
+            async for _, files in stages:
+                files = files or {}
+                await writer.add(files)
+                for path, content in files.items():
+                    yield path, content
+            await writer.commit(extra)
+        finally:
+            # Cancels the stages still running if the consumer stopped early
+            await stages.aclose()
+    
+    @staticmethod
+    def _new_project_data(analysis: Dict[str, Any], project_name: str, tech_stack: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "name": project_name,
+            "type": analysis.get("project_type", "web_app"),
+            "features": analysis.get("features", []),
+            "tech_stack": tech_stack,
+            "files": {},
+            "structure": {},
+            "documentation": {
+                "setup_instructions": "Run npm install and python requirements.txt",
+                "deployment_guide": "Use Docker for deployment",
+                "api_documentation": "Available at /docs endpoint"
+            }
+        }
+    
+    @staticmethod
+    def _selected_stack(analysis: Dict[str, Any], tech_stack: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """The provided tech stack, or the analysis's with defaults."""
+        if tech_stack:
+            return tech_stack
+        return {
+            "frontend": analysis.get("tech_stack", {}).get("frontend", "react"),
+            "backend": analysis.get("tech_stack", {}).get("backend", "fastapi"),
+            "database": analysis.get("tech_stack", {}).get("database", "mysql")
+        }
+    
+    @staticmethod
+    def _uses_default_generator(tech_stack: Dict[str, str]) -> bool:
+        """React, FastAPI and MySQL use the CodeGenerator templates; every other stack the framework generator."""
+        return (tech_stack["frontend"], tech_stack["backend"], tech_stack["database"]) == ("react", "fastapi", "mysql")
+    
     async def _generate_project_structure(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate project folder structure."""
         project_type = analysis.get("project_type", "web_app")
@@ -307,27 +833,18 @@ If you need specific help, please try again later when the AI service is availab
             
         return base_structure
     
-    async def _generate_all_files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
-        """Generate all project files."""
+    async def _generate_all_files(self, analysis: Dict[str, Any], structure: Dict[str, Any], stages: Optional[List[str]] = None) -> Dict[str, str]:
+        """Generate all project files, or only those of the named stages."""
+        stages = list(self.generation_pipeline.stages) if stages is None else stages
+        run = await self.generation_pipeline.run(
+            {"analysis": analysis, "structure": structure},
+            skip=[name for name in self.generation_pipeline.stages if name not in stages]
+        )
+        return run.merged(stages)
+    
+    async def _generate_readme(self, analysis: Dict[str, Any]) -> Dict[str, str]:
+        """Generate documentation files."""
         files = {}
-        
-        # Generate frontend files
-        frontend_files = await self.code_generator.generate_react_app(analysis)
-        files.update(frontend_files)
-        
-        # Generate backend files  
-        backend_files = await self.code_generator.generate_fastapi_app(analysis)
-        files.update(backend_files)
-        
-        # Generate database files
-        database_files = await self.code_generator.generate_database_schema(analysis)
-        files.update(database_files)
-        
-        # Generate deployment files
-        deployment_files = await self.code_generator.generate_deployment_config(analysis)
-        files.update(deployment_files)
-        
-        # Generate documentation files
         files["README.md"] = f"# {analysis.get('project_type', 'Web Application')}\n\n" + \
                            f"## Features\n" + \
                            "\n".join([f"- {feature}" for feature in analysis.get("features", [])]) + \
@@ -335,16 +852,101 @@ If you need specific help, please try again later when the AI service is availab
                            f"- Frontend: {analysis.get('tech_stack', {}).get('frontend', 'React')}\n" + \
                            f"- Backend: {analysis.get('tech_stack', {}).get('backend', 'FastAPI')}\n" + \
                            f"- Database: {analysis.get('tech_stack', {}).get('database', 'MySQL')}\n"
+        if analysis.get("integrations"):
+            files["README.md"] += "\n## Integrations\n" + "\n".join(f"- {integration}" for integration in analysis["integrations"]) + "\n"
         
         return files
     
-    async def _apply_modifications(self, project_id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply modifications to project."""
-        # Implementation for applying changes to existing project
+    def _generation_pipeline_for(self, tech_stack: Dict[str, str]) -> Pipeline:
+        return self.generation_pipeline if self._uses_default_generator(tech_stack) else self.framework_generator.files_pipeline
+    
+    async def _generate_stage_files(self, analysis: Dict[str, Any], stages: List[str]) -> Dict[str, str]:
+        """Files of the named generation stages for the analysis's stack."""
+        if not stages:
+            return {}
+        tech_stack = self._selected_stack(analysis)
+        if self._uses_default_generator(tech_stack):
+            structure = await self._generate_project_structure(analysis)
+            return await self._generate_all_files(analysis, structure, stages)
+        return await self.framework_generator.generate_files(
+            tech_stack["frontend"], tech_stack["backend"], tech_stack["database"], analysis, stages
+        )
+    
+    async def _modified_analysis(self, analysis: Dict[str, Any], modification_request: str, changes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        The analysis after a modification: the model updates it from the request,
+        then explicit changes (features, integrations, project_type, tech_stack) override.
+        If the model's answer cannot be parsed, only the explicit changes apply.
+        """
+        updated = json.loads(json.dumps(analysis, default=str))
+        edits: List[Dict[str, Any]] = []
+        if modification_request:
+            current = {key: analysis.get(key) for key in ("project_type", "features", "integrations", "tech_stack", "description")}
+            user_prompt = f"""
+        Current analysis: {json.dumps(current, default=str)}
+        
+        Requested change: {modification_request}
+        """
+            response = await self._generate_response_with_best_service(
+                prompt_templates.render("modification"), user_prompt, use_cache=True, endpoint="analysis"
+            )
+            parsed = parse_partial_json(response)
+            if isinstance(parsed, dict):
+                edits.append(parsed)
+            else:
+                print("Could not parse the modified analysis, applying explicit changes only")
+        if changes:
+            edits.append(changes)
+        
+        for edit in edits:
+            for key in ("project_type", "features", "integrations", "description"):
+                if key in edit:
+                    updated[key] = edit[key]
+            if isinstance(edit.get("tech_stack"), dict):
+                updated["tech_stack"] = {**self._selected_stack(updated), **edit["tech_stack"]}
+        return self._normalize_analysis(updated, modification_request)
+    
+    async def modify_project(
+        self,
+        analysis: Dict[str, Any],
+        modification_request: str = "",
+        changes: Optional[Dict[str, Any]] = None,
+        current_hashes: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Regenerate only what a modification affects.
+        
+        The analysis fields that changed (features, integrations, project type,
+        stack) select the generation stages that read them; only those stages run,
+        for the old analysis (to find files that go away) and the new one.
+        Switching between the default and the framework generator regenerates
+        every stage. current_hashes (path -> content hash) are the project's
+        stored files; the returned "files" hold only the new or changed ones and
+        "manifest" lists them with their hashes, plus the paths to remove.
+        """
+        current_hashes = current_hashes or {}
+        updated = await self._modified_analysis(analysis, modification_request, changes)
+        diff = diff_analysis(analysis, updated)
+        
+        old_pipeline = self._generation_pipeline_for(self._selected_stack(analysis))
+        new_pipeline = self._generation_pipeline_for(self._selected_stack(updated))
+        if old_pipeline is new_pipeline:
+            stages = sorted(new_pipeline.affected(diff))
+            old_stages = stages
+        else:
+            stages, old_stages = list(new_pipeline.stages), list(old_pipeline.stages)
+        
+        new_files, old_files = await asyncio.gather(
+            self._generate_stage_files(updated, stages),
+            self._generate_stage_files(analysis, old_stages)
+        )
+        manifest = build_manifest(current_hashes, old_files, new_files)
         return {
-            "project_id": project_id,
-            "changes_applied": changes,
-            "status": "success"
+            "analysis": updated,
+            "changes": diff,
+            "stages": stages,
+            "files": {entry["path"]: new_files[entry["path"]] for entry in manifest["changed"]},
+            "manifest": manifest
         }
     
     def _fallback_analysis(self, user_request: str) -> Dict[str, Any]:
@@ -391,13 +993,26 @@ If you need specific help, please try again later when the AI service is availab
         database: str
     ) -> Dict[str, Any]:
         """Generate project with custom technology stack."""
-        return await self.framework_generator.generate_project_with_frameworks(
+        tech_stack = {"frontend": frontend_framework, "backend": backend_framework, "database": database}
+        artifact_key = artifact_store.make_key("frameworks", self._generation_inputs(analysis, tech_stack))
+        cached = await artifact_store.get(artifact_key)
+        if cached is not None:
+            files, extra = cached
+            return {**extra, "name": project_name, "files": files}
+        
+        project = await self.framework_generator.generate_project_with_frameworks(
             frontend_framework,
             backend_framework,
             database,
             analysis,
             project_name
         )
+        await artifact_store.put(
+            artifact_key,
+            project["files"],
+            {key: value for key, value in project.items() if key not in ("name", "files")}
+        )
+        return project
     
     async def get_framework_recommendations(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Get framework recommendations based on project analysis."""
@@ -498,26 +1113,24 @@ If you need specific help, please try again later when the AI service is availab
             }
         ]
     
-    async def chat_with_user(self, message: str, context: Dict[str, Any] = None) -> str:
-        """Chat with user to assist with application building."""
+    async def _prepare_chat(self, message: str, context: Dict[str, Any] = None, project_id: Optional[int] = None):
+        """
+        Record the user message and build the chat prompts. Returns (user_id, system_prompt, user_prompt).
+        project_id, already checked against the user, adds the project's files most relevant to the message.
+        """
         # Get user ID from context
         user_id = context.get("user_id", "default") if context else "default"
         
-        # Initialize conversation history for this user if not exists
-        if user_id not in self.conversation_history:
-            self.conversation_history[user_id] = []
-        
-        # Add current message to history
-        self.conversation_history[user_id].append({"role": "user", "content": message})
-        
-        # Keep only the last 15 messages for context (increased from 10)
-        if len(self.conversation_history[user_id]) > 15:
-            self.conversation_history[user_id] = self.conversation_history[user_id][-15:]
+        # Add current message to history; the store keeps only the most recent messages
+        await self.conversation_store.append(user_id, "user", message)
+        history = await self.conversation_store.get(user_id)
+        # Turns older than the recent ones are folded into this summary in the background
+        summary = await self.conversation_store.get_summary(user_id)
         
         # Build conversation history string
         conversation_history = "\n".join([
             f"{msg['role'].capitalize()}: {msg['content']}" 
-            for msg in self.conversation_history[user_id]
+            for msg in history
         ])
         
         # Get current date and time for context
@@ -528,98 +1141,167 @@ If you need specific help, please try again later when the AI service is availab
         # Get available capabilities
         capabilities_list = ", ".join([cap for cap, enabled in self.capabilities.items() if enabled])
         
-        system_prompt = f"""
-        You are an expert AI assistant and a senior software engineer helping users build applications.
-        Your primary goal is to provide direct, actionable, and complete solutions.
-
-        When a user asks for code, provide complete, production-ready code snippets or entire files. Do not provide samples or incomplete examples. The code should be fully functional and ready to be used in a project.
-        
-        Provide helpful, concise responses about:
-        1. Application architecture and design
-        2. **Complete Code Generation**: When asked for code, generate the full file or a complete, working snippet.
-        3. Technology stack recommendations
-        4. Troubleshooting and debugging
-        5. Deployment strategies
-        6. Project planning and management
-        7. UI/UX design principles
-        8. Security considerations
-        9. Performance optimization
-        10. Testing strategies
-        11. Code review and quality assurance
-        12. Documentation and maintenance
-        
-        Be friendly, professional, and focused on helping the user build their application.
-        Always provide actionable advice and specific examples when relevant.
-        If you don't know something, be honest and suggest alternatives or ways to find the information.
-        
-        Your Capabilities: {capabilities_list}
-        Current Date and Time: {current_datetime} ({day_of_week})
+        snippets = project_index.search(project_id, message, settings.PROJECT_INDEX_TOP_K) if project_id is not None else []
         
-        Previous conversation history:
-        {conversation_history}
-        """
+        # Fit history and context into the prompt budget: the context dump goes first, then the oldest history;
+        # the summary and the project snippets for this message are kept longest
+        sections = {
+            "snippets": PromptSection("snippets", format_snippets(snippets, settings.PROJECT_INDEX_MAX_SNIPPET_CHARS), priority=3),
+            "summary": PromptSection("summary", f"Summary of the earlier conversation: {summary}" if summary else "", priority=2),
+            "history": PromptSection("history", conversation_history, priority=1, trim="head"),
+            "context": PromptSection("context", context_serializer.render(context), priority=0),
+            "message": PromptSection("message", message, required=True)
+        }
+        fixed_tokens = sum(
+            estimate_tokens(prompt)
+            for prompt in self._render_chat_prompts(capabilities_list, current_datetime, day_of_week, "", "", "", "")
+        )
+        token_budget.fit(list(sections.values()), "chat", self._context_window(), fixed_tokens=fixed_tokens)
+        
+        system_prompt, user_prompt = self._render_chat_prompts(
+            capabilities_list,
+            current_datetime,
+            day_of_week,
+            "\n\n".join(text for text in (sections["summary"].text, sections["history"].text) if text),
+            sections["message"].text,
+            sections["context"].text or "Omitted (too large for the prompt budget)",
+            sections["snippets"].text
+        )
+        
+        return user_id, system_prompt, user_prompt
+    
+    def _render_chat_prompts(
+        self,
+        capabilities_list: str,
+        current_datetime: str,
+        day_of_week: str,
+        conversation_history: str,
+        message: str,
+        context_text: str,
+        snippets_text: str = ""
+    ):
+        """Fill the chat prompt templates. Returns (system_prompt, user_prompt)."""
+        system_prompt = prompt_templates.render(
+            "chat",
+            capabilities=capabilities_list,
+            current_datetime=current_datetime,
+            day_of_week=day_of_week,
+            conversation_history=conversation_history
+        )
         
+        snippets_block = f"\n        Relevant project files:\n{snippets_text}\n" if snippets_text else ""
         user_prompt = f"""
         User Message: {message}
         
-        Context: {json.dumps(context, indent=2) if context else "No additional context"}
-        
+        Context: {context_text}
+        {snippets_block}
         Based on the system prompt, provide a comprehensive and direct response. If the user asks for code, generate the complete code required. Do not use placeholders or sample code.
         """
         
+        return system_prompt, user_prompt
+    
+    def _chat_error_response(self) -> str:
+        """Generic guidance returned when a chat turn fails."""
+        return f"I can help you with that! Here's some general guidance:\n\n" \
+               f"1. For application development, consider starting with a clear project scope\n" \
+               f"2. Choose appropriate technologies for your needs (React/Vue for frontend, FastAPI/Django for backend)\n" \
+               f"3. Plan your database structure early\n" \
+               f"4. Implement user authentication and security measures\n" \
+               f"5. Test your application thoroughly\n\n" \
+               f"If you'd like more specific advice, please provide more details about what you're trying to build!"
+    
+    async def chat_with_user(self, message: str, context: Dict[str, Any] = None, project_id: Optional[int] = None) -> str:
+        """Chat with user to assist with application building."""
+        user_id, system_prompt, user_prompt = await self._prepare_chat(message, context, project_id)
+        
         try:
-            response = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            response = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, priority=Priority.INTERACTIVE, hedge=True, endpoint="chat"
+            )
             # Add AI response to history
-            self.conversation_history[user_id].append({"role": "assistant", "content": response})
+            await self.conversation_store.append(user_id, "assistant", response)
+            conversation_summarizer.schedule(self, user_id)
             return response
         except Exception as e:
             # Add error response to history
-            error_response = f"I can help you with that! Here's some general guidance:\n\n" \
-                   f"1. For application development, consider starting with a clear project scope\n" \
-                   f"2. Choose appropriate technologies for your needs (React/Vue for frontend, FastAPI/Django for backend)\n" \
-                   f"3. Plan your database structure early\n" \
-                   f"4. Implement user authentication and security measures\n" \
-                   f"5. Test your application thoroughly\n\n" \
-                   f"If you'd like more specific advice, please provide more details about what you're trying to build!"
-            self.conversation_history[user_id].append({"role": "assistant", "content": error_response})
+            error_response = self._chat_error_response()
+            await self.conversation_store.append(user_id, "assistant", error_response)
             return error_response
     
+    async def chat_with_user_stream(
+        self, message: str, context: Dict[str, Any] = None, project_id: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of chat_with_user.
+        Yields response chunks as they arrive; the full reply is added to the
+        conversation history once the stream finishes.
+        """
+        user_id, system_prompt, user_prompt = await self._prepare_chat(message, context, project_id)
+        chunks = []
+        
+        try:
+            async for chunk in self._stream_response_with_best_service(system_prompt, user_prompt):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            print(f"Error in chat_with_user_stream: {str(e)}")
+            if not chunks:
+                error_response = self._chat_error_response()
+                chunks.append(error_response)
+                yield error_response
+        finally:
+            # Record whatever was sent, even if the client disconnected mid-stream
+            if chunks:
+                await self.conversation_store.append(user_id, "assistant", "".join(chunks))
+                conversation_summarizer.schedule(self, user_id)
+    
+    async def summarize_conversation(self, previous_summary: str, messages: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Fold messages into the running conversation summary with a cheap model.
+        Returns None when no provider produced a summary.
+        """
+        transcript = "\n".join(f"{msg['role'].capitalize()}: {msg['content']}" for msg in messages)
+        user_prompt = f"""
+        Previous summary: {previous_summary or "None yet"}
+        
+        New messages:
+        {transcript}
+        """
+        summary = await self._generate_response_with_best_service(
+            prompt_templates.render("summary"),
+            user_prompt,
+            priority=Priority.BATCH,
+            endpoint="summary",
+            models=self.summary_models
+        )
+        # Provider replies are CompletionText; a plain string is the local fallback text
+        if not isinstance(summary, CompletionText) or not summary.strip():
+            return None
+        return summary.strip()
+    
     async def generate_code_from_description(self, description: str, context: Dict[str, Any] = None) -> str:
         """Generate code based on natural language description."""
-        # Get current date and time for context
+        # Get current date for context (day resolution, it sits after the cached prefix anyway)
         from datetime import datetime
-        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current_date = datetime.now().strftime("%Y-%m-%d")
         day_of_week = datetime.now().strftime("%A")
         
         # Get technology stack from context or use defaults
         tech_stack = context.get("tech_stack", {"frontend": "React", "backend": "FastAPI", "database": "MySQL"}) if context else {"frontend": "React", "backend": "FastAPI", "database": "MySQL"}
         
-        system_prompt = f"""
-        You are an expert developer generating clean, modern code based on descriptions.
-        Follow these guidelines:
-        1. Use modern best practices and design patterns
-        2. Include proper error handling
-        3. Write clean, readable, well-commented code
-        4. Follow the requested technology stack
-        5. Include proper imports and dependencies
-        6. Make code modular and reusable
-        7. Include example usage when relevant
-        8. Add security considerations
-        9. Optimize for performance
-        10. Include testing considerations
-        11. Follow accessibility standards
-        12. Include documentation comments
-        
-        Return only the generated code without explanations.
-        
-        Technology Stack: {tech_stack['frontend']} (Frontend), {tech_stack['backend']} (Backend), {tech_stack['database']} (Database)
-        Current Date and Time: {current_datetime} ({day_of_week})
-        """
+        system_prompt = prompt_templates.render(
+            "code",
+            frontend=tech_stack['frontend'],
+            backend=tech_stack['backend'],
+            database=tech_stack['database'],
+            current_date=current_date,
+            day_of_week=day_of_week
+        )
         
         user_prompt = f"""
         Generate code for: {description}
         
-        Context: {json.dumps(context, indent=2) if context else "No additional context"}
+        Context: {context_serializer.render(context)}
         
         Technology Stack: {context.get("tech_stack", "React + FastAPI + MySQL") if context else "React + FastAPI + MySQL"}
         
@@ -630,7 +1312,7 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            code = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            code = await self._generate_response_with_best_service(system_prompt, user_prompt, endpoint="code")
             return code
         except Exception as e:
             # Fallback code generation
@@ -661,7 +1343,7 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         user_prompt = f"""
-        Current Context: {json.dumps(context, indent=2) if context else "No context provided"}
+        Current Context: {context_serializer.render(context, "No context provided")}
         
         Recent Conversation History:
         {json.dumps(history[-5:] if history else [], indent=2)}
@@ -672,7 +1354,9 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            suggestions_json = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            suggestions_json = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, endpoint="next_steps"
+            )
             suggestions = json.loads(suggestions_json)
             return suggestions if isinstance(suggestions, list) else [suggestions]
         except:
@@ -685,38 +1369,19 @@ If you need specific help, please try again later when the AI service is availab
                 "Add database models for your core data entities"
             ]
     
-    async def explain_concept(self, concept: str, context: Dict[str, Any] = None) -> str:
+    async def explain_concept(self, concept: str, context: Dict[str, Any] = None, use_cache: bool = True) -> str:
         """Explain programming concepts or code."""
-        # Get current date and time for context
+        # Get current date for context (day resolution keeps the prompt cacheable)
         from datetime import datetime
-        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current_datetime = datetime.now().strftime("%Y-%m-%d")
         day_of_week = datetime.now().strftime("%A")
         
-        system_prompt = f"""
-        You are an expert software engineer explaining technical concepts.
-        Provide clear, concise explanations that:
-        1. Are easy to understand for developers of all levels
-        2. Include practical examples when relevant
-        3. Mention common use cases and best practices
-        4. Highlight potential pitfalls or gotchas
-        5. Use analogies when helpful
-        6. Include code examples when appropriate
-        7. Mention related concepts
-        8. Provide learning resources
-        9. Explain trade-offs and alternatives
-        10. Include real-world applications
-        11. Include relevant statistics, benchmarks, or data when applicable
-        12. Reference industry standards and best practices
-        
-        Keep explanations focused and actionable.
-        
-        Current Date and Time: {current_datetime} ({day_of_week})
-        """
+        system_prompt = prompt_templates.render("explain", current_date=current_datetime, day_of_week=day_of_week)
         
         user_prompt = f"""
         Explain this concept: {concept}
         
-        Context: {json.dumps(context, indent=2) if context else "No additional context"}
+        Context: {context_serializer.render(context)}
         
         Please provide a comprehensive explanation with examples.
         Include code snippets if relevant.
@@ -725,7 +1390,9 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            explanation = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            explanation = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, use_cache=use_cache, priority=Priority.INTERACTIVE, endpoint="explain"
+            )
             return explanation
         except Exception as e:
             # Fallback explanation
@@ -768,7 +1435,7 @@ If you need specific help, please try again later when the AI service is availab
         
         Error: {error if error else "No error message provided"}
         
-        Context: {json.dumps(context, indent=2) if context else "No additional context"}
+        Context: {context_serializer.render(context)}
         
         Please provide a detailed debugging analysis with specific fixes.
         Include the corrected code and explain why the changes were needed.
@@ -776,7 +1443,7 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            debug_analysis = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            debug_analysis = await self._generate_response_with_best_service(system_prompt, user_prompt, endpoint="debug")
             return {
                 "analysis": debug_analysis,
                 "fixed_code": self._extract_code_from_response(debug_analysis),
@@ -830,7 +1497,7 @@ If you need specific help, please try again later when the AI service is availab
         {code}
         ```
         
-        Context: {json.dumps(context, indent=2) if context else "No additional context"}
+        Context: {context_serializer.render(context)}
         
         Please provide specific optimizations and improvements.
         Include explanations for each optimization and its benefits.
@@ -838,7 +1505,9 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            optimization_json = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            optimization_json = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, endpoint="optimize"
+            )
             optimization_result = json.loads(optimization_json)
             return optimization_result
         except:
@@ -894,14 +1563,16 @@ If you need specific help, please try again later when the AI service is availab
         {code}
         ```
         
-        Context: {json.dumps(context, indent=2) if context else "No additional context"}
+        Context: {context_serializer.render(context)}
         
         Please provide a comprehensive security analysis.
         When reviewing, include relevant data, statistics, or references to support your analysis.
         """
         
         try:
-            security_review = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            security_review = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, endpoint="security"
+            )
             return {
                 "review": security_review,
                 "vulnerabilities_found": self._identify_security_issues(code)
@@ -949,7 +1620,9 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            architecture_analysis = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            architecture_analysis = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, endpoint="architecture"
+            )
             return {
                 "analysis": architecture_analysis
             }
@@ -958,11 +1631,11 @@ If you need specific help, please try again later when the AI service is availab
                 "analysis": "Architecture analysis failed. Please try again."
             }
     
-    async def generate_documentation(self, project_data: Dict[str, Any]) -> str:
+    async def generate_documentation(self, project_data: Dict[str, Any], use_cache: bool = True) -> str:
         """Generate comprehensive documentation for a project."""
-        # Get current date and time for context
+        # Get current date for context (day resolution keeps the prompt cacheable)
         from datetime import datetime
-        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current_datetime = datetime.now().strftime("%Y-%m-%d")
         day_of_week = datetime.now().strftime("%A")
         
         system_prompt = f"""
@@ -982,7 +1655,7 @@ If you need specific help, please try again later when the AI service is availab
         11. Performance benchmarks and metrics
         12. Security considerations and best practices
         
-        Current Date and Time: {current_datetime} ({day_of_week})
+        Current Date: {current_datetime} ({day_of_week})
         """
         
         user_prompt = f"""
@@ -995,7 +1668,9 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            documentation = await self._generate_response_with_best_service(system_prompt, user_prompt, max_tokens=8000)
+            documentation = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, use_cache=use_cache, priority=Priority.BATCH, endpoint="documentation"
+            )
             return documentation
         except Exception as e:
             return f"Documentation generation failed: {str(e)}"
@@ -1041,7 +1716,9 @@ If you need specific help, please try again later when the AI service is availab
         """
         
         try:
-            suggestions = await self._generate_response_with_best_service(system_prompt, user_prompt)
+            suggestions = await self._generate_response_with_best_service(
+                system_prompt, user_prompt, priority=Priority.BATCH, endpoint="improvements"
+            )
             return {
                 "suggestions": suggestions
             }
@@ -1097,3 +1774,15 @@ If you need specific help, please try again later when the AI service is availab
             security_issues.append("Hardcoded credentials detected")
             
         return security_issues
+
+
+# Global agent shared by the API routers and the real-time creator, created on first use
+_shared_ai_agent: Optional[AIAgentService] = None
+
+
+def get_ai_agent() -> AIAgentService:
+    """Return the process-wide AIAgentService."""
+    global _shared_ai_agent
+    if _shared_ai_agent is None:
+        _shared_ai_agent = AIAgentService()
+    return _shared_ai_agent
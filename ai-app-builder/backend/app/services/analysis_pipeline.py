@@ -0,0 +1,141 @@
+from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+import asyncio
+import time
+import uuid
+from app.core.config import settings
+
+
+class AnalysisRun:
+    """One analysis kept for its owner, plus the background work started from it."""
+
+    def __init__(self, analysis_id: str, owner_id: int, user_request: str, analysis: Dict[str, Any]):
+        self.analysis_id = analysis_id
+        self.owner_id = owner_id
+        self.user_request = user_request
+        self.analysis = analysis
+        self.created_at = time.time()
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def status(self) -> Dict[str, str]:
+        """pending, done or failed for each background step."""
+        result = {}
+        for name, task in self.tasks.items():
+            if not task.done():
+                result[name] = "pending"
+            elif task.cancelled() or task.exception() is not None:
+                result[name] = "failed"
+            else:
+                result[name] = "done"
+        return result
+
+    def cancel(self):
+        for task in self.tasks.values():
+            if not task.done():
+                task.cancel()
+
+
+class AnalysisPipeline:
+    """
+    Keeps analyses under an analysis_id so the builder steps can refer to them.
+
+    As soon as an analysis is stored, the framework recommendations and the next
+    steps are computed concurrently in the background, so by the time the wizard
+    asks for them (or posts /generate with the analysis_id) they are usually
+    ready and nothing has to be re-uploaded. Runs expire after ttl seconds and
+    the oldest are evicted beyond max_entries.
+    """
+
+    STEPS = ("recommendations", "next_steps")
+
+    def __init__(self, ttl: int = 1800, max_entries: int = 500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._runs: "OrderedDict[str, AnalysisRun]" = OrderedDict()
+        self.stats = {
+            "started": 0,
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evicted": 0
+        }
+
+    def start(self, ai_agent, owner_id: int, user_request: str, analysis: Dict[str, Any]) -> AnalysisRun:
+        """Store an analysis and start its recommendations and next steps. Must run inside the event loop."""
+        self._prune()
+        run = AnalysisRun(uuid.uuid4().hex, owner_id, user_request, analysis)
+        context = {"stage": "analysis_complete", "analysis": analysis}
+        history = [{"role": "user", "content": user_request}]
+        run.tasks = {
+            "recommendations": asyncio.ensure_future(ai_agent.get_framework_recommendations(analysis)),
+            "next_steps": asyncio.ensure_future(ai_agent.suggest_next_steps(context, history))
+        }
+        for task in run.tasks.values():
+            task.add_done_callback(self._retrieve_exception)
+        self._runs[run.analysis_id] = run
+        self.stats["started"] += 1
+        while len(self._runs) > self.max_entries:
+            _, evicted = self._runs.popitem(last=False)
+            evicted.cancel()
+            self.stats["evicted"] += 1
+        return run
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Task):
+        # Failures are reported through status(); keep asyncio from logging them as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        while self._runs:
+            run = next(iter(self._runs.values()))
+            if run.created_at >= cutoff:
+                break
+            self._runs.popitem(last=False)
+            run.cancel()
+            self.stats["expired"] += 1
+
+    def get(self, analysis_id: str, owner_id: int) -> Optional[AnalysisRun]:
+        """The run for analysis_id if it exists, has not expired and belongs to owner_id."""
+        self._prune()
+        run = self._runs.get(analysis_id)
+        if run is None or run.owner_id != owner_id:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return run
+
+    async def result(self, run: AnalysisRun, steps: Optional[List[str]] = None, wait: float = None) -> Dict[str, Any]:
+        """
+        The analysis with the background results. Waits up to `wait` seconds for
+        unfinished steps; steps still running or failed are returned as None.
+        """
+        steps = steps or list(self.STEPS)
+        tasks = [run.tasks[name] for name in steps if name in run.tasks]
+        wait = settings.ANALYSIS_PIPELINE_WAIT if wait is None else wait
+        if wait > 0 and tasks:
+            # asyncio.wait never cancels the tasks, so a client that gives up leaves them running for the next request
+            await asyncio.wait(tasks, timeout=wait)
+        response = {
+            "analysis_id": run.analysis_id,
+            "analysis": run.analysis,
+            "status": run.status()
+        }
+        for name in steps:
+            task = run.tasks.get(name)
+            done = task is not None and task.done() and not task.cancelled() and task.exception() is None
+            response[name] = task.result() if done else None
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        pending = sum(1 for run in self._runs.values() for task in run.tasks.values() if not task.done())
+        return {**self.stats, "entries": len(self._runs), "pending_tasks": pending}
+
+
+# Global pipeline shared by the builder endpoints
+analysis_pipeline = AnalysisPipeline(
+    ttl=settings.ANALYSIS_PIPELINE_TTL,
+    max_entries=settings.ANALYSIS_PIPELINE_MAX_ENTRIES
+)
@@ -0,0 +1,362 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import sqlite3
+import threading
+import time
+from app.core.config import settings
+
+# Modules whose templates determine generated files; their source is part of every key,
+# so a deploy that changes a template never serves file sets built by the old one.
+# For a package, every module in it counts.
+GENERATOR_MODULES = (
+    "app.services.code_generator",
+    "app.services.framework_generator",
+    "app.services.framework_plugins"
+)
+
+
+def generator_fingerprint(modules=GENERATOR_MODULES) -> str:
+    """sha256 over the source of the generator modules."""
+    digest = hashlib.sha256()
+    for name in modules:
+        spec = importlib.util.find_spec(name)
+        if spec is None or not spec.origin:
+            continue
+        paths = [spec.origin]
+        if spec.submodule_search_locations:
+            paths = sorted(
+                os.path.join(location, entry)
+                for location in spec.submodule_search_locations
+                for entry in os.listdir(location) if entry.endswith(".py")
+            )
+        for path in paths:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _normalize(value: Any) -> Any:
+    """Drop empty values so {"features": []} and a missing key hash the same."""
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of generated project file sets.
+
+    A generation result is stored as a manifest (file path -> sha256 of its
+    content, plus the non-file parts of the result such as the structure)
+    under a hash of the normalized analysis and tech stack. File contents are
+    stored once per sha256, so the many files that every project of a stack
+    shares take space once. Manifests live in a local SQLite file, with an
+    in-memory LRU of the most recent results in front; the least recently used
+    manifests beyond max_manifests are dropped along with blobs nothing refers to.
+    """
+
+    # Enforce max_manifests and collect unreferenced blobs every this many writes
+    PRUNE_EVERY = 50
+
+    def __init__(self, db_path: str, max_manifests: int = 1000, memory_entries: int = 32, enabled: bool = True):
+        self.db_path = db_path
+        self.max_manifests = max_manifests
+        self.memory_entries = memory_entries
+        self.enabled = enabled
+        self._fingerprint: Optional[str] = None
+        self._entries: "OrderedDict[str, Tuple[Dict[str, str], Dict[str, Any]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._db_failed = False
+        self._writes_since_prune = 0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "files_reused": 0,
+            "bytes_reused": 0,
+            "blobs_written": 0,
+            "bytes_written": 0,
+            "bytes_deduplicated": 0
+        }
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = generator_fingerprint()
+        return self._fingerprint
+
+    def make_key(self, generator: str, inputs: Dict[str, Any]) -> str:
+        """
+        Canonical hash of everything that determines a generation result: the
+        generator code and the input fields its stages read. Callers pass only
+        those fields, so free text elsewhere in an analysis does not split the key.
+        """
+        payload = json.dumps(
+            [self.fingerprint, generator, _normalize(inputs or {})],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # SQLite backing store (runs in a worker thread)
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        if self._db is not None or self._db_failed or not self.db_path:
+            return self._db
+        try:
+            db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS artifact_blobs ("
+                "sha256 TEXT PRIMARY KEY, content TEXT NOT NULL, size INTEGER NOT NULL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS artifact_manifests ("
+                "key TEXT PRIMARY KEY, extra TEXT NOT NULL, created_at REAL NOT NULL, "
+                "last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS artifact_manifest_files ("
+                "key TEXT NOT NULL, path TEXT NOT NULL, sha256 TEXT NOT NULL, PRIMARY KEY (key, path))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_artifact_manifest_files_sha ON artifact_manifest_files (sha256)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_artifact_manifests_last_used ON artifact_manifests (last_used)")
+            db.commit()
+            self._db = db
+        except Exception as e:
+            print(f"Artifact store: SQLite store unavailable ({e}), using memory only")
+            self._db = None
+            self._db_failed = True
+        return self._db
+
+    def _disk_get(self, key: str) -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+        with self._db_lock:
+            db = self._get_db()
+            if db is None:
+                return None
+            row = db.execute("SELECT extra FROM artifact_manifests WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            files = dict(db.execute(
+                "SELECT f.path, b.content FROM artifact_manifest_files f "
+                "JOIN artifact_blobs b ON b.sha256 = f.sha256 WHERE f.key = ?",
+                (key,)
+            ).fetchall())
+            expected = db.execute("SELECT COUNT(*) FROM artifact_manifest_files WHERE key = ?", (key,)).fetchone()[0]
+            if len(files) != expected:
+                # A blob went missing; treat the manifest as gone so it gets rebuilt
+                db.execute("DELETE FROM artifact_manifests WHERE key = ?", (key,))
+                db.execute("DELETE FROM artifact_manifest_files WHERE key = ?", (key,))
+                db.commit()
+                return None
+            db.execute("UPDATE artifact_manifests SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+            db.commit()
+            return files, json.loads(row[0])
+
+    def _write_blobs(self, db: sqlite3.Connection, files: Dict[str, str]) -> Tuple[Dict[str, str], int, int, int]:
+        """Store file contents by sha256. Returns (path -> sha256, blobs written, bytes written, bytes deduplicated)."""
+        shas = {}
+        blobs_written = bytes_written = bytes_deduplicated = 0
+        for path, content in files.items():
+            content = content or ""
+            encoded = content.encode("utf-8", errors="replace")
+            sha = hashlib.sha256(encoded).hexdigest()
+            shas[path] = sha
+            inserted = db.execute(
+                "INSERT OR IGNORE INTO artifact_blobs (sha256, content, size) VALUES (?, ?, ?)",
+                (sha, content, len(encoded))
+            ).rowcount
+            if inserted:
+                blobs_written += 1
+                bytes_written += len(encoded)
+            else:
+                bytes_deduplicated += len(encoded)
+        return shas, blobs_written, bytes_written, bytes_deduplicated
+
+    def _write_manifest(self, db: sqlite3.Connection, key: str, shas: Dict[str, str], extra: Dict[str, Any]):
+        now = time.time()
+        db.execute("DELETE FROM artifact_manifest_files WHERE key = ?", (key,))
+        db.executemany(
+            "INSERT INTO artifact_manifest_files (key, path, sha256) VALUES (?, ?, ?)",
+            [(key, path, sha) for path, sha in shas.items()]
+        )
+        db.execute(
+            "INSERT OR REPLACE INTO artifact_manifests (key, extra, created_at, last_used) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(extra, default=str), now, now)
+        )
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= self.PRUNE_EVERY:
+            self._writes_since_prune = 0
+            self._prune(db)
+
+    def _disk_put(self, key: str, files: Dict[str, str], extra: Dict[str, Any]) -> Tuple[int, int, int]:
+        """Returns (blobs written, bytes written, bytes deduplicated)."""
+        with self._db_lock:
+            db = self._get_db()
+            if db is None:
+                return 0, 0, 0
+            shas, blobs_written, bytes_written, bytes_deduplicated = self._write_blobs(db, files)
+            self._write_manifest(db, key, shas, extra)
+            db.commit()
+            return blobs_written, bytes_written, bytes_deduplicated
+
+    def _disk_put_blobs(self, files: Dict[str, str]) -> Tuple[Dict[str, str], int, int, int]:
+        with self._db_lock:
+            db = self._get_db()
+            if db is None:
+                return {}, 0, 0, 0
+            result = self._write_blobs(db, files)
+            db.commit()
+            return result
+
+    def _disk_put_manifest(self, key: str, shas: Dict[str, str], extra: Dict[str, Any]) -> bool:
+        with self._db_lock:
+            db = self._get_db()
+            if db is None:
+                return False
+            self._write_manifest(db, key, shas, extra)
+            db.commit()
+            return True
+
+    def _prune(self, db: sqlite3.Connection):
+        db.execute(
+            "DELETE FROM artifact_manifests WHERE key NOT IN "
+            "(SELECT key FROM artifact_manifests ORDER BY last_used DESC LIMIT ?)",
+            (self.max_manifests,)
+        )
+        db.execute("DELETE FROM artifact_manifest_files WHERE key NOT IN (SELECT key FROM artifact_manifests)")
+        db.execute("DELETE FROM artifact_blobs WHERE sha256 NOT IN (SELECT sha256 FROM artifact_manifest_files)")
+
+    def _counts(self) -> Dict[str, int]:
+        with self._db_lock:
+            db = self._get_db()
+            if db is None:
+                return {}
+            manifests = db.execute("SELECT COUNT(*) FROM artifact_manifests").fetchone()[0]
+            blobs, stored_bytes = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifact_blobs").fetchone()
+            return {"manifests": manifests, "blobs": blobs, "stored_bytes": stored_bytes}
+
+    # In-memory LRU front
+    def _remember(self, key: str, files: Dict[str, str], extra: Dict[str, Any]):
+        self._entries[key] = (files, extra)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.memory_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+        """The stored (files, extra) for key, or None. Both are fresh copies the caller may change."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        else:
+            try:
+                entry = await asyncio.to_thread(self._disk_get, key)
+            except Exception as e:
+                print(f"Artifact store read error: {e}")
+                entry = None
+            if entry is not None:
+                self._remember(key, *entry)
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        files, extra = entry
+        self.stats["hits"] += 1
+        self.stats["files_reused"] += len(files)
+        self.stats["bytes_reused"] += sum(len((content or "").encode("utf-8", errors="replace")) for content in files.values())
+        return dict(files), json.loads(json.dumps(extra, default=str))
+
+    async def put(self, key: str, files: Dict[str, str], extra: Dict[str, Any]):
+        """Store a generation result: its files by content hash and the rest as JSON."""
+        if not self.enabled:
+            return
+        self._remember(key, dict(files), json.loads(json.dumps(extra, default=str)))
+        self.stats["writes"] += 1
+        try:
+            blobs_written, bytes_written, bytes_deduplicated = await asyncio.to_thread(self._disk_put, key, files, extra)
+        except Exception as e:
+            print(f"Artifact store write error: {e}")
+            return
+        self.stats["blobs_written"] += blobs_written
+        self.stats["bytes_written"] += bytes_written
+        self.stats["bytes_deduplicated"] += bytes_deduplicated
+
+    def writer(self, key: str) -> "ArtifactWriter":
+        """A writer that stores a generation result for key file by file, as it is generated."""
+        return ArtifactWriter(self, key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and bytes saved, for monitoring. Counts rows in SQLite, so call it off the event loop."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        stats = {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "bytes_saved": self.stats["bytes_reused"] + self.stats["bytes_deduplicated"],
+            "memory_entries": len(self._entries),
+            "max_manifests": self.max_manifests,
+            "enabled": self.enabled
+        }
+        try:
+            stats.update(self._counts())
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        return stats
+
+
+class ArtifactWriter:
+    """
+    Stores one generation result incrementally: file contents go to the blob
+    table as they arrive and only their hashes are kept; commit() writes the
+    manifest. Unlike put(), the result is not kept in the in-memory LRU, so a
+    streamed project is never held in memory as a whole. If a blob is pruned
+    before commit, the manifest is dropped on its first read and rebuilt.
+    """
+
+    def __init__(self, store: ArtifactStore, key: str):
+        self.store = store
+        self.key = key
+        self._shas: Dict[str, str] = {}
+        self._failed = False
+
+    async def add(self, files: Dict[str, str]):
+        if not self.store.enabled or self._failed or not files:
+            return
+        try:
+            shas, blobs_written, bytes_written, bytes_deduplicated = await asyncio.to_thread(self.store._disk_put_blobs, files)
+        except Exception as e:
+            print(f"Artifact store write error: {e}")
+            self._failed = True
+            return
+        self._shas.update(shas)
+        self.store.stats["blobs_written"] += blobs_written
+        self.store.stats["bytes_written"] += bytes_written
+        self.store.stats["bytes_deduplicated"] += bytes_deduplicated
+
+    async def commit(self, extra: Dict[str, Any]):
+        if not self.store.enabled or self._failed:
+            return
+        try:
+            if await asyncio.to_thread(self.store._disk_put_manifest, self.key, self._shas, extra):
+                self.store.stats["writes"] += 1
+        except Exception as e:
+            print(f"Artifact store write error: {e}")
+
+
+# Global store shared by every AI agent instance
+artifact_store = ArtifactStore(
+    settings.ARTIFACT_STORE_PATH,
+    max_manifests=settings.ARTIFACT_STORE_MAX_MANIFESTS,
+    memory_entries=settings.ARTIFACT_STORE_MEMORY_ENTRIES,
+    enabled=settings.ARTIFACT_STORE_ENABLED
+)
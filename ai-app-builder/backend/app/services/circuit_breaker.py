@@ -0,0 +1,122 @@
+from typing import Dict, Any
+import time
+from app.core.config import settings
+from app.services.integrations.errors import CircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    closed: calls pass through; consecutive failures are counted.
+    open: calls fail immediately with CircuitOpenError until recovery_timeout has passed.
+    half_open: a limited number of probe calls go through; a success closes the
+    circuit, a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.stats = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0
+        }
+
+    @property
+    def state(self) -> str:
+        # An open circuit turns half-open once the recovery timeout has passed
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self.probes_in_flight = 0
+        return self._state
+
+    def is_available(self) -> bool:
+        """Whether a call would currently be let through (does not reserve a probe)."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            return self.probes_in_flight < self.half_open_max_calls
+        return False
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call must not go out; reserve a probe slot when half-open."""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and self.probes_in_flight < self.half_open_max_calls:
+            self.probes_in_flight += 1
+            return
+        self.stats["rejected"] += 1
+        retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self):
+        self.stats["successes"] += 1
+        self.consecutive_failures = 0
+        if self._state != self.CLOSED:
+            print(f"Circuit for {self.name} closed")
+        self._state = self.CLOSED
+        self.probes_in_flight = 0
+
+    def record_failure(self):
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def release_probe(self):
+        """Give back a half-open probe slot after a call that neither succeeded nor failed."""
+        if self._state == self.HALF_OPEN and self.probes_in_flight > 0:
+            self.probes_in_flight -= 1
+
+    def _open(self):
+        if self._state != self.OPEN:
+            self.stats["opened"] += 1
+            print(f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures")
+        self._state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probes_in_flight = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures
+        }
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per provider, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                recovery_timeout=settings.LLM_CIRCUIT_RECOVERY_TIMEOUT,
+                half_open_max_calls=settings.LLM_CIRCUIT_HALF_OPEN_CALLS
+            )
+        return self._breakers[name]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {name: breaker.get_stats() for name, breaker in self._breakers.items()}
+
+
+# Global registry shared by all AI agent instances
+circuit_breakers = CircuitBreakerRegistry()
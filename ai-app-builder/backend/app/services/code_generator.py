@@ -1,22 +1,126 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+from collections import OrderedDict
 import os
 import json
+import threading
 from pathlib import Path
+from app.core.config import settings
+
+
+def _key_part(value: Any) -> str:
+    # Plain strings stand for themselves; anything else (enums, dicts) renders differently, so use its repr
+    return value if type(value) is str else repr(value)
+
+
+class RenderedFileCache:
+    """
+    LRU of generated file sets.
+
+    Template output depends only on the project type and which features are
+    present (features are only ever tested for membership), so file sets are
+    kept under (section, project_type, sorted features) and each
+    combination is rendered once.
+    """
+
+    def __init__(self, max_entries: int = 256, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0
+        }
+
+    @staticmethod
+    def key(section: str, project_type: Any, features: List[Any]) -> Tuple:
+        return (section, _key_part(project_type), tuple(sorted({_key_part(feature) for feature in features or []})))
+
+    def get(self, key: Tuple):
+        with self._lock:
+            files = self._entries.get(key)
+            if files is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return files
+
+    def put(self, key: Tuple, files: Dict[str, str]):
+        with self._lock:
+            self._entries[key] = files
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "enabled": self.enabled, "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+# Global cache shared by every CodeGenerator instance
+rendered_file_cache = RenderedFileCache(
+    max_entries=settings.CODEGEN_CACHE_SIZE,
+    enabled=settings.CODEGEN_CACHE_ENABLED
+)
+
 
 class CodeGenerator:
     """
     Advanced code generator for creating complete full-stack applications.
     """
     
-    def __init__(self):
+    # Template registry: each section of a project and the method that builds its files
+    SECTIONS = {
+        "react": "_build_react_app",
+        "fastapi": "_build_fastapi_app",
+        "database": "_build_database_schema",
+        "deployment": "_build_deployment_config"
+    }
+    
+    def __init__(self, cache: RenderedFileCache = None):
         # No external dependencies - generate code internally
-        pass
-        
+        self.cache = cache or rendered_file_cache
+        self._builders = {section: getattr(self, name) for section, name in self.SECTIONS.items()}
+    
+    def render(self, section: str, analysis: Dict[str, Any]) -> Dict[str, str]:
+        """Files of one section for the analysis, built once per (project_type, features)."""
+        project_type = analysis.get("project_type", "web_app")
+        features = analysis.get("features", [])
+        if not self.cache.enabled:
+            return self._builders[section](project_type, features)
+        key = self.cache.key(section, project_type, features)
+        files = self.cache.get(key)
+        if files is None:
+            files = self._builders[section](project_type, features)
+            self.cache.put(key, files)
+        # Callers add to the dict they get, so hand out a copy (the strings themselves are shared)
+        return dict(files)
+    
     async def generate_react_app(self, analysis: Dict[str, Any]) -> Dict[str, str]:
         """Generate complete React frontend application."""
+        return self.render("react", analysis)
+    
+    async def generate_fastapi_app(self, analysis: Dict[str, Any]) -> Dict[str, str]:
+        """Generate complete FastAPI backend application."""
+        return self.render("fastapi", analysis)
+    
+    async def generate_database_schema(self, analysis: Dict[str, Any]) -> Dict[str, str]:
+        """Generate MySQL database schema."""
+        return self.render("database", analysis)
+    
+    async def generate_deployment_config(self, analysis: Dict[str, Any]) -> Dict[str, str]:
+        """Generate deployment configurations."""
+        return self.render("deployment", analysis)
+    
+    def _build_react_app(self, project_type: str, features: List[str]) -> Dict[str, str]:
+        """Build the React frontend files."""
         files = {}
-        project_type = analysis.get("project_type", "web_app")
-        features = analysis.get("features", [])
         
         # Generate main App.js
         files["frontend/src/App.js"] = self._generate_react_app_js(project_type, features)
@@ -50,11 +154,9 @@ class CodeGenerator:
         
         return files
     
-    async def generate_fastapi_app(self, analysis: Dict[str, Any]) -> Dict[str, str]:
-        """Generate complete FastAPI backend application."""
+    def _build_fastapi_app(self, project_type: str, features: List[str]) -> Dict[str, str]:
+        """Build the FastAPI backend files."""
         files = {}
-        project_type = analysis.get("project_type", "web_app")
-        features = analysis.get("features", [])
         
         # Generate main.py
         files["backend/app/main.py"] = self._generate_fastapi_main(project_type, features)
@@ -84,11 +186,9 @@ class CodeGenerator:
         
         return files
     
-    async def generate_database_schema(self, analysis: Dict[str, Any]) -> Dict[str, str]:
-        """Generate MySQL database schema."""
+    def _build_database_schema(self, project_type: str, features: List[str]) -> Dict[str, str]:
+        """Build the MySQL schema and migration files."""
         files = {}
-        project_type = analysis.get("project_type", "web_app")
-        features = analysis.get("features", [])
         
         # Generate database schema
         schema_sql = self._generate_mysql_schema(project_type, features)
@@ -100,10 +200,9 @@ class CodeGenerator:
         
         return files
     
-    async def generate_deployment_config(self, analysis: Dict[str, Any]) -> Dict[str, str]:
-        """Generate deployment configurations."""
+    def _build_deployment_config(self, project_type: str, features: List[str]) -> Dict[str, str]:
+        """Build the deployment configuration files."""
         files = {}
-        project_type = analysis.get("project_type", "web_app")
         
         # Generate Docker files
         files["Dockerfile"] = self._generate_main_dockerfile()
@@ -0,0 +1,123 @@
+from typing import Dict, Any, Optional
+import json
+from app.core.config import settings
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Context keys that help the model answer; everything else clients send (their own
+# copy of the chat history, UI state, the user id) is left out of the prompt
+CONTEXT_KEYS = (
+    "project_id",
+    "project_name",
+    "project_type",
+    "description",
+    "stage",
+    "analysis",
+    "requirements",
+    "features",
+    "tech_stack",
+    "framework",
+    "language",
+    "file_structure",
+    "file_tree",
+    "files",
+    "current_file",
+    "selected_code",
+    "code",
+    "error",
+    "error_message"
+)
+
+
+def _dumps(value: Any) -> bytes:
+    """Compact JSON with sorted keys; orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+class ContextSerializer:
+    """
+    Renders client-supplied context for prompts.
+
+    Only CONTEXT_KEYS are kept. Strings longer than max_value_chars, lists longer
+    than max_items and nesting deeper than max_depth are cut with a marker, and
+    the output is compact JSON capped at max_chars. Capping first means megabytes
+    of file contents are never serialized, only their first max_value_chars.
+    """
+
+    def __init__(
+        self,
+        max_value_chars: int = 2000,
+        max_items: int = 50,
+        max_chars: int = 12000,
+        max_depth: int = 6
+    ):
+        self.max_value_chars = max_value_chars
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self.max_depth = max_depth
+        self.stats = {
+            "renders": 0,
+            "output_chars": 0
+        }
+
+    def _cap(self, value: Any, depth: int = 0) -> Any:
+        if isinstance(value, str):
+            if len(value) > self.max_value_chars:
+                return value[:self.max_value_chars] + f"... [{len(value) - self.max_value_chars} chars omitted]"
+            return value
+        if isinstance(value, dict):
+            if depth >= self.max_depth:
+                return f"{{... {len(value)} keys omitted}}"
+            items = list(value.items())
+            capped = {str(key): self._cap(item, depth + 1) for key, item in items[:self.max_items]}
+            if len(items) > self.max_items:
+                capped["..."] = f"{len(items) - self.max_items} more keys omitted"
+            return capped
+        if isinstance(value, (list, tuple, set)):
+            if depth >= self.max_depth:
+                return f"[... {len(value)} items omitted]"
+            items = list(value)
+            capped = [self._cap(item, depth + 1) for item in items[:self.max_items]]
+            if len(items) > self.max_items:
+                capped.append(f"... {len(items) - self.max_items} more items omitted")
+            return capped
+        return value
+
+    def compact(self, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """The whitelisted, size-capped context."""
+        if not context:
+            return {}
+        return {key: self._cap(context[key]) for key in CONTEXT_KEYS if context.get(key) not in (None, "", [], {})}
+
+    def render(self, context: Optional[Dict[str, Any]], empty: str = "No additional context") -> str:
+        """Prompt text for the context, or `empty` when nothing relevant is left."""
+        capped = self.compact(context)
+        if not capped:
+            return empty
+
+        rendered = _dumps(capped).decode("utf-8")
+        if len(rendered) > self.max_chars:
+            rendered = rendered[:self.max_chars] + f"... [{len(rendered) - self.max_chars} chars omitted]"
+        self.stats["renders"] += 1
+        self.stats["output_chars"] += len(rendered)
+        return rendered
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "encoder": "orjson" if ORJSON_AVAILABLE else "json"
+        }
+
+
+# Global serializer shared by all AI agent instances
+context_serializer = ContextSerializer(
+    max_value_chars=settings.CONTEXT_MAX_VALUE_CHARS,
+    max_items=settings.CONTEXT_MAX_ITEMS,
+    max_chars=settings.CONTEXT_MAX_CHARS
+)
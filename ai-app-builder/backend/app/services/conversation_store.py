@@ -0,0 +1,325 @@
+from typing import Dict, Any, List, Optional
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+import asyncio
+import sqlite3
+import threading
+import time
+from app.core.config import settings
+
+
+class ConversationStore(ABC):
+    """
+    Chat history per user, bounded in every direction: each user keeps only the
+    last max_messages messages (longer ones cut to max_message_chars), at most
+    max_users conversations are kept (least recently used go first) and a
+    conversation idle for idle_ttl seconds is dropped.
+
+    Each message carries an id, increasing within a conversation. Next to the
+    messages a conversation has a running summary of older turns; compact()
+    replaces the messages up to an id with an updated summary.
+    """
+
+    backend = "base"
+
+    def __init__(self, max_messages: int = 15, max_users: int = 10000, idle_ttl: int = 86400, max_message_chars: int = 8000):
+        self.max_messages = max_messages
+        self.max_users = max_users
+        self.idle_ttl = idle_ttl
+        self.max_message_chars = max_message_chars
+        self.stats = {
+            "appends": 0,
+            "evictions": 0,
+            "expired": 0
+        }
+
+    @staticmethod
+    def _key(user_id: Any) -> str:
+        return str(user_id if user_id is not None else "default")
+
+    def _message(self, role: str, content: str) -> Dict[str, str]:
+        content = content or ""
+        if len(content) > self.max_message_chars:
+            content = content[:self.max_message_chars] + " [...]"
+        return {"role": role, "content": content}
+
+    @abstractmethod
+    async def append(self, user_id: Any, role: str, content: str):
+        """Add a message to the user's conversation."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, user_id: Any) -> List[Dict[str, Any]]:
+        """The user's recent messages ({"id", "role", "content"}), oldest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_summary(self, user_id: Any) -> str:
+        """The running summary of the user's older turns ("" if none)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def compact(self, user_id: Any, summary: str, through_id: int):
+        """Store a new summary and drop the messages it covers (ids up to through_id)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self, user_id: Any):
+        """Forget the user's conversation."""
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "backend": self.backend,
+            "max_messages": self.max_messages,
+            "max_users": self.max_users,
+            "idle_ttl": self.idle_ttl
+        }
+
+
+class _Conversation:
+    __slots__ = ("messages", "last_used", "next_id", "summary")
+
+    def __init__(self, max_messages: int):
+        self.messages = deque(maxlen=max_messages)
+        self.last_used = time.time()
+        self.next_id = 1
+        self.summary = ""
+
+
+class MemoryConversationStore(ConversationStore):
+    """In-process store: a ring buffer per user in an LRU ordered by last use."""
+
+    backend = "memory"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+
+    def _expire(self):
+        # The least recently used conversation is first, so stop at the first one still fresh
+        cutoff = time.time() - self.idle_ttl
+        while self._conversations:
+            key, conversation = next(iter(self._conversations.items()))
+            if conversation.last_used >= cutoff:
+                break
+            del self._conversations[key]
+            self.stats["expired"] += 1
+
+    async def append(self, user_id: Any, role: str, content: str):
+        self._expire()
+        key = self._key(user_id)
+        conversation = self._conversations.get(key)
+        if conversation is None:
+            conversation = self._conversations[key] = _Conversation(self.max_messages)
+        message = self._message(role, content)
+        message["id"] = conversation.next_id
+        conversation.next_id += 1
+        conversation.messages.append(message)
+        conversation.last_used = time.time()
+        self._conversations.move_to_end(key)
+        self.stats["appends"] += 1
+        while len(self._conversations) > self.max_users:
+            self._conversations.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, user_id: Any) -> List[Dict[str, Any]]:
+        self._expire()
+        conversation = self._conversations.get(self._key(user_id))
+        return list(conversation.messages) if conversation is not None else []
+
+    async def get_summary(self, user_id: Any) -> str:
+        conversation = self._conversations.get(self._key(user_id))
+        return conversation.summary if conversation is not None else ""
+
+    async def compact(self, user_id: Any, summary: str, through_id: int):
+        conversation = self._conversations.get(self._key(user_id))
+        if conversation is None:
+            return
+        while conversation.messages and conversation.messages[0]["id"] <= through_id:
+            conversation.messages.popleft()
+        conversation.summary = summary
+
+    async def clear(self, user_id: Any):
+        self._conversations.pop(self._key(user_id), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **super().get_stats(),
+            "users": len(self._conversations),
+            "messages": sum(len(conversation.messages) for conversation in self._conversations.values())
+        }
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    SQLite-backed store, so every uvicorn worker on the host sees the same history.
+    Queries run in a worker thread; the file uses WAL so readers don't block writers.
+    """
+
+    backend = "sqlite"
+    # Enforce the user cap and idle TTL every this many appends
+    PRUNE_EVERY = 100
+
+    def __init__(self, db_path: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._appends_since_prune = 0
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS conversation_messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, user_key TEXT NOT NULL, "
+                "role TEXT NOT NULL, content TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_conversation_messages_user ON conversation_messages (user_key, id)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS conversation_users ("
+                "user_key TEXT PRIMARY KEY, last_used REAL NOT NULL, summary TEXT NOT NULL DEFAULT '')"
+            )
+            columns = [row[1] for row in db.execute("PRAGMA table_info(conversation_users)")]
+            if "summary" not in columns:
+                db.execute("ALTER TABLE conversation_users ADD COLUMN summary TEXT NOT NULL DEFAULT ''")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_conversation_users_last_used ON conversation_users (last_used)")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _append(self, key: str, message: Dict[str, str]) -> int:
+        with self._db_lock:
+            db = self._get_db()
+            now = time.time()
+            db.execute(
+                "INSERT INTO conversation_messages (user_key, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (key, message["role"], message["content"], now)
+            )
+            db.execute(
+                "INSERT INTO conversation_users (user_key, last_used) VALUES (?, ?) "
+                "ON CONFLICT(user_key) DO UPDATE SET last_used = excluded.last_used",
+                (key, now)
+            )
+            # Ring buffer: keep the newest max_messages rows of this user
+            db.execute(
+                "DELETE FROM conversation_messages WHERE user_key = ? AND id NOT IN "
+                "(SELECT id FROM conversation_messages WHERE user_key = ? ORDER BY id DESC LIMIT ?)",
+                (key, key, self.max_messages)
+            )
+            evicted = 0
+            self._appends_since_prune += 1
+            if self._appends_since_prune >= self.PRUNE_EVERY:
+                self._appends_since_prune = 0
+                evicted = self._prune(db, now)
+            db.commit()
+            return evicted
+
+    def _prune(self, db: sqlite3.Connection, now: float) -> int:
+        """Drop idle conversations and the least recently used ones beyond max_users."""
+        expired = db.execute("DELETE FROM conversation_users WHERE last_used < ?", (now - self.idle_ttl,)).rowcount
+        self.stats["expired"] += max(0, expired)
+        evicted = db.execute(
+            "DELETE FROM conversation_users WHERE user_key NOT IN "
+            "(SELECT user_key FROM conversation_users ORDER BY last_used DESC LIMIT ?)",
+            (self.max_users,)
+        ).rowcount
+        db.execute(
+            "DELETE FROM conversation_messages WHERE user_key NOT IN (SELECT user_key FROM conversation_users)"
+        )
+        return max(0, evicted)
+
+    def _get(self, key: str) -> List[Dict[str, Any]]:
+        with self._db_lock:
+            db = self._get_db()
+            row = db.execute("SELECT last_used FROM conversation_users WHERE user_key = ?", (key,)).fetchone()
+            if row is None:
+                return []
+            if row[0] < time.time() - self.idle_ttl:
+                self._clear(db, key)
+                db.commit()
+                self.stats["expired"] += 1
+                return []
+            rows = db.execute(
+                "SELECT id, role, content FROM conversation_messages WHERE user_key = ? ORDER BY id",
+                (key,)
+            ).fetchall()
+            return [{"id": message_id, "role": role, "content": content} for message_id, role, content in rows]
+
+    def _get_summary(self, key: str) -> str:
+        with self._db_lock:
+            row = self._get_db().execute("SELECT summary FROM conversation_users WHERE user_key = ?", (key,)).fetchone()
+            return row[0] if row else ""
+
+    def _compact(self, key: str, summary: str, through_id: int):
+        with self._db_lock:
+            db = self._get_db()
+            db.execute("UPDATE conversation_users SET summary = ? WHERE user_key = ?", (summary, key))
+            db.execute("DELETE FROM conversation_messages WHERE user_key = ? AND id <= ?", (key, through_id))
+            db.commit()
+
+    @staticmethod
+    def _clear(db: sqlite3.Connection, key: str):
+        db.execute("DELETE FROM conversation_messages WHERE user_key = ?", (key,))
+        db.execute("DELETE FROM conversation_users WHERE user_key = ?", (key,))
+
+    def _clear_user(self, key: str):
+        with self._db_lock:
+            db = self._get_db()
+            self._clear(db, key)
+            db.commit()
+
+    def _counts(self) -> Dict[str, int]:
+        with self._db_lock:
+            db = self._get_db()
+            users = db.execute("SELECT COUNT(*) FROM conversation_users").fetchone()[0]
+            messages = db.execute("SELECT COUNT(*) FROM conversation_messages").fetchone()[0]
+            return {"users": users, "messages": messages}
+
+    async def append(self, user_id: Any, role: str, content: str):
+        evicted = await asyncio.to_thread(self._append, self._key(user_id), self._message(role, content))
+        self.stats["appends"] += 1
+        self.stats["evictions"] += evicted
+
+    async def get(self, user_id: Any) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, self._key(user_id))
+
+    async def get_summary(self, user_id: Any) -> str:
+        return await asyncio.to_thread(self._get_summary, self._key(user_id))
+
+    async def compact(self, user_id: Any, summary: str, through_id: int):
+        await asyncio.to_thread(self._compact, self._key(user_id), summary, through_id)
+
+    async def clear(self, user_id: Any):
+        await asyncio.to_thread(self._clear_user, self._key(user_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {**super().get_stats(), "path": self.db_path}
+        try:
+            stats.update(self._counts())
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        return stats
+
+
+def build_conversation_store() -> ConversationStore:
+    """Pick the backend for CONVERSATION_STORE_BACKEND: memory (default) or sqlite."""
+    limits = {
+        "max_messages": settings.CONVERSATION_MAX_MESSAGES,
+        "max_users": settings.CONVERSATION_MAX_USERS,
+        "idle_ttl": settings.CONVERSATION_IDLE_TTL,
+        "max_message_chars": settings.CONVERSATION_MAX_MESSAGE_CHARS
+    }
+    backend = settings.CONVERSATION_STORE_BACKEND
+    if backend == "sqlite":
+        return SQLiteConversationStore(settings.CONVERSATION_STORE_PATH, **limits)
+    if backend != "memory":
+        print(f"Unknown CONVERSATION_STORE_BACKEND '{backend}', using memory")
+    return MemoryConversationStore(**limits)
+
+
+# Global conversation store shared by all AI agent instances
+conversation_store = build_conversation_store()
@@ -0,0 +1,85 @@
+from typing import Dict, Any
+import asyncio
+from app.core.config import settings
+from app.services.conversation_store import ConversationStore, conversation_store
+from app.services.token_budget import estimate_tokens
+
+
+class ConversationSummarizer:
+    """
+    Background compaction of chat history.
+
+    After a chat turn, if a conversation's messages exceed threshold_tokens, every
+    message but the last keep_recent is folded into the conversation's running
+    summary (written by a cheap model) and dropped from the store. The chat prompt
+    then carries the summary plus the recent turns, so its size stays roughly
+    constant however long the session runs. At most one compaction runs per
+    conversation at a time.
+    """
+
+    def __init__(self, store: ConversationStore, threshold_tokens: int = 1500, keep_recent: int = 4, enabled: bool = True):
+        self.store = store
+        self.threshold_tokens = threshold_tokens
+        self.keep_recent = keep_recent
+        self.enabled = enabled
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "scheduled": 0,
+            "compactions": 0,
+            "failed": 0,
+            "messages_folded": 0,
+            "tokens_folded": 0
+        }
+
+    def schedule(self, ai_agent, user_id: Any):
+        """Compact the conversation in the background if it has grown past the threshold."""
+        if not self.enabled:
+            return
+        key = str(user_id)
+        if key in self._tasks:
+            return
+        task = asyncio.ensure_future(self._compact(ai_agent, user_id))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _task, key=key: self._done(key, _task))
+        self.stats["scheduled"] += 1
+
+    def _done(self, key: str, task: asyncio.Task):
+        self._tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["failed"] += 1
+            print(f"Conversation summary failed: {task.exception()}")
+
+    async def _compact(self, ai_agent, user_id: Any):
+        history = await self.store.get(user_id)
+        if len(history) <= self.keep_recent:
+            return
+        if sum(estimate_tokens(message["content"]) for message in history) <= self.threshold_tokens:
+            return
+        older = history[:-self.keep_recent] if self.keep_recent else history
+        previous_summary = await self.store.get_summary(user_id)
+        summary = await ai_agent.summarize_conversation(previous_summary, older)
+        if not summary:
+            self.stats["failed"] += 1
+            return
+        await self.store.compact(user_id, summary, older[-1]["id"])
+        self.stats["compactions"] += 1
+        self.stats["messages_folded"] += len(older)
+        self.stats["tokens_folded"] += sum(estimate_tokens(message["content"]) for message in older)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "running": len(self._tasks),
+            "threshold_tokens": self.threshold_tokens,
+            "keep_recent": self.keep_recent
+        }
+
+
+# Global summarizer for the shared conversation store
+conversation_summarizer = ConversationSummarizer(
+    conversation_store,
+    threshold_tokens=settings.CONVERSATION_SUMMARY_THRESHOLD_TOKENS,
+    keep_recent=settings.CONVERSATION_SUMMARY_KEEP_RECENT,
+    enabled=settings.CONVERSATION_SUMMARY_ENABLED
+)
@@ -0,0 +1,108 @@
+from typing import Dict, Any
+import json
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class AngularPlugin(FrameworkPlugin):
+    name = "angular"
+    kind = "frontend"
+    structure_key = "frontend"
+    config = {
+        'name': 'Angular',
+        'description': 'Enterprise-grade TypeScript framework',
+        'dependencies': ['@angular/core', '@angular/common', '@angular/router'],
+        'features': ['typescript', 'dependency_injection', 'cli']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "src": {
+                "app": {
+                    "components": {},
+                    "services": {},
+                    "guards": {},
+                    "interceptors": {},
+                    "models": {},
+                    "modules": {}
+                },
+                "assets": {},
+                "environments": {}
+            }
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "frontend/package.json": self.package_json(
+                "angular-app",
+                {"start": "ng serve --port 3000", "build": "ng build"},
+                {
+                    "@angular/common": "^17.0.0",
+                    "@angular/compiler": "^17.0.0",
+                    "@angular/core": "^17.0.0",
+                    "@angular/platform-browser": "^17.0.0",
+                    "@angular/router": "^17.0.0",
+                    "rxjs": "^7.8.0",
+                    "tslib": "^2.6.0",
+                    "zone.js": "^0.14.0"
+                },
+                {"@angular/cli": "^17.0.0", "@angular/compiler-cli": "^17.0.0", "@angular-devkit/build-angular": "^17.0.0", "typescript": "~5.2.0"}
+            ),
+            "frontend/src/app/app.component.ts": f'''import {{ Component }} from '@angular/core';
+
+@Component({{
+  selector: 'app-root',
+  standalone: true,
+  template: `
+    <header><h1>{self.title(analysis)}</h1></header>
+    <main><p>Welcome to your AI generated application!</p></main>
+  `
+}})
+export class AppComponent {{}}''',
+            "frontend/src/main.ts": '''import { bootstrapApplication } from '@angular/platform-browser';
+import { AppComponent } from './app/app.component';
+
+bootstrapApplication(AppComponent).catch(err => console.error(err));''',
+            "frontend/src/index.html": '''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>AI Generated App</title>
+  <base href="/">
+</head>
+<body>
+  <app-root></app-root>
+</body>
+</html>''',
+            "frontend/angular.json": json.dumps({
+                "$schema": "./node_modules/@angular/cli/lib/config/schema.json",
+                "version": 1,
+                "projects": {
+                    "app": {
+                        "projectType": "application",
+                        "root": "",
+                        "sourceRoot": "src",
+                        "architect": {
+                            "build": {
+                                "builder": "@angular-devkit/build-angular:application",
+                                "options": {"outputPath": "dist/app", "index": "src/index.html", "browser": "src/main.ts", "tsConfig": "tsconfig.json"}
+                            },
+                            "serve": {"builder": "@angular-devkit/build-angular:dev-server", "options": {"buildTarget": "app:build"}}
+                        }
+                    }
+                }
+            }, indent=2)
+        }
+
+    def dockerfile(self) -> str:
+        return '''FROM node:18-alpine AS build
+WORKDIR /app
+COPY package*.json ./
+RUN npm install
+COPY . .
+RUN npm run build
+
+FROM nginx:alpine
+COPY --from=build /app/dist/app/browser /usr/share/nginx/html
+EXPOSE 3000
+RUN sed -i 's/listen  *80;/listen 3000;/' /etc/nginx/conf.d/default.conf
+CMD ["nginx", "-g", "daemon off;"]'''
@@ -0,0 +1,42 @@
+from typing import Dict, Any, Optional
+import json
+
+
+class FrameworkPlugin:
+    """
+    Generator for one frontend framework, backend framework or database.
+
+    A plugin declares its metadata (config, shown by /frameworks and stored with
+    generated projects), the folder structure it creates under structure_key and
+    the files it generates. Frontend and backend plugins also provide the
+    Dockerfile used by the deployment files.
+    """
+
+    name = ""
+    kind = "frontend"  # frontend, backend or database
+    structure_key = "frontend"
+    config: Dict[str, Any] = {}
+
+    def structure(self) -> Dict[str, Any]:
+        """Folder structure of the generated code."""
+        return {}
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        """Generated files (path -> content) for the analysis."""
+        return {}
+
+    def dockerfile(self) -> Optional[str]:
+        """Dockerfile that builds and serves the generated code, if any."""
+        return None
+
+    @staticmethod
+    def title(analysis: Dict[str, Any]) -> str:
+        """Display title for the generated app."""
+        return str(analysis.get("project_type") or "web_app").replace("_", " ").title() + " App"
+
+    @staticmethod
+    def package_json(name: str, scripts: Dict[str, str], dependencies: Dict[str, str], dev_dependencies: Dict[str, str] = None, **extra) -> str:
+        package = {"name": name, "version": "1.0.0", "private": True, **extra, "scripts": scripts, "dependencies": dependencies}
+        if dev_dependencies:
+            package["devDependencies"] = dev_dependencies
+        return json.dumps(package, indent=2)
@@ -0,0 +1,72 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class DatabasePlugin(FrameworkPlugin):
+    """A database; generates its init script, if it has one, under database/."""
+
+    kind = "database"
+    structure_key = "database"
+
+
+class MySQLPlugin(DatabasePlugin):
+    name = "mysql"
+    config = {'type': 'relational', 'features': ['transactions', 'joins', 'acid']}
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "database/init.sql": '''CREATE DATABASE IF NOT EXISTS appdb;
+USE appdb;
+
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    name VARCHAR(255),
+    hashed_password VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;'''
+        }
+
+
+class PostgreSQLPlugin(DatabasePlugin):
+    name = "postgresql"
+    config = {'type': 'relational', 'features': ['json', 'full_text', 'geo']}
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "database/init.sql": '''CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    name VARCHAR(255),
+    hashed_password VARCHAR(255) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);'''
+        }
+
+
+class MongoDBPlugin(DatabasePlugin):
+    name = "mongodb"
+    config = {'type': 'document', 'features': ['flexible_schema', 'aggregation']}
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "database/init.js": '''db = db.getSiblingDB('appdb');
+
+db.createCollection('users');
+db.users.createIndex({ email: 1 }, { unique: true });'''
+        }
+
+
+class RedisPlugin(DatabasePlugin):
+    name = "redis"
+    config = {'type': 'key_value', 'features': ['caching', 'sessions', 'pub_sub']}
+
+
+class SQLitePlugin(DatabasePlugin):
+    name = "sqlite"
+    config = {'type': 'relational', 'features': ['embedded', 'serverless']}
+
+
+class FirebasePlugin(DatabasePlugin):
+    name = "firebase"
+    config = {'type': 'cloud', 'features': ['realtime', 'auth', 'hosting']}
@@ -0,0 +1,102 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class DjangoPlugin(FrameworkPlugin):
+    name = "django"
+    kind = "backend"
+    structure_key = "backend"
+    config = {
+        'name': 'Django',
+        'language': 'python',
+        'description': 'High-level Python web framework',
+        'dependencies': ['django', 'djangorestframework', 'django-cors-headers']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "project": {
+                "apps": {},
+                "settings": {},
+                "urls": {}
+            },
+            "requirements": {}
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "backend/requirements.txt": '''django==4.2.7
+djangorestframework==3.14.0
+django-cors-headers==4.3.0
+gunicorn==21.2.0''',
+            "backend/manage.py": '''#!/usr/bin/env python
+import os
+import sys
+
+if __name__ == "__main__":
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+    from django.core.management import execute_from_command_line
+    execute_from_command_line(sys.argv)''',
+            "backend/project/__init__.py": "",
+            "backend/project/settings.py": '''import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SECRET_KEY = os.getenv("SECRET_KEY", "change-me")
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+ALLOWED_HOSTS = ["*"]
+
+INSTALLED_APPS = [
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "rest_framework",
+    "corsheaders",
+]
+
+MIDDLEWARE = [
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+ROOT_URLCONF = "project.urls"
+WSGI_APPLICATION = "project.wsgi.application"
+CORS_ALLOW_ALL_ORIGINS = True
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+    }
+}''',
+            "backend/project/urls.py": f'''from django.http import JsonResponse
+from django.urls import path
+
+
+def root(request):
+    return JsonResponse({{"message": "{self.title(analysis)} API is running!"}})
+
+
+def health(request):
+    return JsonResponse({{"status": "healthy"}})
+
+
+urlpatterns = [
+    path("", root),
+    path("api/v1/health", health),
+]''',
+            "backend/project/wsgi.py": '''import os
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+application = get_wsgi_application()'''
+        }
+
+    def dockerfile(self) -> str:
+        return '''FROM python:3.11-slim
+WORKDIR /app
+COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt
+COPY . .
+EXPOSE 8000
+CMD ["gunicorn", "project.wsgi:application", "--bind", "0.0.0.0:8000"]'''
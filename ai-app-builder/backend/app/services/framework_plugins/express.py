@@ -0,0 +1,86 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class ExpressPlugin(FrameworkPlugin):
+    name = "express"
+    kind = "backend"
+    structure_key = "backend"
+    config = {
+        'name': 'Express.js',
+        'language': 'javascript',
+        'description': 'Fast Node.js web framework',
+        'dependencies': ['express', 'cors', 'helmet', 'morgan']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "src": {
+                "controllers": {},
+                "middlewares": {},
+                "models": {},
+                "routes": {},
+                "services": {},
+                "utils": {},
+                "config": {}
+            }
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "backend/package.json": self.package_json(
+                "express-api",
+                {"start": "node src/server.js", "dev": "nodemon src/server.js"},
+                {"express": "^4.18.2", "cors": "^2.8.5", "helmet": "^7.1.0", "morgan": "^1.10.0"},
+                {"nodemon": "^3.0.0"}
+            ),
+            "backend/src/app.js": f'''const express = require('express');
+const cors = require('cors');
+const helmet = require('helmet');
+const morgan = require('morgan');
+const routes = require('./routes');
+
+const app = express();
+
+app.use(helmet());
+app.use(cors());
+app.use(morgan('dev'));
+app.use(express.json());
+
+app.use('/api/v1', routes);
+
+app.get('/', (req, res) => {{
+  res.json({{ message: '{self.title(analysis)} API is running!' }});
+}});
+
+module.exports = app;''',
+            "backend/src/server.js": '''const app = require('./app');
+
+const PORT = process.env.PORT || 8000;
+
+app.listen(PORT, () => {
+  console.log(`Server listening on port ${PORT}`);
+});''',
+            "backend/src/routes/index.js": '''const express = require('express');
+
+const router = express.Router();
+
+router.get('/health', (req, res) => {
+  res.json({ status: 'healthy' });
+});
+
+module.exports = router;'''
+        }
+
+    def dockerfile(self) -> str:
+        return NODE_DOCKERFILE.format(command='"node", "src/server.js"')
+
+
+# Shared by the Node.js backends (Express, NestJS)
+NODE_DOCKERFILE = '''FROM node:18-alpine
+WORKDIR /app
+COPY package*.json ./
+RUN npm install
+COPY . .
+EXPOSE 8000
+CMD [{command}]'''
@@ -0,0 +1,108 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class FastAPIPlugin(FrameworkPlugin):
+    name = "fastapi"
+    kind = "backend"
+    structure_key = "backend"
+    config = {
+        'name': 'FastAPI',
+        'language': 'python',
+        'description': 'High-performance async Python API framework',
+        'dependencies': ['fastapi', 'uvicorn', 'sqlalchemy', 'pydantic']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "app": {
+                "api": {"v1": {}},
+                "core": {},
+                "models": {},
+                "schemas": {},
+                "services": {},
+                "utils": {}
+            }
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "backend/requirements.txt": REQUIREMENTS,
+            "backend/main.py": MAIN_PY,
+            "backend/app/__init__.py": "",
+            "backend/app/core/__init__.py": "",
+            "backend/app/core/config.py": CONFIG_PY,
+            "backend/app/api/__init__.py": "",
+            "backend/app/api/v1/__init__.py": "",
+            "backend/app/api/v1/router.py": ROUTER_PY
+        }
+
+    def dockerfile(self) -> str:
+        return '''FROM python:3.11-slim
+WORKDIR /app
+COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt
+COPY . .
+EXPOSE 8000
+CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]'''
+
+
+REQUIREMENTS = '''fastapi==0.104.1
+uvicorn==0.24.0
+sqlalchemy==2.0.23
+pymysql==1.1.0
+python-multipart==0.0.6
+python-jose[cryptography]==3.3.0
+passlib[bcrypt]==1.7.4
+python-dotenv==1.0.0'''
+
+MAIN_PY = '''from fastapi import FastAPI, Depends
+from fastapi.middleware.cors import CORSMiddleware
+from app.api.v1.router import api_router
+from app.core.config import settings
+
+app = FastAPI(
+    title="AI Generated API",
+    description="Generated by AI App Builder",
+    version="1.0.0"
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(api_router, prefix="/api/v1")
+
+@app.get("/")
+async def root():
+    return {"message": "AI Generated API is running!"}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)'''
+
+CONFIG_PY = '''import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class Settings:
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me")
+
+
+settings = Settings()'''
+
+ROUTER_PY = '''from fastapi import APIRouter
+
+api_router = APIRouter()
+
+
+@api_router.get("/health")
+async def health():
+    return {"status": "healthy"}'''
@@ -0,0 +1,69 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class FlutterPlugin(FrameworkPlugin):
+    name = "flutter"
+    kind = "frontend"
+    structure_key = "mobile"
+    config = {
+        'name': 'Flutter',
+        'description': 'Cross-platform app development with Dart',
+        'language': 'dart',
+        'platforms': ['ios', 'android', 'web', 'desktop']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "lib": {
+                "screens": {},
+                "widgets": {},
+                "services": {},
+                "models": {},
+                "utils": {}
+            },
+            "assets": {"images": {}, "fonts": {}},
+            "android": {},
+            "ios": {}
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "mobile/pubspec.yaml": '''name: mobile_app
+description: Generated by AI App Builder
+publish_to: 'none'
+version: 1.0.0+1
+
+environment:
+  sdk: '>=3.0.0 <4.0.0'
+
+dependencies:
+  flutter:
+    sdk: flutter
+  http: ^1.1.0
+
+flutter:
+  uses-material-design: true''',
+            "mobile/lib/main.dart": '''import 'package:flutter/material.dart';
+import 'app.dart';
+
+void main() {
+  runApp(const App());
+}''',
+            "mobile/lib/app.dart": f'''import 'package:flutter/material.dart';
+
+class App extends StatelessWidget {{
+  const App({{super.key}});
+
+  @override
+  Widget build(BuildContext context) {{
+    return MaterialApp(
+      title: '{self.title(analysis)}',
+      home: Scaffold(
+        appBar: AppBar(title: const Text('{self.title(analysis)}')),
+        body: const Center(child: Text('Welcome to your AI generated application!')),
+      ),
+    );
+  }}
+}}'''
+        }
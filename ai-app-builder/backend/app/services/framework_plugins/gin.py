@@ -0,0 +1,76 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class GinPlugin(FrameworkPlugin):
+    name = "gin"
+    kind = "backend"
+    structure_key = "backend"
+    config = {
+        'name': 'Gin',
+        'language': 'go',
+        'description': 'Lightweight Go web framework',
+        'dependencies': ['github.com/gin-gonic/gin']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "cmd": {},
+            "internal": {
+                "handlers": {},
+                "services": {},
+                "models": {},
+                "middleware": {}
+            },
+            "pkg": {}
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "backend/go.mod": '''module app
+
+go 1.21
+
+require github.com/gin-gonic/gin v1.9.1''',
+            "backend/main.go": '''package main
+
+import (
+	"app/internal/handlers"
+
+	"github.com/gin-gonic/gin"
+)
+
+func main() {
+	router := gin.Default()
+	router.GET("/", handlers.Root)
+	router.GET("/api/v1/health", handlers.Health)
+	router.Run(":8000")
+}''',
+            "backend/internal/handlers/handler.go": f'''package handlers
+
+import (
+	"net/http"
+
+	"github.com/gin-gonic/gin"
+)
+
+func Root(c *gin.Context) {{
+	c.JSON(http.StatusOK, gin.H{{"message": "{self.title(analysis)} API is running!"}})
+}}
+
+func Health(c *gin.Context) {{
+	c.JSON(http.StatusOK, gin.H{{"status": "healthy"}})
+}}'''
+        }
+
+    def dockerfile(self) -> str:
+        return '''FROM golang:1.21-alpine AS build
+WORKDIR /app
+COPY . .
+RUN go mod tidy && go build -o server .
+
+FROM alpine:3.18
+WORKDIR /app
+COPY --from=build /app/server .
+EXPOSE 8000
+CMD ["./server"]'''
@@ -0,0 +1,88 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+from app.services.framework_plugins.express import NODE_DOCKERFILE
+
+
+class NestJSPlugin(FrameworkPlugin):
+    name = "nestjs"
+    kind = "backend"
+    structure_key = "backend"
+    config = {
+        'name': 'NestJS',
+        'language': 'typescript',
+        'description': 'Progressive Node.js framework',
+        'dependencies': ['@nestjs/core', '@nestjs/common', '@nestjs/platform-express']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "src": {
+                "modules": {},
+                "controllers": {},
+                "services": {},
+                "guards": {},
+                "interceptors": {},
+                "dto": {},
+                "entities": {}
+            }
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "backend/package.json": self.package_json(
+                "nestjs-api",
+                {"build": "nest build", "start": "node dist/main", "start:dev": "nest start --watch"},
+                {
+                    "@nestjs/common": "^10.0.0",
+                    "@nestjs/core": "^10.0.0",
+                    "@nestjs/platform-express": "^10.0.0",
+                    "reflect-metadata": "^0.1.13",
+                    "rxjs": "^7.8.1"
+                },
+                {"@nestjs/cli": "^10.0.0", "typescript": "^5.1.3"}
+            ),
+            "backend/src/main.ts": '''import { NestFactory } from '@nestjs/core';
+import { AppModule } from './app.module';
+
+async function bootstrap() {
+  const app = await NestFactory.create(AppModule);
+  app.enableCors();
+  app.setGlobalPrefix('api/v1');
+  await app.listen(process.env.PORT || 8000);
+}
+bootstrap();''',
+            "backend/src/app.module.ts": '''import { Module } from '@nestjs/common';
+import { AppController } from './app.controller';
+
+@Module({
+  controllers: [AppController],
+})
+export class AppModule {}''',
+            "backend/src/app.controller.ts": f'''import {{ Controller, Get }} from '@nestjs/common';
+
+@Controller()
+export class AppController {{
+  @Get()
+  root() {{
+    return {{ message: '{self.title(analysis)} API is running!' }};
+  }}
+
+  @Get('health')
+  health() {{
+    return {{ status: 'healthy' }};
+  }}
+}}''',
+            "backend/tsconfig.json": '''{
+  "compilerOptions": {
+    "module": "commonjs",
+    "target": "ES2021",
+    "outDir": "./dist",
+    "emitDecoratorMetadata": true,
+    "experimentalDecorators": true,
+    "esModuleInterop": true
+  }
+}'''
+        }
+
+    def dockerfile(self) -> str:
+        return NODE_DOCKERFILE.format(command='"sh", "-c", "npm run build && npm start"')
@@ -0,0 +1,74 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class NextJSPlugin(FrameworkPlugin):
+    name = "nextjs"
+    kind = "frontend"
+    structure_key = "frontend"
+    config = {
+        'name': 'Next.js',
+        'description': 'Full-stack React framework with SSR/SSG',
+        'dependencies': ['next', 'react', 'react-dom'],
+        'features': ['ssr', 'ssg', 'api_routes', 'image_optimization']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "pages": {"api": {}},
+            "components": {"ui": {}, "layout": {}},
+            "lib": {},
+            "styles": {},
+            "public": {},
+            "utils": {}
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "frontend/package.json": self.package_json(
+                "nextjs-app",
+                {"dev": "next dev -p 3000", "build": "next build", "start": "next start -p 3000"},
+                {"next": "^14.0.0", "react": "^18.2.0", "react-dom": "^18.2.0"}
+            ),
+            "frontend/pages/_app.js": '''export default function App({ Component, pageProps }) {
+  return <Component {...pageProps} />;
+}''',
+            "frontend/pages/index.js": f'''import Head from 'next/head';
+
+export default function Home() {{
+  return (
+    <>
+      <Head>
+        <title>{self.title(analysis)}</title>
+      </Head>
+      <main>
+        <h1>{self.title(analysis)}</h1>
+        <p>Welcome to your AI generated application!</p>
+      </main>
+    </>
+  );
+}}''',
+            "frontend/next.config.js": '''/** @type {import('next').NextConfig} */
+const nextConfig = {
+  reactStrictMode: true,
+  output: 'standalone'
+};
+
+module.exports = nextConfig;'''
+        }
+
+    def dockerfile(self) -> str:
+        return '''FROM node:18-alpine AS build
+WORKDIR /app
+COPY package*.json ./
+RUN npm install
+COPY . .
+RUN npm run build
+
+FROM node:18-alpine
+WORKDIR /app
+COPY --from=build /app/.next/standalone ./
+COPY --from=build /app/.next/static ./.next/static
+EXPOSE 3000
+ENV PORT=3000
+CMD ["node", "server.js"]'''
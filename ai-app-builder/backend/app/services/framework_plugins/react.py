@@ -0,0 +1,123 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class ReactPlugin(FrameworkPlugin):
+    name = "react"
+    kind = "frontend"
+    structure_key = "frontend"
+    config = {
+        'name': 'React.js',
+        'description': 'Modern React with hooks and context',
+        'dependencies': ['react', 'react-dom', 'react-router-dom', 'axios'],
+        'dev_dependencies': ['@vitejs/plugin-react', 'vite']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "src": {
+                "components": {"ui": {}, "layout": {}, "forms": {}},
+                "pages": {},
+                "services": {},
+                "hooks": {},
+                "context": {},
+                "utils": {},
+                "styles": {},
+                "assets": {"images": {}, "icons": {}}
+            },
+            "public": {}
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "frontend/package.json": self.package_json(
+                "react-app",
+                {"dev": "vite", "build": "vite build", "preview": "vite preview"},
+                {"react": "^18.2.0", "react-dom": "^18.2.0", "react-router-dom": "^6.8.0", "axios": "^1.3.0"},
+                {"@vitejs/plugin-react": "^3.1.0", "vite": "^4.1.0"},
+                type="module"
+            ),
+            "frontend/src/App.js": APP_JS,
+            "frontend/src/index.js": INDEX_JS,
+            "frontend/vite.config.js": VITE_CONFIG,
+            "frontend/index.html": INDEX_HTML
+        }
+
+    def dockerfile(self) -> str:
+        return VITE_DOCKERFILE
+
+
+APP_JS = '''import React from 'react';
+import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
+import './App.css';
+
+function App() {
+  return (
+    <Router>
+      <div className="App">
+        <header className="App-header">
+          <h1>AI Generated App</h1>
+        </header>
+        <main>
+          <Routes>
+            <Route path="/" element={<Home />} />
+          </Routes>
+        </main>
+      </div>
+    </Router>
+  );
+}
+
+const Home = () => {
+  return (
+    <div>
+      <h2>Welcome to your AI generated application!</h2>
+    </div>
+  );
+};
+
+export default App;'''
+
+INDEX_JS = '''import React from 'react';
+import ReactDOM from 'react-dom/client';
+import App from './App';
+
+const root = ReactDOM.createRoot(document.getElementById('root'));
+root.render(<App />);'''
+
+VITE_CONFIG = '''import { defineConfig } from 'vite'
+import react from '@vitejs/plugin-react'
+
+export default defineConfig({
+  plugins: [react()],
+  server: {
+    port: 3000
+  }
+})'''
+
+INDEX_HTML = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Generated App</title>
+</head>
+<body>
+    <div id="root"></div>
+    <script type="module" src="/src/index.js"></script>
+</body>
+</html>'''
+
+# Shared by the Vite-based frontends (React, Vue)
+VITE_DOCKERFILE = '''FROM node:18-alpine AS build
+WORKDIR /app
+COPY package*.json ./
+RUN npm install
+COPY . .
+RUN npm run build
+
+FROM nginx:alpine
+COPY --from=build /app/dist /usr/share/nginx/html
+EXPOSE 3000
+RUN sed -i 's/listen  *80;/listen 3000;/' /etc/nginx/conf.d/default.conf
+CMD ["nginx", "-g", "daemon off;"]'''
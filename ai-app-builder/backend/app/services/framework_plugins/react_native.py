@@ -0,0 +1,63 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class ReactNativePlugin(FrameworkPlugin):
+    name = "react_native"
+    kind = "frontend"
+    structure_key = "mobile"
+    config = {
+        'name': 'React Native',
+        'description': 'Cross-platform mobile development',
+        'dependencies': ['react', 'react-native', '@react-navigation/native'],
+        'platforms': ['ios', 'android']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "src": {
+                "components": {},
+                "screens": {},
+                "navigation": {},
+                "services": {},
+                "utils": {},
+                "assets": {"images": {}, "fonts": {}}
+            },
+            "android": {},
+            "ios": {}
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "mobile/package.json": self.package_json(
+                "mobile-app",
+                {"start": "react-native start", "android": "react-native run-android", "ios": "react-native run-ios"},
+                {"react": "18.2.0", "react-native": "0.72.6", "@react-navigation/native": "^6.1.0"},
+                {"@babel/core": "^7.20.0", "metro-react-native-babel-preset": "^0.76.8"}
+            ),
+            "mobile/app.json": '{\n  "name": "MobileApp",\n  "displayName": "' + self.title(analysis) + '"\n}',
+            "mobile/App.js": f'''import React from 'react';
+import {{ SafeAreaView, Text, StyleSheet }} from 'react-native';
+
+export default function App() {{
+  return (
+    <SafeAreaView style={{styles.container}}>
+      <Text style={{styles.title}}>{self.title(analysis)}</Text>
+      <Text>Welcome to your AI generated application!</Text>
+    </SafeAreaView>
+  );
+}}
+
+const styles = StyleSheet.create({{
+  container: {{ flex: 1, alignItems: 'center', justifyContent: 'center' }},
+  title: {{ fontSize: 24, fontWeight: 'bold', marginBottom: 8 }}
+}});''',
+            "mobile/index.js": '''import { AppRegistry } from 'react-native';
+import App from './App';
+import { name as appName } from './app.json';
+
+AppRegistry.registerComponent(appName, () => App);''',
+            "mobile/metro.config.js": '''const { getDefaultConfig, mergeConfig } = require('@react-native/metro-config');
+
+module.exports = mergeConfig(getDefaultConfig(__dirname), {});'''
+        }
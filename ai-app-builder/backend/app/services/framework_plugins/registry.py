@@ -0,0 +1,162 @@
+from typing import Dict, Any, List, Iterator
+from collections.abc import Mapping
+import importlib
+import threading
+from app.services.framework_plugins.base import FrameworkPlugin
+
+# Built-in plugins by kind and name: "module:Class", imported the first time the framework is used
+BUILTIN_PLUGINS = {
+    "frontend": {
+        "react": "app.services.framework_plugins.react:ReactPlugin",
+        "nextjs": "app.services.framework_plugins.nextjs:NextJSPlugin",
+        "vue": "app.services.framework_plugins.vue:VuePlugin",
+        "angular": "app.services.framework_plugins.angular:AngularPlugin",
+        "react_native": "app.services.framework_plugins.react_native:ReactNativePlugin",
+        "flutter": "app.services.framework_plugins.flutter:FlutterPlugin"
+    },
+    "backend": {
+        "fastapi": "app.services.framework_plugins.fastapi:FastAPIPlugin",
+        "express": "app.services.framework_plugins.express:ExpressPlugin",
+        "nestjs": "app.services.framework_plugins.nestjs:NestJSPlugin",
+        "django": "app.services.framework_plugins.django:DjangoPlugin",
+        "spring_boot": "app.services.framework_plugins.spring_boot:SpringBootPlugin",
+        "gin": "app.services.framework_plugins.gin:GinPlugin"
+    },
+    "database": {
+        "mysql": "app.services.framework_plugins.databases:MySQLPlugin",
+        "postgresql": "app.services.framework_plugins.databases:PostgreSQLPlugin",
+        "mongodb": "app.services.framework_plugins.databases:MongoDBPlugin",
+        "redis": "app.services.framework_plugins.databases:RedisPlugin",
+        "sqlite": "app.services.framework_plugins.databases:SQLitePlugin",
+        "firebase": "app.services.framework_plugins.databases:FirebasePlugin"
+    }
+}
+
+# Installed packages add stacks through these entry point groups, e.g.
+#   [project.entry-points."ai_app_builder.frontend"]
+#   svelte = "my_package.svelte:SveltePlugin"
+ENTRY_POINT_GROUPS = {
+    "frontend": "ai_app_builder.frontend",
+    "backend": "ai_app_builder.backend",
+    "database": "ai_app_builder.database"
+}
+
+
+class PluginRegistry:
+    """
+    Framework plugins by kind and name, imported on first use.
+
+    Names come from the built-in module map and from installed entry points
+    (read once, without importing anything); a plugin's module is imported and
+    the plugin instantiated only when that framework is first asked for.
+    Entry points override built-ins of the same name.
+    """
+
+    def __init__(self, builtins: Dict[str, Dict[str, str]] = None, entry_point_groups: Dict[str, str] = None):
+        self._targets: Dict[str, Dict[str, Any]] = {kind: dict(plugins) for kind, plugins in (builtins or {}).items()}
+        self._entry_point_groups = entry_point_groups or {}
+        self._entry_points_read = False
+        self._plugins: Dict[tuple, FrameworkPlugin] = {}
+        self._lock = threading.Lock()
+        self.stats = {"loaded": 0, "load_errors": 0}
+
+    def _read_entry_points(self):
+        if self._entry_points_read:
+            return
+        self._entry_points_read = True
+        # Imported here: importlib.metadata is slow to import and only needed once
+        from importlib import metadata
+        for kind, group in self._entry_point_groups.items():
+            try:
+                entry_points = metadata.entry_points(group=group)
+            except Exception as e:
+                print(f"Framework plugins: could not read entry points for {group}: {e}")
+                continue
+            for entry_point in entry_points:
+                self._targets.setdefault(kind, {})[entry_point.name] = entry_point
+
+    def names(self, kind: str) -> List[str]:
+        """Names of the available plugins of a kind; nothing is imported."""
+        self._read_entry_points()
+        return list(self._targets.get(kind, {}))
+
+    def has(self, kind: str, name: str) -> bool:
+        self._read_entry_points()
+        return name in self._targets.get(kind, {})
+
+    def register(self, kind: str, name: str, target: Any):
+        """Add a plugin: a FrameworkPlugin instance or class, or a "module:Class" path."""
+        with self._lock:
+            self._targets.setdefault(kind, {})[name] = target
+            self._plugins.pop((kind, name), None)
+
+    def _load(self, target: Any) -> FrameworkPlugin:
+        if isinstance(target, FrameworkPlugin):
+            return target
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(":")
+            target = getattr(importlib.import_module(module_name), attribute)
+        elif hasattr(target, "load"):
+            # An importlib.metadata entry point
+            target = target.load()
+        return target() if isinstance(target, type) else target
+
+    def get(self, kind: str, name: str) -> FrameworkPlugin:
+        """The plugin for a framework, importing it on first use. Raises KeyError for unknown names."""
+        plugin = self._plugins.get((kind, name))
+        if plugin is not None:
+            return plugin
+        self._read_entry_points()
+        with self._lock:
+            plugin = self._plugins.get((kind, name))
+            if plugin is None:
+                target = self._targets.get(kind, {}).get(name)
+                if target is None:
+                    raise KeyError(f"No {kind} plugin named '{name}'")
+                try:
+                    plugin = self._load(target)
+                except Exception:
+                    self.stats["load_errors"] += 1
+                    raise
+                self._plugins[(kind, name)] = plugin
+                self.stats["loaded"] += 1
+        return plugin
+
+    def configs(self, kind: str) -> "PluginConfigs":
+        """Read-only mapping of name -> config for a kind; configs are loaded on access."""
+        return PluginConfigs(self, kind)
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._read_entry_points()
+        return {
+            **self.stats,
+            "available": {kind: len(targets) for kind, targets in self._targets.items()},
+            "imported": sorted(f"{kind}:{name}" for kind, name in self._plugins)
+        }
+
+
+class PluginConfigs(Mapping):
+    """Plugin configs of one kind. Membership and iteration use names only; reading a value imports that plugin."""
+
+    def __init__(self, registry: PluginRegistry, kind: str):
+        self._registry = registry
+        self._kind = kind
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        try:
+            return self._registry.get(self._kind, name).config
+        except KeyError:
+            raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._registry.has(self._kind, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry.names(self._kind))
+
+    def __len__(self) -> int:
+        return len(self._registry.names(self._kind))
+
+
+# Global registry shared by every FrameworkGenerator
+framework_plugins = PluginRegistry(BUILTIN_PLUGINS, ENTRY_POINT_GROUPS)
@@ -0,0 +1,122 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+
+
+class SpringBootPlugin(FrameworkPlugin):
+    name = "spring_boot"
+    kind = "backend"
+    structure_key = "backend"
+    config = {
+        'name': 'Spring Boot',
+        'language': 'java',
+        'description': 'Enterprise Java framework',
+        'dependencies': ['spring-boot-starter-web', 'spring-boot-starter-data-jpa']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "src": {
+                "main": {
+                    "java": {"com": {"app": {
+                        "controller": {},
+                        "service": {},
+                        "repository": {},
+                        "model": {},
+                        "config": {}
+                    }}},
+                    "resources": {}
+                }
+            }
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "backend/pom.xml": '''<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0"
+         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+         xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+    <modelVersion>4.0.0</modelVersion>
+    <parent>
+        <groupId>org.springframework.boot</groupId>
+        <artifactId>spring-boot-starter-parent</artifactId>
+        <version>3.1.5</version>
+    </parent>
+    <groupId>com.app</groupId>
+    <artifactId>app</artifactId>
+    <version>1.0.0</version>
+    <properties>
+        <java.version>17</java.version>
+    </properties>
+    <dependencies>
+        <dependency>
+            <groupId>org.springframework.boot</groupId>
+            <artifactId>spring-boot-starter-web</artifactId>
+        </dependency>
+        <dependency>
+            <groupId>org.springframework.boot</groupId>
+            <artifactId>spring-boot-starter-data-jpa</artifactId>
+        </dependency>
+        <dependency>
+            <groupId>com.h2database</groupId>
+            <artifactId>h2</artifactId>
+            <scope>runtime</scope>
+        </dependency>
+    </dependencies>
+    <build>
+        <plugins>
+            <plugin>
+                <groupId>org.springframework.boot</groupId>
+                <artifactId>spring-boot-maven-plugin</artifactId>
+            </plugin>
+        </plugins>
+    </build>
+</project>''',
+            "backend/src/main/java/com/app/Application.java": '''package com.app;
+
+import org.springframework.boot.SpringApplication;
+import org.springframework.boot.autoconfigure.SpringBootApplication;
+
+@SpringBootApplication
+public class Application {
+    public static void main(String[] args) {
+        SpringApplication.run(Application.class, args);
+    }
+}''',
+            "backend/src/main/java/com/app/controller/HealthController.java": f'''package com.app.controller;
+
+import java.util.Map;
+import org.springframework.web.bind.annotation.GetMapping;
+import org.springframework.web.bind.annotation.RestController;
+
+@RestController
+public class HealthController {{
+    @GetMapping("/")
+    public Map<String, String> root() {{
+        return Map.of("message", "{self.title(analysis)} API is running!");
+    }}
+
+    @GetMapping("/api/v1/health")
+    public Map<String, String> health() {{
+        return Map.of("status", "healthy");
+    }}
+}}''',
+            "backend/src/main/resources/application.yml": '''server:
+  port: 8000
+
+spring:
+  application:
+    name: app'''
+        }
+
+    def dockerfile(self) -> str:
+        return '''FROM maven:3.9-eclipse-temurin-17 AS build
+WORKDIR /app
+COPY pom.xml .
+COPY src ./src
+RUN mvn -q package -DskipTests
+
+FROM eclipse-temurin:17-jre
+WORKDIR /app
+COPY --from=build /app/target/*.jar app.jar
+EXPOSE 8000
+CMD ["java", "-jar", "app.jar"]'''
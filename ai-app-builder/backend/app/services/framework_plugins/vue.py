@@ -0,0 +1,82 @@
+from typing import Dict, Any
+from app.services.framework_plugins.base import FrameworkPlugin
+from app.services.framework_plugins.react import VITE_DOCKERFILE
+
+
+class VuePlugin(FrameworkPlugin):
+    name = "vue"
+    kind = "frontend"
+    structure_key = "frontend"
+    config = {
+        'name': 'Vue.js 3',
+        'description': 'Progressive JavaScript framework',
+        'dependencies': ['vue', 'vue-router', 'pinia', 'axios'],
+        'dev_dependencies': ['@vitejs/plugin-vue', 'vite']
+    }
+
+    def structure(self) -> Dict[str, Any]:
+        return {
+            "src": {
+                "components": {"ui": {}, "layout": {}},
+                "views": {},
+                "router": {},
+                "store": {},
+                "composables": {},
+                "utils": {},
+                "assets": {}
+            },
+            "public": {}
+        }
+
+    def files(self, analysis: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "frontend/package.json": self.package_json(
+                "vue-app",
+                {"dev": "vite", "build": "vite build", "preview": "vite preview"},
+                {"vue": "^3.3.0", "vue-router": "^4.2.0", "pinia": "^2.1.0", "axios": "^1.3.0"},
+                {"@vitejs/plugin-vue": "^4.4.0", "vite": "^4.4.0"},
+                type="module"
+            ),
+            "frontend/index.html": '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Generated App</title>
+</head>
+<body>
+    <div id="app"></div>
+    <script type="module" src="/src/main.js"></script>
+</body>
+</html>''',
+            "frontend/src/App.vue": f'''<template>
+  <div class="app">
+    <header>
+      <h1>{self.title(analysis)}</h1>
+    </header>
+    <main>
+      <p>Welcome to your AI generated application!</p>
+    </main>
+  </div>
+</template>
+
+<script setup>
+</script>''',
+            "frontend/src/main.js": '''import { createApp } from 'vue'
+import { createPinia } from 'pinia'
+import App from './App.vue'
+
+createApp(App).use(createPinia()).mount('#app')''',
+            "frontend/vite.config.js": '''import { defineConfig } from 'vite'
+import vue from '@vitejs/plugin-vue'
+
+export default defineConfig({
+  plugins: [vue()],
+  server: {
+    port: 3000
+  }
+})'''
+        }
+
+    def dockerfile(self) -> str:
+        return VITE_DOCKERFILE
@@ -0,0 +1,317 @@
+from typing import Dict, Any, List, Optional, AsyncIterator
+from abc import ABC, abstractmethod
+import asyncio
+import json
+import random
+import time
+import httpx
+from app.core.config import settings
+from app.services.integrations.http_client import get_http_client
+from app.services.integrations.llm_transport import is_offline
+from app.services.integrations.completion import CompletionText, openai_usage
+from app.services.prompt_templates import prompt_templates, supports_cache_control, system_message_content
+from app.services.integrations.errors import (
+    LLMProviderError,
+    ProviderNotConfiguredError,
+    ProviderTimeoutError,
+    ProviderUnavailableError,
+    error_for_status,
+    parse_retry_after
+)
+
+
+class LLMProvider(ABC):
+    """
+    Common async interface of the LLM providers.
+
+    complete() returns a CompletionText, stream() yields text chunks, models() lists
+    the provider's models and health() probes it. Every HTTP call goes through the
+    provider's own pooled client and _send(), which retries transient failures
+    (RETRYABLE_STATUSES, dropped connections, connect timeouts) with full-jitter
+    exponential backoff and turns everything else into the typed errors of
+    integrations.errors. Rate limits (429) are not retried here: the agent's
+    scheduler owns them.
+    """
+
+    name = "provider"
+    display_name = "Provider"
+    RETRYABLE_STATUSES = (408, 500, 502, 503, 504)
+
+    def __init__(self, api_key: Optional[str], base_url: str, default_model: str):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.default_model = default_model
+        self.max_retries = settings.LLM_RETRY_ATTEMPTS
+        self.retry_base_delay = settings.LLM_RETRY_BASE_DELAY
+        self.retry_max_delay = settings.LLM_RETRY_MAX_DELAY
+        self.stats = {"requests": 0, "retries": 0}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """This provider's pooled client (also where record/replay/fake transports plug in)."""
+        return get_http_client(self.name)
+
+    @property
+    def is_configured(self) -> bool:
+        """Has an API key, or runs on the replay/fake transport, which needs none."""
+        return bool(self.api_key) or is_offline()
+
+    def _check_configured(self):
+        if not self.is_configured:
+            raise ProviderNotConfiguredError(self.name, f"{self.display_name} API key is not configured.")
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Content-Type": "application/json"}
+
+    def _error_message(self, status_code: int, error_text: str) -> str:
+        return f"{self.display_name} API error: HTTP {status_code}. Response: {error_text}"
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full jitter: uniform between 0 and the exponential step, but never before Retry-After."""
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_max_delay))
+        return delay
+
+    async def _send(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transient failures. Responses with an error status are
+        raised as typed errors. With stream=True the body is left unread; the caller
+        must close the response.
+        """
+        attempt = 0
+        while True:
+            self.stats["requests"] += 1
+            retry_after = None
+            try:
+                request = self.client.build_request(method, url, headers=self._headers(), **kwargs)
+                response = await self.client.send(request, stream=stream)
+            except httpx.TimeoutException as e:
+                error = ProviderTimeoutError(
+                    self.name, f"{self.display_name} API error: Request timeout. The AI service is taking too long to respond."
+                )
+                # A read timeout has already used the whole budget; only connecting is worth another try
+                retryable = isinstance(e, httpx.ConnectTimeout)
+            except httpx.TransportError as e:
+                error = ProviderUnavailableError(self.name, f"{self.display_name} API error: {e}")
+                retryable = True
+            except httpx.HTTPError as e:
+                raise ProviderUnavailableError(self.name, f"{self.display_name} API error: {e}")
+            else:
+                if response.status_code < 400:
+                    return response
+                if stream:
+                    await response.aread()
+                    await response.aclose()
+                error = error_for_status(self.name, response, self._error_message(response.status_code, response.text))
+                retryable = response.status_code in self.RETRYABLE_STATUSES
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            if not retryable or attempt >= self.max_retries:
+                print(error.message)
+                raise error
+            delay = self._retry_delay(attempt, retry_after)
+            attempt += 1
+            self.stats["retries"] += 1
+            print(f"{self.display_name}: {error.message[:120]} - retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _sse_events(self, response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+        """Parsed JSON payloads of a Server-Sent Events body ("data: {...}" lines, "data: [DONE]" at the end)."""
+        try:
+            async for line in response.aiter_lines():
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    event = json.loads(payload)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict) and event.get("error"):
+                    error = event["error"]
+                    message = error.get("message", error) if isinstance(error, dict) else error
+                    error_message = f"{self.display_name} API error: {message}"
+                    print(error_message)
+                    raise ProviderUnavailableError(self.name, error_message)
+                yield event
+        except httpx.TimeoutException:
+            raise ProviderTimeoutError(
+                self.name, f"{self.display_name} API error: Request timeout. The AI service is taking too long to respond."
+            )
+        except httpx.HTTPError as e:
+            raise ProviderUnavailableError(self.name, f"{self.display_name} API error: {e}")
+
+    def _malformed(self, error: Exception) -> ProviderUnavailableError:
+        return ProviderUnavailableError(self.name, f"{self.display_name} API error: Malformed response ({error})")
+
+    def _empty(self) -> ProviderUnavailableError:
+        return ProviderUnavailableError(self.name, f"{self.display_name} API error: Empty response")
+
+    @abstractmethod
+    async def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7
+    ) -> CompletionText:
+        """One completion. Raises an LLMProviderError subclass on failure."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        usage_out: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as text chunks. The usage reported at the end is copied into
+        usage_out when given. Raises an LLMProviderError subclass, before or during the stream.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def models(self) -> List[Dict[str, Any]]:
+        """Models available to this API key."""
+        raise NotImplementedError
+
+    async def health(self) -> Dict[str, Any]:
+        """Probe the provider with a models() call and report whether it answered and how fast."""
+        result = {"provider": self.name, "configured": self.is_configured, "healthy": False}
+        if not self.is_configured:
+            result["error"] = f"{self.display_name} API key is not configured."
+            return result
+        started_at = time.monotonic()
+        try:
+            models = await self.models()
+            result.update({"healthy": True, "models": len(models)})
+        except LLMProviderError as e:
+            result["error"] = e.message
+        result["latency_ms"] = round((time.monotonic() - started_at) * 1000, 1)
+        return result
+
+    async def generate_response(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7
+    ) -> CompletionText:
+        """Older name of complete(), kept for existing callers."""
+        return await self.complete(system_prompt, user_prompt, model, max_tokens, temperature)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "configured": self.is_configured}
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Providers speaking the OpenAI chat completions API (OpenRouter, DeepSeek)."""
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _payload(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        model = model or self.default_model
+        messages = []
+        if system_prompt:
+            # Static prompt prefixes carry a cache breakpoint on models that support one
+            messages.append({"role": "system", "content": system_message_content(system_prompt, supports_cache_control(model))})
+        messages.append({"role": "user", "content": user_prompt})
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def _parse_usage(self, usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Normalise the usage block and count prompt-cache hits."""
+        normalized = openai_usage(usage)
+        if usage:
+            prompt_templates.record_usage(self.name, normalized["prompt_tokens"], normalized["cached_tokens"])
+        return normalized
+
+    async def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7
+    ) -> CompletionText:
+        self._check_configured()
+        payload = self._payload(system_prompt, user_prompt, model, max_tokens, temperature)
+        response = await self._send("POST", f"{self.base_url}/chat/completions", json=payload)
+        try:
+            body = response.json()
+            choice = body["choices"][0]
+            content = choice["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise self._malformed(e)
+        if not content:
+            raise self._empty()
+        return CompletionText(
+            content,
+            body.get("model") or payload["model"],
+            self._parse_usage(body.get("usage")),
+            provider=self.name,
+            finish_reason=choice.get("finish_reason")
+        )
+
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        usage_out: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        self._check_configured()
+        payload = self._payload(system_prompt, user_prompt, model, max_tokens, temperature, stream=True)
+        response = await self._send("POST", f"{self.base_url}/chat/completions", stream=True, json=payload)
+        try:
+            async for event in self._sse_events(response):
+                # With include_usage the last event carries the token counts
+                if event.get("usage"):
+                    usage = self._parse_usage(event["usage"])
+                    if usage_out is not None:
+                        usage_out.update(usage)
+                choices = event.get("choices") or []
+                if choices:
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
+        finally:
+            await response.aclose()
+
+    async def models(self) -> List[Dict[str, Any]]:
+        self._check_configured()
+        response = await self._send("GET", f"{self.base_url}/models")
+        try:
+            return response.json().get("data", [])
+        except (ValueError, AttributeError) as e:
+            raise self._malformed(e)
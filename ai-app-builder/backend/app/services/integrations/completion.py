@@ -0,0 +1,55 @@
+from typing import Dict, Any, Optional
+
+
+def empty_usage() -> Dict[str, int]:
+    return {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+
+
+def openai_usage(usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Normalise an OpenAI-style usage block (OpenRouter, DeepSeek)."""
+    usage = usage or {}
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+        "completion_tokens": int(usage.get("completion_tokens") or 0),
+        # OpenRouter/OpenAI report cache hits in prompt_tokens_details, DeepSeek at the top level
+        "cached_tokens": int(details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens") or 0)
+    }
+
+
+def gemini_usage(usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Normalise Gemini's usageMetadata block."""
+    usage = usage or {}
+    return {
+        "prompt_tokens": int(usage.get("promptTokenCount") or 0),
+        "completion_tokens": int(usage.get("candidatesTokenCount") or 0),
+        "cached_tokens": int(usage.get("cachedContentTokenCount") or 0)
+    }
+
+
+class CompletionText(str):
+    """
+    A provider's reply text: the uniform result of LLMProvider.complete(). It behaves
+    as a plain string for every caller, and also carries the provider, the model that
+    answered, the finish reason and the normalised token usage.
+    """
+
+    model: Optional[str] = None
+    usage: Dict[str, int] = {}
+    provider: Optional[str] = None
+    finish_reason: Optional[str] = None
+
+    def __new__(
+        cls,
+        text: str,
+        model: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+        provider: Optional[str] = None,
+        finish_reason: Optional[str] = None
+    ):
+        completion = super().__new__(cls, text)
+        completion.model = model
+        completion.usage = usage or empty_usage()
+        completion.provider = provider
+        completion.finish_reason = finish_reason
+        return completion
@@ -1,24 +1,19 @@
-from typing import Dict, Any, List, Optional
-import httpx
-import json
+from typing import Optional
 from app.core.config import settings
+from app.services.integrations.base_provider import OpenAICompatibleProvider
+from app.services.integrations.completion import CompletionText
 
-class DeepSeekService:
+class DeepSeekService(OpenAICompatibleProvider):
     """
     Service for handling DeepSeek API integrations.
     Supports code generation, explanation, and optimization using DeepSeek models.
     """
     
+    name = "deepseek"
+    display_name = "DeepSeek"
+    
     def __init__(self):
-        self.api_key = settings.DEEPSEEK_API_KEY
-        self.base_url = "https://api.deepseek.com/v1"
-        self.client = httpx.AsyncClient(
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            },
-            timeout=30.0
-        )
+        super().__init__(settings.DEEPSEEK_API_KEY, "https://api.deepseek.com/v1", "deepseek-chat")
     
     async def generate_code(
         self,
@@ -26,7 +21,7 @@ class DeepSeekService:
         model: str = "deepseek-coder",
         max_tokens: int = 2000,
         temperature: float = 0.7
-    ) -> Dict[str, Any]:
+    ) -> CompletionText:
         """
         Generate code using DeepSeek AI.
         
@@ -37,46 +32,24 @@ class DeepSeekService:
             temperature: Sampling temperature
             
         Returns:
-            Dict containing generated code
+            The generated code (CompletionText, with model and usage attached)
+        """
+        return await self.complete("", prompt, model, max_tokens, temperature)
+    
+    @staticmethod
+    def explain_prompt(code: str, explanation_request: str) -> str:
+        """The user prompt explain_code sends."""
+        return f"""
+        Please explain the following code:
+        
+        ```code
+        {code}
+        ```
+        
+        Specific request: {explanation_request}
+        
+        Provide a clear, detailed explanation that would be helpful to developers.
         """
-        try:
-            payload = {
-                "model": model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": max_tokens,
-                "temperature": temperature
-            }
-            
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "code": result["choices"][0]["message"]["content"],
-                    "model": result["model"],
-                    "usage": result.get("usage", {})
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API request failed with status {response.status_code}",
-                    "error_type": "api_error"
-                }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": "deepseek_api_error"
-            }
     
     async def explain_code(
         self,
@@ -84,7 +57,7 @@ class DeepSeekService:
         explanation_request: str,
         model: str = "deepseek-chat",
         max_tokens: int = 1000
-    ) -> Dict[str, Any]:
+    ) -> CompletionText:
         """
         Explain code using DeepSeek AI.
         
@@ -95,58 +68,9 @@ class DeepSeekService:
             max_tokens: Maximum number of tokens to generate
             
         Returns:
-            Dict containing explanation
+            The explanation (CompletionText)
         """
-        try:
-            prompt = f"""
-            Please explain the following code:
-            
-            ```code
-            {code}
-            ```
-            
-            Specific request: {explanation_request}
-            
-            Provide a clear, detailed explanation that would be helpful to developers.
-            """
-            
-            payload = {
-                "model": model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": max_tokens,
-                "temperature": 0.3
-            }
-            
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "explanation": result["choices"][0]["message"]["content"],
-                    "model": result["model"],
-                    "usage": result.get("usage", {})
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API request failed with status {response.status_code}",
-                    "error_type": "api_error"
-                }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": "deepseek_api_error"
-            }
+        return await self.complete("", self.explain_prompt(code, explanation_request), model, max_tokens, 0.3)
     
     async def debug_code(
         self,
@@ -154,7 +78,7 @@ class DeepSeekService:
         error_message: Optional[str] = None,
         model: str = "deepseek-chat",
         max_tokens: int = 1500
-    ) -> Dict[str, Any]:
+    ) -> CompletionText:
         """
         Debug code using DeepSeek AI.
         
@@ -165,62 +89,24 @@ class DeepSeekService:
             max_tokens: Maximum number of tokens to generate
             
         Returns:
-            Dict containing debug analysis
+            The debug analysis (CompletionText)
         """
-        try:
-            prompt = f"""
-            Please debug the following code:
-            
-            ```code
-            {code}
-            ```
-            
-            {f"Error message: {error_message}" if error_message else "No error message provided"}
-            
-            Provide:
-            1. Identification of issues
-            2. Explanation of problems
-            3. Fixed code
-            4. Best practices to avoid similar issues
-            """
-            
-            payload = {
-                "model": model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": max_tokens,
-                "temperature": 0.3
-            }
-            
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "debug_analysis": result["choices"][0]["message"]["content"],
-                    "model": result["model"],
-                    "usage": result.get("usage", {})
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API request failed with status {response.status_code}",
-                    "error_type": "api_error"
-                }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": "deepseek_api_error"
-            }
+        prompt = f"""
+        Please debug the following code:
+        
+        ```code
+        {code}
+        ```
+        
+        {f"Error message: {error_message}" if error_message else "No error message provided"}
+        
+        Provide:
+        1. Identification of issues
+        2. Explanation of problems
+        3. Fixed code
+        4. Best practices to avoid similar issues
+        """
+        return await self.complete("", prompt, model, max_tokens, 0.3)
     
     async def optimize_code(
         self,
@@ -228,7 +114,7 @@ class DeepSeekService:
         optimization_goal: str = "performance",
         model: str = "deepseek-coder",
         max_tokens: int = 1500
-    ) -> Dict[str, Any]:
+    ) -> CompletionText:
         """
         Optimize code using DeepSeek AI.
         
@@ -239,86 +125,19 @@ class DeepSeekService:
             max_tokens: Maximum number of tokens to generate
             
         Returns:
-            Dict containing optimized code and suggestions
+            The optimized code and suggestions (CompletionText)
         """
-        try:
-            prompt = f"""
-            Please optimize the following code for {optimization_goal}:
-            
-            ```code
-            {code}
-            ```
-            
-            Provide:
-            1. Optimized code
-            2. Explanation of improvements
-            3. Performance benefits
-            4. Best practices applied
-            """
-            
-            payload = {
-                "model": model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": max_tokens,
-                "temperature": 0.3
-            }
-            
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "optimized_code": result["choices"][0]["message"]["content"],
-                    "model": result["model"],
-                    "usage": result.get("usage", {})
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API request failed with status {response.status_code}",
-                    "error_type": "api_error"
-                }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": "deepseek_api_error"
-            }
-    
-    async def get_available_models(self) -> Dict[str, Any]:
-        """
-        Get available DeepSeek models.
+        prompt = f"""
+        Please optimize the following code for {optimization_goal}:
         
-        Returns:
-            Dict containing available models
+        ```code
+        {code}
+        ```
+        
+        Provide:
+        1. Optimized code
+        2. Explanation of improvements
+        3. Performance benefits
+        4. Best practices applied
         """
-        try:
-            response = await self.client.get(f"{self.base_url}/models")
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "models": result.get("data", [])
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API request failed with status {response.status_code}",
-                    "error_type": "api_error"
-                }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": "deepseek_api_error"
-            }
\ No newline at end of file
+        return await self.complete("", prompt, model, max_tokens, 0.3)
@@ -0,0 +1,105 @@
+from typing import Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import httpx
+
+
+class LLMProviderError(Exception):
+    """Base class for failures reported by an LLM provider service."""
+
+    # Whether the failure says something about the provider's health (feeds the circuit breaker)
+    trips_circuit = True
+
+    def __init__(self, provider: str, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.message = message
+        self.status_code = status_code
+
+
+class ProviderNotConfiguredError(LLMProviderError):
+    """The provider has no API key configured."""
+    trips_circuit = False
+
+
+class ProviderAuthError(LLMProviderError):
+    """The API key was rejected (401/403)."""
+    pass
+
+
+class ProviderQuotaError(LLMProviderError):
+    """The account is out of credit or quota (402, insufficient_quota)."""
+    pass
+
+
+class ProviderRateLimitError(LLMProviderError):
+    """The provider answered 429; retry_after is in seconds when the provider sent it."""
+    trips_circuit = False
+
+    def __init__(self, provider: str, message: str, retry_after: Optional[float] = None):
+        super().__init__(provider, message, status_code=429)
+        self.retry_after = retry_after
+
+
+class ProviderTimeoutError(LLMProviderError):
+    """The provider did not answer in time."""
+    pass
+
+
+class ProviderClientError(LLMProviderError):
+    """The provider rejected the request itself (other 4xx); sending it again will not help."""
+    trips_circuit = False
+
+
+class ProviderUnavailableError(LLMProviderError):
+    """Connection failures, 5xx responses and malformed or empty replies."""
+    pass
+
+
+class CircuitOpenError(LLMProviderError):
+    """The provider's circuit breaker is open, so the call was not attempted."""
+    trips_circuit = False
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(provider, f"{provider} circuit is open, retrying in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_for_status(provider: str, response: httpx.Response, message: Optional[str] = None) -> LLMProviderError:
+    """
+    Map an HTTP error response from a provider to a typed error.
+    Streaming responses must be read (aread) before calling this.
+    """
+    status_code = response.status_code
+    text = response.text
+    message = message or f"{provider} API error: HTTP {status_code}. Response: {text}"
+
+    if status_code in (401, 403):
+        return ProviderAuthError(provider, message, status_code)
+    if status_code == 402 or "insufficient_quota" in text:
+        return ProviderQuotaError(provider, message, status_code)
+    if status_code == 429:
+        return ProviderRateLimitError(provider, message, parse_retry_after(response.headers.get("Retry-After")))
+    if status_code == 408:
+        return ProviderTimeoutError(provider, message, status_code)
+    if 400 <= status_code < 500:
+        return ProviderClientError(provider, message, status_code)
+    return ProviderUnavailableError(provider, message, status_code)
@@ -1,50 +1,130 @@
 from app.core.config import settings
-import google.generativeai as genai
-from typing import Dict, Any
-import httpx
+from typing import Dict, Any, List, Optional, AsyncIterator
 import json
+from app.services.integrations.base_provider import LLMProvider
+from app.services.integrations.completion import CompletionText, gemini_usage
+from app.services.prompt_templates import prompt_templates, system_instruction_parts
+from app.services.integrations.errors import LLMProviderError
 
-class GeminiService:
+class GeminiService(LLMProvider):
     """Service for Google Gemini AI integration."""
     
+    name = "gemini"
+    display_name = "Gemini"
+    
     def __init__(self):
-        self.api_key = settings.GEMINI_API_KEY
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
-        # Use the correct model name for Gemini
-        self.model = "gemini-1.5-pro-latest"
+        super().__init__(
+            settings.GEMINI_API_KEY,
+            "https://generativelanguage.googleapis.com/v1beta",
+            # Use the correct model name for Gemini
+            "gemini-1.5-pro-latest"
+        )
     
-    async def generate_response(self, system_prompt: str, user_prompt: str) -> str:
-        """Generate response using Gemini AI."""
-        if not self.api_key:
-            return self._fallback_response(user_prompt)
-            
-        combined_prompt = f"{system_prompt}\n\nUser Request: {user_prompt}"
-        
+    @property
+    def model(self) -> str:
+        return self.default_model
+    
+    def _headers(self) -> Dict[str, str]:
+        return {**super()._headers(), "x-goog-api-key": self.api_key or ""}
+    
+    def _payload(self, system_prompt: str, user_prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
         data = {
             "contents": [{
+                "role": "user",
                 "parts": [{
-                    "text": combined_prompt
+                    "text": user_prompt
                 }]
             }],
             "generationConfig": {
-                "temperature": 0.7,
-                "maxOutputTokens": 4000,
+                "temperature": temperature,
+                "maxOutputTokens": max_tokens,
             }
         }
+        if system_prompt:
+            data["systemInstruction"] = {"parts": system_instruction_parts(system_prompt)}
+        return data
+    
+    def _parse_usage(self, usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        normalized = gemini_usage(usage)
+        if usage:
+            prompt_templates.record_usage(self.name, normalized["prompt_tokens"], normalized["cached_tokens"])
+        return normalized
+    
+    @staticmethod
+    def _candidate_text(candidate: Dict[str, Any]) -> str:
+        parts = (candidate.get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+    
+    async def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7
+    ) -> CompletionText:
+        """
+        Generate response using Gemini AI.
+        Raises an LLMProviderError subclass on failure.
+        """
+        self._check_configured()
+        model = model or self.default_model
+        data = self._payload(system_prompt, user_prompt, max_tokens, temperature)
+        response = await self._send("POST", f"{self.base_url}/models/{model}:generateContent", json=data)
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}",
-                    json=data,
-                    timeout=60.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["candidates"][0]["content"]["parts"][0]["text"]
-        except Exception as e:
-            print(f"Gemini API error: {e}")
-            return self._fallback_response(user_prompt)
+            body = response.json()
+            candidate = body["candidates"][0]
+            content = self._candidate_text(candidate)
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            raise self._malformed(e)
+        if not content:
+            raise self._empty()
+        return CompletionText(
+            content,
+            model,
+            self._parse_usage(body.get("usageMetadata")),
+            provider=self.name,
+            finish_reason=candidate.get("finishReason")
+        )
+    
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        usage_out: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        """Stream a response from Gemini (streamGenerateContent with SSE framing)."""
+        self._check_configured()
+        model = model or self.default_model
+        data = self._payload(system_prompt, user_prompt, max_tokens, temperature)
+        response = await self._send(
+            "POST", f"{self.base_url}/models/{model}:streamGenerateContent?alt=sse", stream=True, json=data
+        )
+        try:
+            async for event in self._sse_events(response):
+                # Every event carries the running usageMetadata; the last one is the total
+                if event.get("usageMetadata") and usage_out is not None:
+                    usage_out.update(gemini_usage(event["usageMetadata"]))
+                for candidate in event.get("candidates") or []:
+                    content = self._candidate_text(candidate)
+                    if content:
+                        yield content
+        finally:
+            await response.aclose()
+        if usage_out:
+            prompt_templates.record_usage(self.name, usage_out.get("prompt_tokens", 0), usage_out.get("cached_tokens", 0))
+    
+    async def models(self) -> List[Dict[str, Any]]:
+        self._check_configured()
+        response = await self._send("GET", f"{self.base_url}/models")
+        try:
+            return response.json().get("models", [])
+        except (ValueError, AttributeError) as e:
+            raise self._malformed(e)
     
     async def generate_code(self, description: str, language: str, framework: str = None) -> str:
         """Generate code using Gemini AI."""
@@ -62,7 +142,11 @@ class GeminiService:
         
         user_prompt = f"Generate {language} code for: {description}"
         
-        return await self.generate_response(system_prompt, user_prompt)
+        try:
+            return await self.complete(system_prompt, user_prompt)
+        except LLMProviderError as e:
+            print(f"Gemini API error: {e}")
+            return self._fallback_response(user_prompt)
     
     def _fallback_response(self, prompt: str) -> str:
         """Fallback response when Gemini is not available."""
@@ -77,4 +161,4 @@ class GeminiService:
             "integrations": [],
             "deployment": "docker",
             "note": "Generated with fallback - Gemini API not configured"
-        })
\ No newline at end of file
+        })
@@ -0,0 +1,158 @@
+from typing import Dict, Any, Optional
+import asyncio
+import httpx
+from app.core.config import settings
+from app.services.integrations.llm_transport import build_llm_transport
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """
+    AsyncHTTPTransport that keeps counters about how the connection pool is used.
+    """
+
+    def __init__(self, max_connections: int, **kwargs):
+        super().__init__(**kwargs)
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.total_requests = 0
+        self.waits = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        connections = self._pool.connections
+        # A request has to wait when the pool is full and no connection can take it
+        if len(connections) >= self.max_connections and not any(
+            connection.is_available() for connection in connections
+        ):
+            self.waits += 1
+
+        self.total_requests += 1
+        self.in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool usage."""
+        connections = self._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "connections": len(connections),
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "in_flight": self.in_flight,
+            "waits": self.waits,
+            "total_requests": self.total_requests,
+            "max_connections": self.max_connections
+        }
+
+
+class SharedHTTPClient:
+    """
+    Process-wide pooled httpx.AsyncClients for the LLM provider services, one per provider.
+
+    Reusing a client keeps TCP/TLS connections alive between calls instead of
+    paying DNS and a full handshake on every request. A separate pool per provider
+    means a slow or stalled provider cannot use up the connections the others need.
+    """
+
+    DEFAULT = "default"
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, PooledTransport] = {}
+        self._llm_transports: Dict[str, httpx.AsyncBaseTransport] = {}
+        self._lock = asyncio.Lock()
+
+    def _create_client(self, name: str) -> httpx.AsyncClient:
+        http2 = settings.LLM_HTTP2 and HTTP2_AVAILABLE
+        if settings.LLM_HTTP2 and not HTTP2_AVAILABLE and not self._clients:
+            print("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+
+        limits = httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+        )
+        transport = PooledTransport(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            http2=http2,
+            limits=limits,
+            retries=1  # Retry connection failures once (connect errors only)
+        )
+        self._transports[name] = transport
+        # Record/replay/fake transports wrap or replace the pooled one (LLM_TRANSPORT_MODE)
+        self._llm_transports[name] = build_llm_transport(transport)
+        return httpx.AsyncClient(
+            transport=self._llm_transports[name],
+            timeout=httpx.Timeout(
+                settings.LLM_REQUEST_TIMEOUT,
+                connect=settings.LLM_CONNECT_TIMEOUT,
+                pool=settings.LLM_POOL_TIMEOUT
+            )
+        )
+
+    async def startup(self):
+        """Create the default client. Called from the FastAPI startup hook; provider pools open on first use."""
+        async with self._lock:
+            self.client_for(self.DEFAULT)
+            print(f"Shared LLM HTTP client started (max connections per provider: {settings.LLM_MAX_CONNECTIONS})")
+
+    async def shutdown(self):
+        """Close every client and release its connections."""
+        async with self._lock:
+            for client in self._clients.values():
+                if not client.is_closed:
+                    await client.aclose()
+            if self._clients:
+                print("Shared LLM HTTP clients closed")
+            self._clients = {}
+            self._transports = {}
+            self._llm_transports = {}
+
+    def client_for(self, name: str = DEFAULT) -> httpx.AsyncClient:
+        """Return the pooled client for a provider, creating it lazily (also outside the app lifecycle)."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(name)
+            self._clients[name] = client
+        return client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.client_for(self.DEFAULT)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return connection pool statistics per provider for monitoring."""
+        pools = {}
+        for name, client in self._clients.items():
+            if client.is_closed:
+                continue
+            stats = self._transports[name].get_stats()
+            llm_transport = self._llm_transports[name]
+            if llm_transport is not self._transports[name] and hasattr(llm_transport, "get_stats"):
+                stats["transport"] = llm_transport.get_stats()
+            pools[name] = stats
+        if not pools:
+            return {"status": "not_started"}
+        return {
+            "status": "running",
+            "http2": settings.LLM_HTTP2 and HTTP2_AVAILABLE,
+            "transport_mode": settings.LLM_TRANSPORT_MODE,
+            "pools": pools
+        }
+
+
+# Global shared client instance
+shared_http_client = SharedHTTPClient()
+
+
+def get_http_client(provider: str = SharedHTTPClient.DEFAULT) -> httpx.AsyncClient:
+    """Get the pooled HTTP client for a provider."""
+    return shared_http_client.client_for(provider)
@@ -0,0 +1,305 @@
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import httpx
+from app.core.config import settings
+
+# Request fields that change between otherwise identical calls and must not affect matching
+_VOLATILE_FIELDS = ("stream",)
+# Response headers worth keeping in a cassette
+_KEPT_HEADERS = ("content-type", "retry-after")
+# Every provider pool records into the same cassette file
+_CASSETTE_LOCK = threading.Lock()
+# Transport modes that never reach a provider, so providers need no API key
+OFFLINE_MODES = ("replay", "fake")
+
+
+def _request_body(request: httpx.Request) -> Any:
+    try:
+        return json.loads(request.content or b"null")
+    except (ValueError, UnicodeDecodeError):
+        return request.content.decode("utf-8", errors="replace")
+
+
+def request_fingerprint(request: httpx.Request) -> str:
+    """Stable key for a provider request: method, URL path and the JSON body."""
+    body = _request_body(request)
+    if isinstance(body, dict):
+        body = {key: value for key, value in body.items() if key not in _VOLATILE_FIELDS}
+    payload = json.dumps([request.method, request.url.host, request.url.path, body], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_stream_request(request: httpx.Request) -> bool:
+    # Gemini streams from a separate method (models/...:streamGenerateContent) instead of a body flag
+    if request.url.path.endswith(":streamGenerateContent"):
+        return True
+    body = _request_body(request)
+    return isinstance(body, dict) and bool(body.get("stream"))
+
+
+class _PacedByteStream(httpx.AsyncByteStream):
+    """Response body delivered in chunks with a delay before each one."""
+
+    def __init__(self, chunks: List[bytes], delays: List[float]):
+        self.chunks = chunks
+        self.delays = delays
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk, delay in zip(self.chunks, self.delays):
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forwards requests to a real transport and appends every exchange to a JSONL cassette."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette_path: str):
+        self.inner = inner
+        self.cassette_path = cassette_path
+        self.recorded = 0
+
+    def _append(self, entry: Dict[str, Any]):
+        with _CASSETTE_LOCK:
+            with open(self.cassette_path, "a", encoding="utf-8") as cassette:
+                cassette.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        # Read the whole body so it can be saved (streams are replayed chunk by chunk later)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.monotonic() - started_at
+
+        entry = {
+            "key": request_fingerprint(request),
+            "method": request.method,
+            "url": str(request.url.copy_with(query=None)),
+            "request": _request_body(request),
+            "status_code": response.status_code,
+            "headers": {name: value for name, value in response.headers.items() if name.lower() in _KEPT_HEADERS},
+            "body": content.decode("utf-8", errors="replace"),
+            "elapsed": round(elapsed, 4),
+            "recorded_at": time.time()
+        }
+        await asyncio.to_thread(self._append, entry)
+        self.recorded += 1
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=entry["headers"],
+            content=content,
+            request=request
+        )
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"mode": "record", "cassette": self.cassette_path, "recorded": self.recorded}
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves responses from a cassette written by RecordingTransport.
+
+    Requests are matched on their fingerprint. Without an exact match (prompts
+    that embed timestamps, for example) the recorded responses for the same
+    URL are served round-robin, unless strict is set. Latency is synthetic:
+    latency_ms plus up to jitter_ms, drawn from a seeded RNG so runs are repeatable.
+    """
+
+    def __init__(self, cassette_path: str, latency_ms: float = 200, jitter_ms: float = 0, strict: bool = False, seed: int = 0):
+        self.cassette_path = cassette_path
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.strict = strict
+        self._random = random.Random(seed)
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_url: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self.stats = {"exact": 0, "fuzzy": 0, "missing": 0}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.cassette_path):
+            print(f"LLM replay: cassette {self.cassette_path} not found, every request will miss")
+            return
+        with open(self.cassette_path, encoding="utf-8") as cassette:
+            for line in cassette:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                self._by_key.setdefault(entry["key"], []).append(entry)
+                self._by_url.setdefault(entry["url"], []).append(entry)
+        print(f"LLM replay: loaded {sum(len(entries) for entries in self._by_key.values())} exchanges from {self.cassette_path}")
+
+    def _next(self, bucket: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        cursor = self._cursors.get(bucket, 0)
+        self._cursors[bucket] = cursor + 1
+        return entries[cursor % len(entries)]
+
+    def _find(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        key = request_fingerprint(request)
+        if key in self._by_key:
+            self.stats["exact"] += 1
+            return self._next(key, self._by_key[key])
+        url = str(request.url.copy_with(query=None))
+        if not self.strict and url in self._by_url:
+            self.stats["fuzzy"] += 1
+            return self._next(url, self._by_url[url])
+        self.stats["missing"] += 1
+        return None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._find(request)
+        latency = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000.0
+        if entry is None:
+            return httpx.Response(
+                503,
+                json={"error": {"message": "No recorded response for this request (LLM replay mode)"}},
+                request=request
+            )
+
+        body = entry["body"].encode("utf-8")
+        if _is_stream_request(request):
+            # Spread the recorded events over the synthetic latency
+            lines = [line + b"\n" for line in body.split(b"\n")]
+            per_line = latency / max(1, len(lines))
+            stream = _PacedByteStream(lines, [latency / 2] + [per_line / 2] * (len(lines) - 1))
+            return httpx.Response(entry["status_code"], headers=entry.get("headers", {}), stream=stream, request=request)
+
+        await asyncio.sleep(latency)
+        return httpx.Response(entry["status_code"], headers=entry.get("headers", {}), content=body, request=request)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"mode": "replay", "cassette": self.cassette_path, **self.stats}
+
+
+class FakeLLMTransport(httpx.AsyncBaseTransport):
+    """
+    Synthesises provider responses without any network access.
+
+    Each reply has `tokens` words, the first arrives after ttft_ms and the rest
+    at tokens_per_second. OpenAI-compatible endpoints (OpenRouter, DeepSeek)
+    and Gemini's generateContent format are supported, streaming included, and
+    GET requests (model listings) answer with a single fake model.
+    """
+
+    WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do")
+
+    def __init__(self, tokens: int = 200, ttft_ms: float = 300, tokens_per_second: float = 50):
+        self.tokens = tokens
+        self.ttft_ms = ttft_ms
+        self.tokens_per_second = tokens_per_second
+        self.requests = 0
+
+    def _words(self, body: Dict[str, Any]) -> List[str]:
+        count = self.tokens
+        max_tokens = body.get("max_tokens") or (body.get("generationConfig") or {}).get("maxOutputTokens")
+        if max_tokens:
+            count = min(count, int(max_tokens))
+        return [self.WORDS[i % len(self.WORDS)] for i in range(count)]
+
+    def _duration(self, count: int) -> float:
+        return self.ttft_ms / 1000.0 + count / max(self.tokens_per_second, 0.001)
+
+    def _event_stream(self, events: List[Dict[str, Any]], done: bool) -> httpx.AsyncByteStream:
+        chunks = [("data: " + json.dumps(event) + "\n\n").encode("utf-8") for event in events]
+        if done:
+            chunks.append(b"data: [DONE]\n\n")
+        per_token = 1.0 / max(self.tokens_per_second, 0.001)
+        return _PacedByteStream(chunks, [self.ttft_ms / 1000.0] + [per_token] * (len(chunks) - 1))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        body = _request_body(request)
+        body = body if isinstance(body, dict) else {}
+        words = self._words(body)
+        model = body.get("model", "fake-model")
+        usage = {"prompt_tokens": len(json.dumps(body)) // 4, "completion_tokens": len(words)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if request.method == "GET":
+            await asyncio.sleep(self.ttft_ms / 1000.0)
+            return httpx.Response(200, json={
+                "data": [{"id": "fake-model", "object": "model"}],
+                "models": [{"name": "models/fake-model"}]
+            }, request=request)
+
+        if "generativelanguage" in request.url.host:
+            gemini_usage = {"promptTokenCount": usage["prompt_tokens"], "candidatesTokenCount": len(words)}
+            if _is_stream_request(request):
+                events = [{"candidates": [{"content": {"parts": [{"text": word + " "}], "role": "model"}}]} for word in words]
+                events.append({"candidates": [{"finishReason": "STOP"}], "usageMetadata": gemini_usage})
+                return httpx.Response(
+                    200,
+                    headers={"content-type": "text/event-stream"},
+                    stream=self._event_stream(events, done=False),
+                    request=request
+                )
+            await asyncio.sleep(self._duration(len(words)))
+            return httpx.Response(200, json={
+                "candidates": [{"content": {"parts": [{"text": " ".join(words)}], "role": "model"}, "finishReason": "STOP"}],
+                "usageMetadata": gemini_usage
+            }, request=request)
+
+        if body.get("stream"):
+            events = [{"model": model, "choices": [{"delta": {"content": word + " "}}]} for word in words]
+            events.append({"model": model, "choices": [], "usage": usage})
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                stream=self._event_stream(events, done=True),
+                request=request
+            )
+
+        await asyncio.sleep(self._duration(len(words)))
+        return httpx.Response(200, json={
+            "id": f"fake-{self.requests}",
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": " ".join(words)}, "finish_reason": "stop"}],
+            "usage": usage
+        }, request=request)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"mode": "fake", "requests": self.requests, "tokens": self.tokens, "tokens_per_second": self.tokens_per_second}
+
+
+def is_offline() -> bool:
+    """True when LLM_TRANSPORT_MODE answers every request without a provider."""
+    return settings.LLM_TRANSPORT_MODE in OFFLINE_MODES
+
+
+def build_llm_transport(live_transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    """Pick the transport for LLM_TRANSPORT_MODE: live (default), record, replay or fake."""
+    mode = settings.LLM_TRANSPORT_MODE
+    if mode == "record":
+        print(f"LLM transport: recording exchanges to {settings.LLM_CASSETTE_PATH}")
+        return RecordingTransport(live_transport, settings.LLM_CASSETTE_PATH)
+    if mode == "replay":
+        return ReplayTransport(
+            settings.LLM_CASSETTE_PATH,
+            latency_ms=settings.LLM_FAKE_LATENCY_MS,
+            jitter_ms=settings.LLM_FAKE_JITTER_MS
+        )
+    if mode == "fake":
+        print("LLM transport: serving synthetic responses (no network)")
+        return FakeLLMTransport(
+            tokens=settings.LLM_FAKE_TOKENS,
+            ttft_ms=settings.LLM_FAKE_LATENCY_MS,
+            tokens_per_second=settings.LLM_FAKE_TOKENS_PER_SECOND
+        )
+    if mode != "live":
+        print(f"Unknown LLM_TRANSPORT_MODE '{mode}', using live transport")
+    return live_transport
@@ -0,0 +1,180 @@
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from app.core.config import settings
+
+
+class LLMResponseCache:
+    """
+    Two-level cache for LLM responses.
+
+    An in-memory LRU (size capped, TTL based) sits in front of a local SQLite
+    store, so cached responses survive restarts and are shared by every
+    AIAgentService instance in the process.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 86400, db_path: Optional[str] = None,
+                 max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        # key -> (expires_at, response)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._db_failed = False
+        self._writes_since_prune = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0
+        }
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> str:
+        """Build a stable cache key from everything that determines the completion."""
+        payload = json.dumps(
+            [model, system_prompt, user_prompt, round(float(temperature), 4), int(max_tokens)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # SQLite backing store (runs in a worker thread)
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        if self._db is not None or self._db_failed or not self.db_path:
+            return self._db
+        try:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache (expires_at)")
+            self._db.commit()
+        except Exception as e:
+            print(f"LLM cache: SQLite store unavailable ({e}), using memory only")
+            self._db = None
+            self._db_failed = True
+        return self._db
+
+    def _disk_get(self, key: str):
+        with self._db_lock:
+            db = self._get_db()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] <= time.time():
+                db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                db.commit()
+                return None
+            return row
+
+    def _disk_set(self, key: str, response: str, expires_at: float):
+        with self._db_lock:
+            db = self._get_db()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, response, time.time(), expires_at)
+            )
+            self._writes_since_prune += 1
+            # Prune expired rows and cap the store size every so often
+            if self._writes_since_prune >= 100:
+                self._writes_since_prune = 0
+                db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+                db.execute(
+                    "DELETE FROM llm_cache WHERE key NOT IN "
+                    "(SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT ?)",
+                    (self.max_disk_entries,)
+                )
+            db.commit()
+
+    def _disk_clear(self):
+        with self._db_lock:
+            db = self._get_db()
+            if db is not None:
+                db.execute("DELETE FROM llm_cache")
+                db.commit()
+
+    # In-memory LRU front
+    def _remember(self, key: str, response: str, expires_at: float):
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return a cached response or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return response
+            del self._entries[key]
+
+        try:
+            row = await asyncio.to_thread(self._disk_get, key)
+        except Exception as e:
+            print(f"LLM cache read error: {e}")
+            row = None
+
+        if row:
+            response, expires_at = row
+            self._remember(key, response, expires_at)
+            self.stats["disk_hits"] += 1
+            return response
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, response: str):
+        """Store a response in memory and in the SQLite store."""
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, response, expires_at)
+        self.stats["writes"] += 1
+        try:
+            await asyncio.to_thread(self._disk_set, key, response, expires_at)
+        except Exception as e:
+            print(f"LLM cache write error: {e}")
+
+    async def clear(self):
+        """Drop every cached response."""
+        self._entries.clear()
+        await asyncio.to_thread(self._disk_clear)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "enabled": settings.LLM_CACHE_ENABLED
+        }
+
+
+# Global cache instance shared by all AI agent instances
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL,
+    db_path=settings.LLM_CACHE_PATH
+)
@@ -0,0 +1,242 @@
+from typing import Dict, Any, List, Optional, Awaitable, Callable, Tuple
+from collections import deque
+from contextvars import ContextVar
+import asyncio
+import time
+from app.core.config import settings
+from app.services.llm_scheduler import SchedulerTimeoutError
+from app.services.integrations.errors import CircuitOpenError
+
+# Failures raised before the request reaches the provider; they say nothing about its health
+LOCAL_REJECTIONS = (SchedulerTimeoutError, CircuitOpenError)
+
+# The routed attempt running in the current task, see LLMRouter.mark_sent
+_current_attempt: ContextVar[Optional[Dict[str, Any]]] = ContextVar("_current_attempt", default=None)
+
+
+class ProviderStats:
+    """Latency and error tracking for one provider/model target."""
+
+    def __init__(self, alpha: float = 0.2, window: int = 200):
+        self.alpha = alpha
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.hedges_won = 0
+        self.last_error_at = 0.0
+
+    def record(self, latency: float, success: bool):
+        self.requests += 1
+        self.ewma_error_rate = self.alpha * (0.0 if success else 1.0) + (1 - self.alpha) * self.ewma_error_rate
+        if success:
+            self.record_latency(latency)
+        else:
+            self.errors += 1
+            self.last_error_at = time.monotonic()
+
+    def record_latency(self, latency: float):
+        self.latencies.append(latency)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+    def is_healthy(self, error_threshold: float, cooldown: float) -> bool:
+        """Unhealthy while the error rate is high, until the cooldown allows a probe."""
+        if self.ewma_error_rate < error_threshold:
+            return True
+        return time.monotonic() - self.last_error_at >= cooldown
+
+    def score(self) -> float:
+        """Expected cost of a request: latency inflated by the error rate. Unmeasured targets score 0."""
+        if self.ewma_latency is None:
+            return 0.0
+        return self.ewma_latency * (1 + 4 * self.ewma_error_rate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.ewma_error_rate, 4),
+            "ewma_latency": round(self.ewma_latency, 3) if self.ewma_latency is not None else None,
+            "p50_latency": round(p50, 3) if p50 is not None else None,
+            "p95_latency": round(p95, 3) if p95 is not None else None,
+            "hedges_won": self.hedges_won
+        }
+
+
+class LLMRouter:
+    """
+    Routes LLM calls to the fastest healthy provider.
+
+    Targets are ranked by EWMA latency weighted by EWMA error rate; targets
+    with a high error rate are skipped until a cooldown passes. A failed call
+    fails over to the next target. With hedging, a second target is started
+    when the first has not answered within its p95 latency, and whichever
+    succeeds first wins.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        error_threshold: float = 0.5,
+        cooldown: float = 30.0,
+        hedge_min_delay: float = 1.0,
+        hedge_max_delay: float = 8.0
+    ):
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self._stats: Dict[str, ProviderStats] = {}
+        self.counters = {
+            "routed": 0,
+            "failovers": 0,
+            "hedged": 0
+        }
+
+    def _target_stats(self, target: str) -> ProviderStats:
+        if target not in self._stats:
+            self._stats[target] = ProviderStats(alpha=self.alpha)
+        return self._stats[target]
+
+    def rank(self, targets: List[str]) -> List[str]:
+        """Healthy targets fastest first, then unhealthy ones by how long ago they last failed."""
+        healthy = [t for t in targets if self._target_stats(t).is_healthy(self.error_threshold, self.cooldown)]
+        unhealthy = [t for t in targets if t not in healthy]
+        healthy.sort(key=lambda t: self._target_stats(t).score())
+        unhealthy.sort(key=lambda t: self._target_stats(t).last_error_at)
+        return healthy + unhealthy
+
+    def hedge_delay(self, target: str) -> float:
+        """How long to wait on a target before hedging: its p95 latency, clamped."""
+        stats = self._target_stats(target)
+        p95 = stats.percentile(0.95) if len(stats.latencies) >= 10 else None
+        if p95 is None:
+            return self.hedge_max_delay
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, p95))
+
+    def record(self, target: str, latency: float, success: bool):
+        self._target_stats(target).record(latency, success)
+
+    def mark_sent(self):
+        """
+        Called by a routed func when its provider request goes out, so the measured
+        latency leaves out the time spent waiting in the rate-limit queue.
+        """
+        attempt = _current_attempt.get()
+        if attempt is not None:
+            attempt["started_at"] = time.monotonic()
+            attempt["sent"] = True
+
+    async def _timed(
+        self,
+        target: str,
+        func: Callable[[str], Awaitable[str]],
+        is_error: Callable[[str], bool]
+    ) -> Tuple[str, Optional[str], Optional[BaseException]]:
+        """Run func(target), record the outcome and return (target, response, exception)."""
+        attempt = {"started_at": time.monotonic(), "sent": False}
+        token = _current_attempt.set(attempt)
+        try:
+            response = await func(target)
+        except asyncio.CancelledError:
+            # A cancelled hedge loser says nothing about health, but once sent it was at least this slow
+            if attempt["sent"]:
+                self._target_stats(target).record_latency(time.monotonic() - attempt["started_at"])
+            raise
+        except LOCAL_REJECTIONS as e:
+            return target, None, e
+        except Exception as e:
+            self.record(target, time.monotonic() - attempt["started_at"], False)
+            return target, None, e
+        finally:
+            _current_attempt.reset(token)
+        self.record(target, time.monotonic() - attempt["started_at"], not is_error(response))
+        return target, response, None
+
+    async def route(
+        self,
+        targets: List[str],
+        func: Callable[[str], Awaitable[str]],
+        is_error: Callable[[str], bool],
+        hedge: bool = False
+    ) -> Tuple[str, str]:
+        """
+        Call func(target) on the best target and return (target, response).
+        Falls over to the next target on failure. If every target fails, the last
+        error response is returned, or the last exception is raised.
+        """
+        ranked = self.rank(targets)
+        self.counters["routed"] += 1
+        last_response: Optional[Tuple[str, str]] = None
+        last_exception: Optional[BaseException] = None
+        pending: List[asyncio.Task] = []
+        index = 0
+
+        try:
+            while index < len(ranked) or pending:
+                if not pending:
+                    if index > 0:
+                        self.counters["failovers"] += 1
+                    pending.append(asyncio.ensure_future(self._timed(ranked[index], func, is_error)))
+                    index += 1
+
+                # Only hedge while a single attempt is running and there is another target left
+                can_hedge = hedge and len(pending) == 1 and index < len(ranked)
+                timeout = self.hedge_delay(ranked[index - 1]) if can_hedge else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    self.counters["hedged"] += 1
+                    pending.append(asyncio.ensure_future(self._timed(ranked[index], func, is_error)))
+                    index += 1
+                    continue
+
+                for task in done:
+                    pending.remove(task)
+                    target, response, exception = task.result()
+                    if exception is None and not is_error(response):
+                        if index > 1 and pending:
+                            self._target_stats(target).hedges_won += 1
+                        return target, response
+                    if exception is not None:
+                        last_exception = exception
+                    else:
+                        last_response = (target, response)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if last_response is not None:
+            return last_response
+        raise last_exception
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-target latency/error statistics for monitoring."""
+        return {
+            **self.counters,
+            "hedging_enabled": settings.LLM_HEDGING_ENABLED,
+            "targets": {target: stats.to_dict() for target, stats in self._stats.items()}
+        }
+
+
+# Global router shared by all AI agent instances
+llm_router = LLMRouter(
+    error_threshold=settings.LLM_ROUTER_ERROR_THRESHOLD,
+    cooldown=settings.LLM_ROUTER_COOLDOWN,
+    hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+    hedge_max_delay=settings.LLM_HEDGE_MAX_DELAY
+)
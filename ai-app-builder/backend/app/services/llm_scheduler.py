@@ -0,0 +1,200 @@
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import contextvars
+import enum
+import heapq
+import itertools
+import time
+from app.core.config import settings
+
+
+class Priority(enum.IntEnum):
+    """Scheduling lanes for LLM calls. Lower values are served first."""
+    INTERACTIVE = 0  # chat and other calls a user is actively waiting on
+    STANDARD = 1
+    BATCH = 2  # documentation, improvement suggestions and other background work
+
+
+# Lowest lane the current task may use; bulk callers (e.g. /api/ai/batch) set it to BATCH
+# so everything they trigger queues behind interactive traffic.
+llm_priority_floor: contextvars.ContextVar = contextvars.ContextVar("llm_priority_floor", default=Priority.INTERACTIVE)
+
+
+class SchedulerTimeoutError(Exception):
+    """Raised when a request waited longer than its allowed queue time."""
+    pass
+
+
+class TokenBucket:
+    """Token bucket with an optional hard block (used for Retry-After)."""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def time_until_available(self) -> float:
+        """Seconds until a token can be taken (0 when one is available now)."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill(time.monotonic())
+        self.tokens -= 1
+
+    def block_for(self, seconds: float):
+        """Stop handing out tokens for the given number of seconds."""
+        now = time.monotonic()
+        self._refill(now)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        # No burst once the pause ends: one request may probe, the rest are paced
+        self.tokens = min(self.tokens, 1)
+
+
+class LLMScheduler:
+    """
+    Async admission control in front of LLM provider calls.
+
+    Each (provider, model) pair gets its own token bucket and priority queue.
+    Waiting requests are granted in priority order, so interactive chat jumps
+    ahead of queued batch work, and a request gives up with
+    SchedulerTimeoutError once it has waited longer than its allowed time.
+    """
+
+    def __init__(self, requests_per_minute: float = 60, burst: int = 10, max_wait: float = 20.0):
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst
+        self.max_wait = max_wait
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._queues: Dict[Tuple[str, str], List] = {}
+        self._dispatchers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._sequence = itertools.count()
+        self.stats = {
+            "granted": 0,
+            "queued": 0,
+            "timeouts": 0,
+            "rate_limited": 0
+        }
+        self._wait_totals = {priority.name.lower(): 0.0 for priority in Priority}
+        self._wait_counts = {priority.name.lower(): 0 for priority in Priority}
+
+    def _bucket(self, key: Tuple[str, str]) -> TokenBucket:
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return self._buckets[key]
+
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        priority: Priority = Priority.STANDARD,
+        max_wait: Optional[float] = None
+    ):
+        """Wait for permission to call provider/model. Raises SchedulerTimeoutError on timeout."""
+        priority = Priority(max(priority, llm_priority_floor.get()))
+        key = (provider, model)
+        bucket = self._bucket(key)
+        queue = self._queues.setdefault(key, [])
+        started_at = time.monotonic()
+
+        # Fast path: nothing queued and a token is available
+        if not queue and bucket.time_until_available() == 0:
+            bucket.take()
+            self._record_grant(priority, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(queue, (int(priority), next(self._sequence), future))
+        self.stats["queued"] += 1
+        self._ensure_dispatcher(key)
+
+        timeout = self.max_wait if max_wait is None else max_wait
+        try:
+            await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise SchedulerTimeoutError(
+                f"{provider} request for {model} waited more than {timeout:.1f}s in the rate-limit queue"
+            )
+        self._record_grant(priority, time.monotonic() - started_at)
+
+    def _record_grant(self, priority: Priority, waited: float):
+        self.stats["granted"] += 1
+        lane = Priority(priority).name.lower()
+        self._wait_totals[lane] += waited
+        self._wait_counts[lane] += 1
+
+    def _ensure_dispatcher(self, key: Tuple[str, str]):
+        dispatcher = self._dispatchers.get(key)
+        if dispatcher is None or dispatcher.done():
+            self._dispatchers[key] = asyncio.ensure_future(self._dispatch(key))
+
+    async def _dispatch(self, key: Tuple[str, str]):
+        """Hand out tokens to queued waiters, highest priority first."""
+        bucket = self._bucket(key)
+        queue = self._queues[key]
+        while queue:
+            # Drop waiters that timed out or were cancelled
+            while queue and queue[0][2].done():
+                heapq.heappop(queue)
+            if not queue:
+                break
+            wait = bucket.time_until_available()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            _, _, future = heapq.heappop(queue)
+            if future.done():
+                continue
+            bucket.take()
+            future.set_result(True)
+        self._dispatchers.pop(key, None)
+
+    def report_rate_limited(self, provider: str, model: str, retry_after: Optional[float] = None):
+        """Pause a provider/model after a 429, honouring Retry-After when given."""
+        delay = retry_after if retry_after is not None else settings.LLM_RATE_LIMIT_BACKOFF
+        self._bucket((provider, model)).block_for(delay)
+        self.stats["rate_limited"] += 1
+        print(f"{provider} rate limited for {model}, pausing requests for {delay:.1f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and wait-time statistics for monitoring."""
+        now = time.monotonic()
+        return {
+            **self.stats,
+            "queues": {
+                f"{provider}:{model}": {
+                    "waiting": sum(1 for item in queue if not item[2].done()),
+                    "blocked_for": round(max(0.0, self._bucket((provider, model)).blocked_until - now), 2)
+                }
+                for (provider, model), queue in self._queues.items()
+            },
+            "average_wait_seconds": {
+                lane: round(self._wait_totals[lane] / count, 3) if count else 0.0
+                for lane, count in self._wait_counts.items()
+            },
+            "requests_per_minute": self.rate * 60,
+            "burst": self.burst,
+            "max_wait_seconds": self.max_wait
+        }
+
+
+# Global scheduler shared by all LLM callers in the process
+llm_scheduler = LLMScheduler(
+    requests_per_minute=settings.LLM_RATE_LIMIT_PER_MINUTE,
+    burst=settings.LLM_RATE_LIMIT_BURST,
+    max_wait=settings.LLM_QUEUE_MAX_WAIT
+)
@@ -0,0 +1,226 @@
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterable, AsyncIterator, Tuple
+from collections import OrderedDict
+import asyncio
+import time
+
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    run: coroutine function called with the run's context and the results of the
+         stages it depends on (a dict of stage name -> result), returning this stage's result.
+    depends_on: names of the stages that must finish first.
+    cache_key: optional function of the same (context, results); when it returns a
+         key, the result is kept in the pipeline's cache and reused for that key.
+    skip_if: optional function of the same (context, results); when it returns True
+         the stage is not run and its result is `default`.
+    inputs: names of the input fields the stage reads ("tech_stack" covers
+         "tech_stack.frontend"), used by Pipeline.affected.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]],
+        depends_on: Iterable[str] = (),
+        cache_key: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Optional[str]]] = None,
+        skip_if: Optional[Callable[[Dict[str, Any], Dict[str, Any]], bool]] = None,
+        default: Any = None,
+        inputs: Iterable[str] = ()
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+        self.cache_key = cache_key
+        self.skip_if = skip_if
+        self.default = default
+        self.inputs = tuple(inputs)
+
+    def reads(self, field: str) -> bool:
+        """Whether the stage reads the field or a part of it."""
+        return any(field == name or field.startswith(name + ".") for name in self.inputs)
+
+
+class PipelineRun:
+    """Results, per-stage status ("done", "cached", "skipped", "failed") and timings in ms of one run."""
+
+    def __init__(self):
+        self.results: Dict[str, Any] = {}
+        self.status: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+        self.total_ms = 0.0
+
+    def merged(self, names: Iterable[str]) -> Dict[str, Any]:
+        """The dict results of the named stages merged in that order (later stages win)."""
+        merged = {}
+        for name in names:
+            merged.update(self.results.get(name) or {})
+        return merged
+
+
+class PipelineMetrics:
+    """Per-pipeline, per-stage counters for /stats."""
+
+    def __init__(self):
+        self._pipelines: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, pipeline: str, run: PipelineRun):
+        entry = self._pipelines.setdefault(pipeline, {"runs": 0, "total_ms": 0.0, "stages": {}})
+        entry["runs"] += 1
+        entry["total_ms"] += run.total_ms
+        for name, status in run.status.items():
+            stage = entry["stages"].setdefault(name, {"done": 0, "cached": 0, "skipped": 0, "failed": 0, "total_ms": 0.0})
+            stage[status] += 1
+            stage["total_ms"] += run.timings.get(name, 0.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {}
+        for pipeline, entry in self._pipelines.items():
+            stats[pipeline] = {
+                "runs": entry["runs"],
+                "avg_ms": round(entry["total_ms"] / entry["runs"], 3) if entry["runs"] else 0.0,
+                "stages": {
+                    name: {
+                        **{key: value for key, value in stage.items() if key != "total_ms"},
+                        "avg_ms": round(stage["total_ms"] / max(1, stage["done"] + stage["cached"]), 3)
+                    }
+                    for name, stage in entry["stages"].items()
+                }
+            }
+        return stats
+
+
+class Pipeline:
+    """
+    A DAG of stages run as concurrently as their dependencies allow.
+
+    Every stage starts as soon as all the stages it depends on have finished.
+    If a stage fails, the stages still running are cancelled and the error is
+    raised. Results of stages with a cache_key are kept in an LRU of
+    max_cache_entries per pipeline.
+    """
+
+    def __init__(self, name: str, stages: List[Stage], max_cache_entries: int = 128, metrics: Optional[PipelineMetrics] = None):
+        self.name = name
+        if len(stages) != len({stage.name for stage in stages}):
+            raise ValueError(f"Pipeline '{name}' has duplicate stage names")
+        self.stages: "OrderedDict[str, Stage]" = OrderedDict((stage.name, stage) for stage in stages)
+        self.max_cache_entries = max_cache_entries
+        self.metrics = metrics if metrics is not None else pipeline_metrics
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            unknown = [name for name in stage.depends_on if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {', '.join(unknown)}")
+        # Kahn's algorithm: any stage left over sits on a cycle
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline '{self.name}' has a dependency cycle among: {', '.join(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def input_fields(self) -> set:
+        """Top-level names of the input fields any stage reads ("tech_stack.frontend" counts as "tech_stack")."""
+        return {name.split(".", 1)[0] for stage in self.stages.values() for name in stage.inputs}
+
+    def affected(self, fields: Iterable[str]) -> set:
+        """Names of the stages that read any of the fields, plus every stage depending on one of them."""
+        fields = list(fields)
+        affected = {name for name, stage in self.stages.items() if any(stage.reads(field) for field in fields)}
+        changed = True
+        while changed:
+            changed = False
+            for name, stage in self.stages.items():
+                if name not in affected and affected.intersection(stage.depends_on):
+                    affected.add(name)
+                    changed = True
+        return affected
+
+    async def _run_stage(self, stage: Stage, context: Dict[str, Any], run: PipelineRun, skip: set):
+        inputs = {name: run.results.get(name) for name in stage.depends_on}
+        started = time.perf_counter()
+        if stage.name in skip or (stage.skip_if is not None and stage.skip_if(context, inputs)):
+            run.results[stage.name] = stage.default
+            run.status[stage.name] = "skipped"
+            run.timings[stage.name] = 0.0
+            return
+
+        key = stage.cache_key(context, inputs) if stage.cache_key is not None else None
+        if key is not None and (stage.name, key) in self._cache:
+            self._cache.move_to_end((stage.name, key))
+            run.results[stage.name] = self._cache[(stage.name, key)]
+            run.status[stage.name] = "cached"
+        else:
+            try:
+                result = await stage.run(context, inputs)
+            except Exception:
+                run.status[stage.name] = "failed"
+                run.timings[stage.name] = (time.perf_counter() - started) * 1000
+                raise
+            run.results[stage.name] = result
+            run.status[stage.name] = "done"
+            if key is not None:
+                self._cache[(stage.name, key)] = result
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+        run.timings[stage.name] = (time.perf_counter() - started) * 1000
+
+    async def stream(
+        self,
+        context: Optional[Dict[str, Any]] = None,
+        skip: Iterable[str] = (),
+        run: Optional[PipelineRun] = None,
+        keep_results: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run every stage like run(), yielding (stage name, result) as each stage finishes.
+        Unless keep_results is True, results no remaining stage depends on are dropped
+        from run.results once yielded, so only the stages still in use stay in memory.
+        Pass a PipelineRun to read the status and timings; closing the stream early
+        cancels the stages still running.
+        """
+        context = context if context is not None else {}
+        run = run if run is not None else PipelineRun()
+        skip = set(skip)
+        started = time.perf_counter()
+        pending = dict(self.stages)
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while pending or running:
+                for name in [name for name, stage in pending.items() if all(dep in run.status for dep in stage.depends_on)]:
+                    running[asyncio.ensure_future(self._run_stage(pending.pop(name), context, run, skip))] = name
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    # Raises the stage's error; the finally block cancels the rest
+                    task.result()
+                    yield name, run.results[name]
+                    if not keep_results and not any(name in stage.depends_on for stage in pending.values()):
+                        run.results.pop(name, None)
+        finally:
+            for task in running:
+                task.cancel()
+            run.total_ms = (time.perf_counter() - started) * 1000
+            self.metrics.record(self.name, run)
+
+    async def run(self, context: Optional[Dict[str, Any]] = None, skip: Iterable[str] = ()) -> PipelineRun:
+        """
+        Run every stage with the given context and return the run.
+        Stages named in skip are not run and count as skipped.
+        """
+        run = PipelineRun()
+        async for _ in self.stream(context, skip, run, keep_results=True):
+            pass
+        return run
+
+
+# Global metrics shared by every pipeline
+pipeline_metrics = PipelineMetrics()
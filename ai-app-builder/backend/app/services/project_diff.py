@@ -0,0 +1,74 @@
+from typing import Dict, Any, List, Iterable
+import hashlib
+
+# Analysis fields that generation reads; lists are compared as sets
+SCALAR_FIELDS = ("project_type",)
+LIST_FIELDS = ("features", "integrations")
+STACK_KINDS = ("frontend", "backend", "database")
+
+
+def content_hash(content: str) -> str:
+    """sha256 of a file's content, as stored in change manifests."""
+    return hashlib.sha256((content or "").encode("utf-8", errors="replace")).hexdigest()
+
+
+def _as_set(value: Any) -> set:
+    if not isinstance(value, (list, tuple, set)):
+        return set()
+    return {str(item) for item in value}
+
+
+def diff_analysis(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    The generation inputs that differ between two analyses.
+
+    Keys are field names, with "tech_stack.frontend" and so on for the stack.
+    Scalars map to {"from", "to"}, lists to {"added", "removed"}.
+    """
+    changes: Dict[str, Dict[str, Any]] = {}
+    for field in SCALAR_FIELDS:
+        if old.get(field) != new.get(field):
+            changes[field] = {"from": old.get(field), "to": new.get(field)}
+    for field in LIST_FIELDS:
+        before, after = _as_set(old.get(field)), _as_set(new.get(field))
+        if before != after:
+            changes[field] = {"added": sorted(after - before), "removed": sorted(before - after)}
+    old_stack, new_stack = old.get("tech_stack") or {}, new.get("tech_stack") or {}
+    for kind in STACK_KINDS:
+        if old_stack.get(kind) != new_stack.get(kind):
+            changes[f"tech_stack.{kind}"] = {"from": old_stack.get(kind), "to": new_stack.get(kind)}
+    return changes
+
+
+def build_manifest(
+    current_hashes: Dict[str, str],
+    old_files: Iterable[str],
+    new_files: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Compare regenerated files with what the project currently holds.
+
+    current_hashes: path -> content hash of the project's stored files.
+    old_files: paths the regenerated stages produced for the previous analysis;
+        those the new analysis no longer produces are removed.
+    new_files: path -> content the regenerated stages produce now.
+
+    Returns "changed" (path, sha256, size and status "added" or "modified" for
+    every file that has to be written), "removed" (paths to delete) and the
+    number of regenerated files whose content did not change.
+    """
+    changed: List[Dict[str, Any]] = []
+    unchanged = 0
+    for path, content in sorted(new_files.items()):
+        sha = content_hash(content)
+        if current_hashes.get(path) == sha:
+            unchanged += 1
+            continue
+        changed.append({
+            "path": path,
+            "sha256": sha,
+            "size": len(content or ""),
+            "status": "modified" if path in current_hashes else "added"
+        })
+    removed = sorted(path for path in set(old_files) if path not in new_files and path in current_hashes)
+    return {"changed": changed, "removed": removed, "unchanged": unchanged}
@@ -0,0 +1,152 @@
+from typing import Dict, List, AsyncIterator, Awaitable, Callable, Optional, Tuple
+import os
+from pathlib import Path
+from sqlalchemy.orm import Session
+from app.models.project_file import ProjectFile
+from app.services.project_index import project_index
+from app.services.project_diff import content_hash
+
+# Rows are committed every this many files: files saved so far become visible
+# to other requests, and the session releases their content
+COMMIT_EVERY = 20
+# The database keeps at most this many characters of a file; the full content is on disk
+MAX_STORED_CONTENT = 65535
+
+
+def project_directory(project_id: int) -> Path:
+    return Path(f"generated_projects/project_{project_id}")
+
+
+async def iter_files(files: Dict[str, str]) -> AsyncIterator[Tuple[str, str]]:
+    """A files dict as a (path, content) stream."""
+    for path, content in files.items():
+        yield path, content
+
+
+def stored_content_hashes(project_id: int, db: Session) -> Dict[str, str]:
+    """
+    path -> content hash of a project's saved files, over their full content: read
+    from disk, or from the database when the file is missing on disk and was short
+    enough to be stored whole. Other files get no hash and count as changed.
+    """
+    project_dir = project_directory(project_id)
+    hashes: Dict[str, str] = {}
+    from_database = []
+    for file_path, file_size in db.query(ProjectFile.file_path, ProjectFile.file_size).filter(
+        ProjectFile.project_id == project_id
+    ).all():
+        try:
+            with open(project_dir / file_path, 'r', encoding='utf-8') as f:
+                hashes[file_path] = content_hash(f.read())
+        except (OSError, UnicodeDecodeError):
+            if (file_size or 0) <= MAX_STORED_CONTENT:
+                from_database.append(file_path)
+    if from_database:
+        for file_path, content in db.query(ProjectFile.file_path, ProjectFile.file_content).filter(
+            ProjectFile.project_id == project_id,
+            ProjectFile.file_path.in_(from_database)
+        ).all():
+            hashes[file_path] = content_hash(content)
+    return hashes
+
+
+def delete_project_files(project_id: int, paths: List[str], db: Session):
+    """Delete files from a project: database rows, files on disk and the chat retrieval index."""
+    if not paths:
+        return
+    project_dir = project_directory(project_id)
+    db.query(ProjectFile).filter(
+        ProjectFile.project_id == project_id,
+        ProjectFile.file_path.in_(paths)
+    ).delete(synchronize_session=False)
+    for file_path in paths:
+        (project_dir / file_path).unlink(missing_ok=True)
+    _commit(db)
+    project_index.remove_files(project_id, paths)
+
+
+def _commit(db: Session):
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise Exception(f"Failed to save files to database: {str(e)}")
+
+
+async def save_project_file_stream(
+    project_id: int,
+    files: AsyncIterator[Tuple[str, str]],
+    db: Session,
+    replace: bool = True,
+    on_file: Optional[Callable[[str, int, int], Awaitable[None]]] = None
+) -> Tuple[str, int]:
+    """
+    Save project files to disk and database as they arrive from the stream.
+
+    Each file is written, added to the database and indexed for chat retrieval
+    as soon as it is received, and on_file(path, size, files saved so far) is
+    awaited after it. Existing files with the same path are updated. With
+    replace=True the project's other files are deleted once the stream has
+    finished, so a generation that fails partway leaves the previous files
+    in place. Returns the absolute project directory and the number of files saved.
+    """
+    project_dir = project_directory(project_id)
+    project_dir.mkdir(parents=True, exist_ok=True)
+
+    # Paths the project already has, without loading their content
+    existing: Dict[str, int] = dict(
+        db.query(ProjectFile.file_path, ProjectFile.id).filter(ProjectFile.project_id == project_id).all()
+    )
+    records: Dict[str, ProjectFile] = {}
+    uncommitted = 0
+    try:
+        async for file_path, content in files:
+            content = content or ""
+            try:
+                full_path = project_dir / file_path
+                full_path.parent.mkdir(parents=True, exist_ok=True)
+
+                # Write file to disk
+                with open(full_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+
+                # Save file info to database
+                record = records.get(file_path)
+                if record is None and file_path in existing:
+                    record = db.get(ProjectFile, existing[file_path])
+                if record is None:
+                    record = ProjectFile(
+                        project_id=project_id,
+                        file_path=file_path,
+                        file_name=os.path.basename(file_path),
+                        file_type=os.path.splitext(file_path)[1][1:] if '.' in file_path else ''
+                    )
+                    db.add(record)
+                record.file_content = content[:MAX_STORED_CONTENT]  # Limit content size for database
+                record.file_size = len(content)
+                records[file_path] = record
+
+                # Update the chat retrieval index; unchanged content is not re-indexed
+                project_index.index_files(project_id, {file_path: content})
+            except Exception as e:
+                print(f"Error saving file {file_path}: {str(e)}")
+                # Continue with other files even if one fails
+                continue
+
+            uncommitted += 1
+            if uncommitted >= COMMIT_EVERY:
+                _commit(db)
+                uncommitted = 0
+            if on_file is not None:
+                await on_file(file_path, len(content), len(records))
+    finally:
+        # Stops the generation behind the stream if saving was cancelled or failed
+        aclose = getattr(files, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    _commit(db)
+    if replace:
+        delete_project_files(project_id, [path for path in existing if path not in records], db)
+
+    return str(project_dir.absolute()), len(records)
@@ -0,0 +1,259 @@
+from typing import Dict, Any, List, Optional, Set, Tuple
+from collections import Counter, OrderedDict
+import hashlib
+import math
+import re
+import threading
+from app.core.config import settings
+from app.models.project import Project
+from app.models.project_file import ProjectFile
+
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "how", "i", "in", "is",
+    "it", "me", "my", "of", "on", "or", "the", "this", "to", "what", "where", "which", "why", "with", "you"
+))
+# Generated files that only add noise to retrieval
+_SKIPPED_FILES = ("package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms; identifiers also yield their camelCase / snake_case parts."""
+    terms = []
+    for word in _WORD.findall(text):
+        lowered = word.lower()
+        if lowered not in _STOPWORDS:
+            terms.append(lowered)
+        parts = [part.lower() for piece in word.split("_") for part in _CAMEL.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(part for part in parts if part not in _STOPWORDS)
+    return terms
+
+
+class _Chunk:
+    __slots__ = ("file_path", "start_line", "end_line", "text", "length")
+
+    def __init__(self, file_path: str, start_line: int, end_line: int, text: str, length: int):
+        self.file_path = file_path
+        self.start_line = start_line
+        self.end_line = end_line
+        self.text = text
+        self.length = length
+
+
+class ProjectIndex:
+    """
+    BM25 inverted index over one project's files, split into chunks of lines.
+
+    Files are added, replaced and removed individually: a file's chunks are
+    dropped from the postings and re-added, and a file whose content hash is
+    unchanged is skipped.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, chunk_lines: int = 40):
+        self.chunk_lines = chunk_lines
+        self._chunks: Dict[int, _Chunk] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._files: Dict[str, Tuple[str, List[int], Set[str]]] = {}  # path -> (content hash, chunk ids, terms)
+        self._next_id = 0
+        self._total_length = 0
+
+    def _chunk(self, file_path: str, content: str) -> List[Tuple[int, int, str]]:
+        lines = content.splitlines()
+        chunks = []
+        for start in range(0, len(lines), self.chunk_lines):
+            text = "\n".join(lines[start:start + self.chunk_lines])
+            if text.strip():
+                chunks.append((start + 1, min(start + self.chunk_lines, len(lines)), text))
+        return chunks
+
+    def remove_file(self, file_path: str):
+        entry = self._files.pop(file_path, None)
+        if entry is None:
+            return
+        for chunk_id in entry[1]:
+            chunk = self._chunks.pop(chunk_id)
+            self._total_length -= chunk.length
+        # Only the file's own terms can point at its chunks
+        for term in entry[2]:
+            postings = self._postings[term]
+            for chunk_id in entry[1]:
+                postings.pop(chunk_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def add_file(self, file_path: str, content: str) -> bool:
+        """Index (or re-index) a file. Returns False when the content was already indexed."""
+        content = content or ""
+        digest = hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
+        existing = self._files.get(file_path)
+        if existing is not None and existing[0] == digest:
+            return False
+        self.remove_file(file_path)
+
+        chunk_ids = []
+        file_terms: Set[str] = set()
+        if "\x00" not in content and not file_path.endswith(_SKIPPED_FILES):
+            # Path terms go into every chunk so "the login component" finds Login.jsx
+            path_terms = tokenize(file_path.replace("/", " ").replace(".", " "))
+            for start_line, end_line, text in self._chunk(file_path, content):
+                terms = tokenize(text) + path_terms
+                chunk_id = self._next_id
+                self._next_id += 1
+                self._chunks[chunk_id] = _Chunk(file_path, start_line, end_line, text, len(terms))
+                self._total_length += len(terms)
+                for term, count in Counter(terms).items():
+                    self._postings.setdefault(term, {})[chunk_id] = count
+                    file_terms.add(term)
+                chunk_ids.append(chunk_id)
+        self._files[file_path] = (digest, chunk_ids, file_terms)
+        return True
+
+    def search(self, query: str, k: int = 4) -> List[Dict[str, Any]]:
+        """The k best-scoring chunks for query, best first."""
+        if not self._chunks:
+            return []
+        total_chunks = len(self._chunks)
+        average_length = self._total_length / total_chunks or 1.0
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total_chunks - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, frequency in postings.items():
+                length_norm = 1 - self.B + self.B * self._chunks[chunk_id].length / average_length
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * frequency * (self.K1 + 1) / (frequency + self.K1 * length_norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            {
+                "file_path": self._chunks[chunk_id].file_path,
+                "start_line": self._chunks[chunk_id].start_line,
+                "end_line": self._chunks[chunk_id].end_line,
+                "score": round(score, 3),
+                "text": self._chunks[chunk_id].text
+            }
+            for chunk_id, score in best
+        ]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"files": len(self._files), "chunks": len(self._chunks), "terms": len(self._postings)}
+
+
+class ProjectIndexRegistry:
+    """
+    Per-project BM25 indexes, kept in memory for the most recently used projects.
+
+    Indexes are updated when project files are saved; a project that is not in
+    memory (after a restart, or on another worker) is rebuilt from its
+    ProjectFile rows the first time a chat asks about it.
+    """
+
+    def __init__(self, max_projects: int = 100, chunk_lines: int = 40):
+        self.max_projects = max_projects
+        self.chunk_lines = chunk_lines
+        self._indexes: "OrderedDict[int, ProjectIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "builds": 0,
+            "files_indexed": 0,
+            "files_unchanged": 0,
+            "searches": 0,
+            "evictions": 0
+        }
+
+    def _index(self, project_id: int, create: bool = True) -> Optional[ProjectIndex]:
+        index = self._indexes.get(project_id)
+        if index is None and create:
+            index = self._indexes[project_id] = ProjectIndex(self.chunk_lines)
+            while len(self._indexes) > self.max_projects:
+                self._indexes.popitem(last=False)
+                self.stats["evictions"] += 1
+        if index is not None:
+            self._indexes.move_to_end(project_id)
+        return index
+
+    def index_files(self, project_id: int, files: Dict[str, str], replace: bool = False):
+        """Add or update files; with replace=True, files not in `files` are removed."""
+        with self._lock:
+            index = self._index(project_id)
+            if replace:
+                for file_path in set(index._files) - set(files):
+                    index.remove_file(file_path)
+            for file_path, content in files.items():
+                if index.add_file(file_path, content):
+                    self.stats["files_indexed"] += 1
+                else:
+                    self.stats["files_unchanged"] += 1
+
+    def remove_files(self, project_id: int, file_paths: List[str]):
+        with self._lock:
+            index = self._index(project_id, create=False)
+            if index is not None:
+                for file_path in file_paths:
+                    index.remove_file(file_path)
+
+    def drop(self, project_id: int):
+        with self._lock:
+            self._indexes.pop(project_id, None)
+
+    def ensure(self, project_id: int, db) -> bool:
+        """Make sure the project is indexed, building it from the database if needed."""
+        if project_id in self._indexes:
+            return True
+        rows = db.query(ProjectFile.file_path, ProjectFile.file_content).filter(ProjectFile.project_id == project_id).all()
+        if not rows:
+            return False
+        self.index_files(project_id, {file_path: content or "" for file_path, content in rows}, replace=True)
+        self.stats["builds"] += 1
+        return True
+
+    def load_for_user(self, project_id: Any, owner_id: int, db) -> Optional[int]:
+        """
+        Index a project for retrieval if it belongs to owner_id.
+        Returns the project id, or None when the id is invalid, not theirs or has no files.
+        """
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            return None
+        owned = db.query(Project.id).filter(Project.id == project_id, Project.owner_id == owner_id).first()
+        if owned is None:
+            return None
+        return project_id if self.ensure(project_id, db) else None
+
+    def search(self, project_id: int, query: str, k: int = 4) -> List[Dict[str, Any]]:
+        with self._lock:
+            index = self._index(project_id, create=False)
+            self.stats["searches"] += 1
+            return index.search(query, k) if index is not None else []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "projects": len(self._indexes),
+            "max_projects": self.max_projects,
+            "chunks": sum(len(index._chunks) for index in self._indexes.values())
+        }
+
+
+def format_snippets(snippets: List[Dict[str, Any]], max_chars: int = 1500) -> str:
+    """Prompt text for retrieved snippets, each headed by its file and line range."""
+    blocks = []
+    for snippet in snippets:
+        text = snippet["text"]
+        if len(text) > max_chars:
+            text = text[:max_chars] + "\n..."
+        blocks.append(f"--- {snippet['file_path']} (lines {snippet['start_line']}-{snippet['end_line']})\n{text}")
+    return "\n\n".join(blocks)
+
+
+# Global index registry shared by the API routers and the AI agent
+project_index = ProjectIndexRegistry(
+    max_projects=settings.PROJECT_INDEX_MAX_PROJECTS,
+    chunk_lines=settings.PROJECT_INDEX_CHUNK_LINES
+)
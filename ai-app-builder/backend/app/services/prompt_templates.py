@@ -0,0 +1,266 @@
+from typing import Dict, Any, List, Union
+import hashlib
+import re
+import textwrap
+from app.core.config import settings
+from app.services.token_budget import estimate_tokens
+
+# OpenRouter model families that honour cache_control breakpoints on content parts.
+# OpenAI, DeepSeek and Gemini 2.5 models cache identical prefixes automatically.
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/gemini")
+
+
+class SystemPrompt(str):
+    """
+    A rendered system prompt. It is a plain string everywhere it travels (cache keys,
+    token estimates, logging), but remembers its static prefix so providers can mark
+    it cacheable.
+    """
+
+    static_prefix: str = ""
+    volatile_tail: str = ""
+
+    def __new__(cls, static_prefix: str, volatile_tail: str = ""):
+        text = static_prefix + ("\n\n" + volatile_tail if volatile_tail else "")
+        prompt = super().__new__(cls, text)
+        prompt.static_prefix = static_prefix
+        prompt.volatile_tail = volatile_tail
+        return prompt
+
+
+class PromptTemplate:
+    """
+    A system prompt compiled once: a byte-stable static prefix (instructions)
+    followed by a tail format string for the parts that change per call
+    (date, history, stack). Keeping the volatile parts last lets providers
+    reuse the cached prefix across calls.
+    """
+
+    def __init__(self, name: str, static: str, tail: str = ""):
+        self.name = name
+        self.static = textwrap.dedent(static).strip()
+        self.tail = textwrap.dedent(tail).strip()
+        self.prefix_hash = hashlib.sha256(self.static.encode("utf-8")).hexdigest()[:12]
+        self.prefix_tokens = estimate_tokens(self.static)
+        self.renders = 0
+
+    def requested_keys(self) -> List[str]:
+        """JSON keys named on the numbered lines of the instructions ('1. "project_type": ...'), nested objects aside."""
+        keys: List[str] = []
+        for line in self.static.splitlines():
+            if re.match(r"\s*\d+\.\s", line):
+                for key in re.findall(r'"(\w+)"', re.sub(r"\{[^}]*\}", "", line)):
+                    if key not in keys:
+                        keys.append(key)
+        return keys
+
+    def render(self, **values: Any) -> SystemPrompt:
+        self.renders += 1
+        return SystemPrompt(self.static, self.tail.format(**values) if self.tail else "")
+
+
+class PromptTemplateRegistry:
+    """Named prompt templates plus counters of how much of the prompts providers served from cache."""
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+        self.cache_usage: Dict[str, Dict[str, int]] = {}
+
+    def register(self, name: str, static: str, tail: str = "") -> PromptTemplate:
+        template = PromptTemplate(name, static, tail)
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        return self._templates[name]
+
+    def render(self, name: str, **values: Any) -> SystemPrompt:
+        return self._templates[name].render(**values)
+
+    def record_usage(self, provider: str, prompt_tokens: int, cached_tokens: int):
+        """Record the prompt tokens a provider reported and how many of them were cache hits."""
+        usage = self.cache_usage.setdefault(provider, {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0})
+        usage["requests"] += 1
+        usage["prompt_tokens"] += int(prompt_tokens or 0)
+        usage["cached_tokens"] += int(cached_tokens or 0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        providers = {}
+        for provider, usage in self.cache_usage.items():
+            hit_rate = usage["cached_tokens"] / usage["prompt_tokens"] if usage["prompt_tokens"] else 0.0
+            providers[provider] = {**usage, "cached_ratio": round(hit_rate, 4)}
+        return {
+            "templates": {
+                name: {"prefix_hash": template.prefix_hash, "prefix_tokens": template.prefix_tokens, "renders": template.renders}
+                for name, template in self._templates.items()
+            },
+            "provider_cache": providers
+        }
+
+
+def supports_cache_control(model: str) -> bool:
+    return settings.LLM_PROMPT_CACHE_HINTS and (model or "").startswith(CACHE_CONTROL_MODEL_PREFIXES)
+
+
+def system_message_content(system_prompt: str, cache_control: bool) -> Union[str, List[Dict[str, Any]]]:
+    """
+    OpenAI-style system message content. With cache_control, a SystemPrompt is sent
+    as two text parts and the static one carries an ephemeral cache breakpoint.
+    """
+    prefix = getattr(system_prompt, "static_prefix", "")
+    if not cache_control or not prefix:
+        return str(system_prompt)
+    parts: List[Dict[str, Any]] = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+    if system_prompt.volatile_tail:
+        parts.append({"type": "text", "text": system_prompt.volatile_tail})
+    return parts
+
+
+def system_instruction_parts(system_prompt: str) -> List[Dict[str, str]]:
+    """Gemini systemInstruction parts; the static prefix stays a separate, identical first part."""
+    prefix = getattr(system_prompt, "static_prefix", "")
+    if not prefix:
+        return [{"text": str(system_prompt)}]
+    parts = [{"text": prefix}]
+    if system_prompt.volatile_tail:
+        parts.append({"text": system_prompt.volatile_tail})
+    return parts
+
+
+# Global template registry
+prompt_templates = PromptTemplateRegistry()
+
+prompt_templates.register(
+    "chat",
+    """
+    You are an expert AI assistant and a senior software engineer helping users build applications.
+    Your primary goal is to provide direct, actionable, and complete solutions.
+
+    When a user asks for code, provide complete, production-ready code snippets or entire files. Do not provide samples or incomplete examples. The code should be fully functional and ready to be used in a project.
+
+    Provide helpful, concise responses about:
+    1. Application architecture and design
+    2. **Complete Code Generation**: When asked for code, generate the full file or a complete, working snippet.
+    3. Technology stack recommendations
+    4. Troubleshooting and debugging
+    5. Deployment strategies
+    6. Project planning and management
+    7. UI/UX design principles
+    8. Security considerations
+    9. Performance optimization
+    10. Testing strategies
+    11. Code review and quality assurance
+    12. Documentation and maintenance
+
+    Be friendly, professional, and focused on helping the user build their application.
+    Always provide actionable advice and specific examples when relevant.
+    If you don't know something, be honest and suggest alternatives or ways to find the information.
+    """,
+    """
+    Your Capabilities: {capabilities}
+    Current Date and Time: {current_datetime} ({day_of_week})
+
+    Previous conversation history:
+    {conversation_history}
+    """
+)
+
+prompt_templates.register(
+    "code",
+    """
+    You are an expert developer generating clean, modern code based on descriptions.
+    Follow these guidelines:
+    1. Use modern best practices and design patterns
+    2. Include proper error handling
+    3. Write clean, readable, well-commented code
+    4. Follow the requested technology stack
+    5. Include proper imports and dependencies
+    6. Make code modular and reusable
+    7. Include example usage when relevant
+    8. Add security considerations
+    9. Optimize for performance
+    10. Include testing considerations
+    11. Follow accessibility standards
+    12. Include documentation comments
+
+    Return only the generated code without explanations.
+    """,
+    """
+    Technology Stack: {frontend} (Frontend), {backend} (Backend), {database} (Database)
+    Current Date: {current_date} ({day_of_week})
+    """
+)
+
+prompt_templates.register(
+    "explain",
+    """
+    You are an expert software engineer explaining technical concepts.
+    Provide clear, concise explanations that:
+    1. Are easy to understand for developers of all levels
+    2. Include practical examples when relevant
+    3. Mention common use cases and best practices
+    4. Highlight potential pitfalls or gotchas
+    5. Use analogies when helpful
+    6. Include code examples when appropriate
+    7. Mention related concepts
+    8. Provide learning resources
+    9. Explain trade-offs and alternatives
+    10. Include real-world applications
+    11. Include relevant statistics, benchmarks, or data when applicable
+    12. Reference industry standards and best practices
+
+    Keep explanations focused and actionable.
+    """,
+    """
+    Current Date: {current_date} ({day_of_week})
+    """
+)
+
+prompt_templates.register(
+    "analysis",
+    """
+    You are an expert AI agent that analyzes user requests to build applications.
+    Return a single JSON object with these keys, in this order:
+    1. "project_type": one of web_app, mobile_app, dashboard, ecommerce, blog, crm, chat, api
+    2. "features": list of required features
+    3. "integrations": list of external APIs or services needed
+    4. "tech_stack": {"frontend": ..., "backend": ..., "database": ...} using lowercase names such as react, fastapi, mysql
+    5. "description": one sentence summary of the application
+    6. "database_schema": main entities and relations
+    7. "deployment": deployment strategy
+    8. "security_considerations": list
+    9. "performance_requirements": short description
+    10. "scalability": short description
+    11. "complexity": low, medium or high, and "estimated_time"
+
+    Return only valid JSON.
+    """
+)
+
+prompt_templates.register(
+    "modification",
+    """
+    You update the specification of an existing application after a change request.
+    You receive the current analysis as JSON and the requested change.
+    Return a single JSON object with the keys "project_type", "features",
+    "integrations", "tech_stack" and "description", changed only as far as the
+    request requires; keep every other value exactly as it is.
+    "tech_stack" uses lowercase names such as react, fastapi, mysql.
+
+    Return only valid JSON.
+    """
+)
+
+prompt_templates.register(
+    "summary",
+    """
+    You maintain the running summary of a conversation between a user and an AI assistant
+    that helps build applications. Merge the previous summary with the new messages into
+    one updated summary of at most 200 words.
+    Keep: the user's goals and requirements, decisions made, chosen technologies, names of
+    files, endpoints and entities, and open questions.
+    Drop: greetings, repetition and the bodies of code blocks (mention what the code does instead).
+
+    Return only the summary text.
+    """
+)
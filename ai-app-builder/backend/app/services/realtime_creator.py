@@ -1,37 +1,68 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Awaitable, Callable
 from datetime import datetime
 import asyncio
+import json
 from fastapi import WebSocket
 from sqlalchemy.orm import Session
-from app.models.project import Project, ProjectStatus
+from app.models.project import Project, ProjectStatus, ProjectType
+from app.services.ai_agent import AIAgentService, get_ai_agent
+from app.services.pipeline_engine import Pipeline, Stage
+from app.services.project_files import save_project_file_stream, iter_files
+from app.services.prompt_templates import prompt_templates
+
+# Generated files are reported by the step owning their path prefix; the deployment step reports the rest
+FILE_STEPS = (("frontend/", "frontend"), ("backend/", "backend"), ("database/", "database"))
+REPORTING_STEPS = tuple(step_id for _, step_id in FILE_STEPS) + ("deployment",)
+
 
 class ProjectProgressStep:
     """Represents a step in the project creation process."""
     
-    def __init__(self, id: str, name: str, description: str, weight: float = 1.0):
+    def __init__(self, id: str, name: str, description: str, weight: float = 1.0, depends_on: tuple = ()):
         self.id = id
         self.name = name
         self.description = description
         self.weight = weight
+        self.depends_on = depends_on
 
 class RealTimeProjectCreator:
     """Manages real-time project creation with progress updates."""
     
-    def __init__(self):
-        # Define creation steps with weights for progress calculation
+    def __init__(self, ai_agent: Optional[AIAgentService] = None):
+        self.ai_agent = ai_agent or get_ai_agent()
+        
+        # Define creation steps with weights for progress calculation and the steps each one waits for
+        generated = ("frontend", "backend", "database")
         self.creation_steps = [
             ProjectProgressStep("analyze", "Analyze Requirements", "Analyzing project requirements and specifications", 1.0),
-            ProjectProgressStep("plan", "Create Project Plan", "Creating detailed project plan and architecture", 1.5),
-            ProjectProgressStep("frontend", "Generate Frontend", "Generating frontend components and UI", 2.0),
-            ProjectProgressStep("backend", "Generate Backend", "Generating backend APIs and services", 2.0),
-            ProjectProgressStep("database", "Setup Database", "Setting up database schema and migrations", 1.5),
-            ProjectProgressStep("integration", "Integrate Services", "Integrating frontend and backend services", 1.5),
-            ProjectProgressStep("testing", "Generate Tests", "Generating test files and test suites", 1.0),
-            ProjectProgressStep("optimization", "Optimize Code", "Optimizing generated code for performance", 1.0),
-            ProjectProgressStep("deployment", "Prepare Deployment", "Preparing deployment configurations", 1.0),
-            ProjectProgressStep("finalize", "Finalize Project", "Finalizing project creation and packaging", 0.5)
+            ProjectProgressStep("plan", "Create Project Plan", "Creating detailed project plan and architecture", 1.5, ("analyze",)),
+            ProjectProgressStep("frontend", "Generate Frontend", "Generating frontend components and UI", 2.0, ("analyze",)),
+            ProjectProgressStep("backend", "Generate Backend", "Generating backend APIs and services", 2.0, ("analyze",)),
+            ProjectProgressStep("database", "Setup Database", "Setting up database schema and migrations", 1.5, ("analyze",)),
+            ProjectProgressStep("integration", "Integrate Services", "Integrating frontend and backend services", 1.5, ("frontend", "backend")),
+            ProjectProgressStep("testing", "Generate Tests", "Generating test files and test suites", 1.0, ("frontend", "backend")),
+            ProjectProgressStep("optimization", "Optimize Code", "Optimizing generated code for performance", 1.0, generated),
+            # Deployment takes every generated file the other steps left, so it runs after them
+            ProjectProgressStep("deployment", "Prepare Deployment", "Preparing deployment configurations", 1.0, generated),
+            ProjectProgressStep("finalize", "Finalize Project", "Finalizing project creation and packaging", 0.5,
+                                ("plan", "integration", "testing", "optimization", "deployment"))
         ]
         
+        # Steps run on the pipeline engine: independent steps (frontend, backend, database) run concurrently;
+        # once a session is cancelled the steps not yet started are skipped
+        self.creation_pipeline = Pipeline("realtime_creation", [
+            Stage(
+                step.id,
+                lambda context, _, index=index, step=step: self.execute_creation_step(
+                    context["session_id"], index, step, context["project_data"]
+                ),
+                depends_on=step.depends_on,
+                skip_if=lambda context, _: context["session_id"] not in self.creation_sessions,
+                default={}
+            )
+            for index, step in enumerate(self.creation_steps)
+        ])
+        
         # Store active creation sessions
         self.creation_sessions: Dict[str, Dict[str, Any]] = {}
     
@@ -84,7 +115,7 @@ class RealTimeProjectCreator:
         if session_id in self.creation_sessions:
             websocket = self.creation_sessions[session_id]["websocket"]
             try:
-                await websocket.send_text(data)
+                await websocket.send_text(json.dumps(data, default=str))
             except:
                 # If sending fails, disconnect the WebSocket
                 await self.disconnect_websocket(session_id)
@@ -119,19 +150,31 @@ class RealTimeProjectCreator:
             db.add(project)
             db.commit()
             db.refresh(project)
+            # Generated files are saved as they arrive, from the background generation
+            project_data["_project_id"] = project.id
+            project_data["_db"] = db
+            project_data["_saved_files"] = {}
+            project_data["_file_queues"] = {step_id: asyncio.Queue() for step_id in REPORTING_STEPS}
             
             # Execute creation steps with real-time updates
-            generated_files = {}
-            
-            for i, step in enumerate(self.creation_steps):
-                await self.execute_creation_step(session_id, i, step, project_data, generated_files)
-                
-                # Check if session was cancelled
-                if session_id not in self.creation_sessions:
-                    break
+            run = await self.creation_pipeline.run({"session_id": session_id, "project_data": project_data})
+            # Files the steps made themselves, as opposed to the ones generation already saved
+            unsaved_files = run.merged(step.id for step in self.creation_steps)
             
             # Update project status
             if session_id in self.creation_sessions:
+                if unsaved_files:
+                    await save_project_file_stream(
+                        project.id, iter_files(unsaved_files), db, replace=False,
+                        on_file=self._file_saved_callback(session_id, project_data)
+                    )
+                generated_files = project_data["_saved_files"]
+                
+                # The analysis may only have been completed by the analyze step
+                analysis = project_data.get("analysis") or analysis
+                project.description = analysis.get("description", "")
+                project.project_type = ProjectType(analysis.get("project_type", "web_app"))
+                project.features = analysis.get("features", [])
                 project.status = ProjectStatus.ACTIVE
                 project.project_path = f"generated_projects/project_{project.id}"
                 db.commit()
@@ -146,6 +189,7 @@ class RealTimeProjectCreator:
                         "created_at": project.created_at.isoformat()
                     },
                     "files_generated": len(generated_files),
+                    "step_timings": {name: round(ms, 1) for name, ms in run.timings.items()},
                     "message": f"🎉 {project_name} has been successfully created!",
                     "timestamp": datetime.now().isoformat()
                 })
@@ -175,6 +219,9 @@ class RealTimeProjectCreator:
         
         finally:
             # Clean up session
+            generation = project_data.pop("_generation", None)
+            if generation is not None and not generation.done():
+                generation.cancel()
             if session_id in self.creation_sessions:
                 del self.creation_sessions[session_id]
     
@@ -183,16 +230,19 @@ class RealTimeProjectCreator:
         session_id: str,
         step_index: int,
         step: ProjectProgressStep,
-        project_data: Dict[str, Any],
-        generated_files: Dict[str, str]
-    ):
-        """Execute a single creation step with progress updates."""
+        project_data: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """
+        Execute a single creation step with progress updates.
+        Returns the files it made that still have to be saved; generated files are saved as they arrive.
+        """
         # Update step status to active
         self.creation_sessions[session_id]["steps"][step_index]["status"] = "active"
         self.creation_sessions[session_id]["steps"][step_index]["start_time"] = datetime.now().isoformat()
         
         await self.send_progress_update(session_id)
         
+        generated_files = {}
         try:
             # Execute step based on its ID
             if step.id == "analyze":
@@ -227,6 +277,7 @@ class RealTimeProjectCreator:
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = 100.0
             
             await self.send_progress_update(session_id)
+            return generated_files
             
         except Exception as e:
             # Mark step as error
@@ -265,29 +316,162 @@ class RealTimeProjectCreator:
             "timestamp": datetime.now().isoformat()
         })
     
+    def _file_saved_callback(self, session_id: str, project_data: Dict[str, Any]):
+        """on_file callback for save_project_file_stream: records the file and sends a file_saved event."""
+        async def on_file(path: str, size: int, files_saved: int):
+            project_data["_saved_files"][path] = size
+            await self.send_update(session_id, {
+                "type": "file_saved",
+                "path": path,
+                "size": size,
+                "files_saved": len(project_data["_saved_files"]),
+                "timestamp": datetime.now().isoformat()
+            })
+        return on_file
+    
+    @staticmethod
+    def _file_step(path: str) -> str:
+        for prefix, step_id in FILE_STEPS:
+            if path.startswith(prefix):
+                return step_id
+        return "deployment"
+    
+    async def _generate_and_save(
+        self,
+        session_id: str,
+        project_data: Dict[str, Any],
+        user_request: str = "",
+        on_event: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """
+        Generate the project and save every file as soon as it is generated, sending a
+        file_saved event for each and handing it to the step that reports it. With a
+        user_request the analysis is streamed first (see analyze_and_generate_stream).
+        Returns path -> size of the saved files.
+        """
+        project_name = project_data.get("name", "")
+        tech_stack = project_data.get("tech_stack") or None
+        queues = project_data["_file_queues"]
+        file_saved = self._file_saved_callback(session_id, project_data)
+        
+        async def on_file(path: str, size: int, files_saved: int):
+            await file_saved(path, size, files_saved)
+            queues[self._file_step(path)].put_nowait((path, size))
+        
+        analysis_task = None
+        try:
+            if user_request:
+                analysis_task, _, files = await self.ai_agent.analyze_and_generate_stream(
+                    user_request, project_name, tech_stack, on_event=on_event
+                )
+            else:
+                _, files = await self.ai_agent.generate_project_stream(project_data["analysis"], project_name, tech_stack)
+            await save_project_file_stream(project_data["_project_id"], files, project_data["_db"], on_file=on_file)
+            if analysis_task is not None:
+                await analysis_task
+        finally:
+            if analysis_task is not None and not analysis_task.done():
+                analysis_task.cancel()
+            # Tells the steps no more files are coming
+            for queue in queues.values():
+                queue.put_nowait(None)
+        return dict(project_data["_saved_files"])
+    
+    async def _report_generated_files(self, session_id: str, step_index: int, project_data: Dict[str, Any], step_id: str) -> bool:
+        """
+        Report the files the background generation saves for this step, each as soon as
+        it is saved, until generation ends. True when generation saved any files at all,
+        False when there was no generation or it produced nothing.
+        """
+        generation = project_data.get("_generation")
+        if generation is None:
+            return False
+        queue = project_data["_file_queues"][step_id]
+        files_generated = 0
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            files_generated += 1
+            if session_id not in self.creation_sessions:
+                continue
+            step = self.creation_sessions[session_id]["steps"][step_index]
+            # The total is only known once generation ends
+            step["progress"] = files_generated / (files_generated + 1) * 100
+            step["details"] = {"current_file": item[0], "files_generated": files_generated}
+            await self.send_progress_update(session_id)
+        await generation
+        return bool(project_data["_saved_files"])
+    
+    @staticmethod
+    async def _has_generated_files(project_data: Dict[str, Any]) -> bool:
+        """Wait for the background generation; True when it saved any files."""
+        generation = project_data.get("_generation")
+        return generation is not None and bool(await generation)
+    
     # Individual step implementations
     async def step_analyze_requirements(self, session_id: str, step_index: int, project_data: Dict[str, Any]):
-        """Step 1: Analyze project requirements."""
-        await asyncio.sleep(1)  # Simulate AI processing time
+        """
+        Step 1: Analyze project requirements.
+        Template generation is started in the background as early as possible: right away
+        when the client sent an analysis, otherwise as soon as the streamed analysis
+        contains every field generation reads. It saves each file as it is generated;
+        later steps report the files it saved.
+        """
+        user_request = project_data.get("request", "")
+        
+        if project_data.get("analysis"):
+            project_data["_generation"] = asyncio.create_task(self._generate_and_save(session_id, project_data))
+        elif user_request:
+            analysis_done = asyncio.Event()
+            expected_keys = set(prompt_templates.get("analysis").requested_keys())
+            
+            async def on_event(event: Dict[str, Any]):
+                if session_id not in self.creation_sessions:
+                    return
+                step = self.creation_sessions[session_id]["steps"][step_index]
+                if event["type"] == "partial":
+                    received = len(expected_keys.intersection(event["analysis"]))
+                    step["progress"] = min(95.0, received / max(1, len(expected_keys)) * 100)
+                    step["details"] = {"fields_received": list(event["analysis"].keys())}
+                    await self.send_update(session_id, {
+                        "type": "analysis_partial",
+                        "keys": event["keys"],
+                        "analysis": event["analysis"],
+                        "timestamp": datetime.now().isoformat()
+                    })
+                    await self.send_progress_update(session_id)
+                else:
+                    project_data["analysis"] = event["analysis"]
+                    analysis_done.set()
+            
+            generation = asyncio.create_task(
+                self._generate_and_save(session_id, project_data, user_request, on_event=on_event)
+            )
+            project_data["_generation"] = generation
+            # The step ends with the analysis; generation keeps running behind the next steps
+            done_waiter = asyncio.create_task(analysis_done.wait())
+            await asyncio.wait({generation, done_waiter}, return_when=asyncio.FIRST_COMPLETED)
+            done_waiter.cancel()
+            if generation.done() and generation.exception() is not None:
+                raise generation.exception()
+            return
         
         # Update step progress incrementally
         for progress in [25, 50, 75, 100]:
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.5)
     
     async def step_create_project_plan(self, session_id: str, step_index: int, project_data: Dict[str, Any]):
         """Step 2: Create detailed project plan."""
-        await asyncio.sleep(1.5)
-        
         for progress in [20, 40, 60, 80, 100]:
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.6)
     
     async def step_generate_frontend(self, session_id: str, step_index: int, project_data: Dict[str, Any]) -> Dict[str, str]:
         """Step 3: Generate frontend components."""
-        await asyncio.sleep(2)
+        if await self._report_generated_files(session_id, step_index, project_data, "frontend"):
+            return {}
         
         # Simulate file generation progress
         files = {}
@@ -305,13 +489,13 @@ class RealTimeProjectCreator:
             files[f"frontend/src/{component}"] = f"// Generated {component} content"
             
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.4)
         
         return files
     
     async def step_generate_backend(self, session_id: str, step_index: int, project_data: Dict[str, Any]) -> Dict[str, str]:
         """Step 4: Generate backend APIs."""
-        await asyncio.sleep(2)
+        if await self._report_generated_files(session_id, step_index, project_data, "backend"):
+            return {}
         
         files = {}
         endpoints = ["main.py", "models/user.py", "api/auth.py", "api/routes.py", "core/config.py"]
@@ -328,13 +512,13 @@ class RealTimeProjectCreator:
             files[f"backend/{endpoint}"] = f"# Generated {endpoint} content"
             
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.4)
         
         return files
     
     async def step_setup_database(self, session_id: str, step_index: int, project_data: Dict[str, Any]) -> Dict[str, str]:
         """Step 5: Setup database schema."""
-        await asyncio.sleep(1.5)
+        if await self._report_generated_files(session_id, step_index, project_data, "database"):
+            return {}
         
         files = {
             "database/init.sql": "-- Database initialization script",
@@ -346,22 +530,22 @@ class RealTimeProjectCreator:
             progress = (i / 5) * 100
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.3)
         
         return files
     
     async def step_integrate_services(self, session_id: str, step_index: int, project_data: Dict[str, Any]):
         """Step 6: Integrate frontend and backend."""
-        await asyncio.sleep(1.5)
-        
         for progress in [25, 50, 75, 100]:
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.5)
     
     async def step_generate_tests(self, session_id: str, step_index: int, project_data: Dict[str, Any]) -> Dict[str, str]:
         """Step 7: Generate test files."""
-        await asyncio.sleep(1)
+        # Generated projects carry their own tests; the placeholders are only for runs without generation
+        if await self._has_generated_files(project_data):
+            self.creation_sessions[session_id]["steps"][step_index]["progress"] = 100
+            await self.send_progress_update(session_id)
+            return {}
         
         files = {
             "frontend/src/tests/App.test.js": "// Frontend tests",
@@ -373,14 +557,11 @@ class RealTimeProjectCreator:
             progress = (i / 3) * 100
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.4)
         
         return files
     
     async def step_optimize_code(self, session_id: str, step_index: int, project_data: Dict[str, Any]):
         """Step 8: Optimize generated code."""
-        await asyncio.sleep(1)
-        
         optimizations = ["Code formatting", "Performance optimization", "Security review", "Best practices"]
         
         for i, opt in enumerate(optimizations):
@@ -388,11 +569,12 @@ class RealTimeProjectCreator:
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             self.creation_sessions[session_id]["steps"][step_index]["details"] = {"current_optimization": opt}
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.3)
     
     async def step_prepare_deployment(self, session_id: str, step_index: int, project_data: Dict[str, Any]) -> Dict[str, str]:
         """Step 9: Prepare deployment configurations."""
-        await asyncio.sleep(1)
+        # Whatever generation produced outside frontend/backend/database (Docker, docs, ...)
+        if await self._report_generated_files(session_id, step_index, project_data, "deployment"):
+            return {}
         
         files = {
             "Dockerfile": "# Docker configuration",
@@ -405,14 +587,11 @@ class RealTimeProjectCreator:
             progress = (i / 4) * 100
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.3)
         
         return files
     
     async def step_finalize_project(self, session_id: str, step_index: int, project_data: Dict[str, Any]):
         """Step 10: Finalize project creation."""
-        await asyncio.sleep(0.5)
-        
         tasks = ["Final validation", "Generating README", "Creating documentation", "Project packaging"]
         
         for i, task in enumerate(tasks):
@@ -420,7 +599,6 @@ class RealTimeProjectCreator:
             self.creation_sessions[session_id]["steps"][step_index]["progress"] = progress
             self.creation_sessions[session_id]["steps"][step_index]["details"] = {"current_task": task}
             await self.send_progress_update(session_id)
-            await asyncio.sleep(0.2)
     
     async def cancel_creation(self, session_id: str):
         """Cancel an ongoing project creation."""
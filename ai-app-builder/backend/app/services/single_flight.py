@@ -0,0 +1,73 @@
+from typing import Dict, Any, Awaitable, Callable
+import asyncio
+
+
+class _Call:
+    """An in-flight call shared by every caller with the same key."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        self.abandoned = False
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent async calls.
+
+    The first caller for a key starts the work; callers that arrive while it is
+    still running await the same task instead of starting a duplicate. The
+    result (or exception) is delivered to every waiter. A waiter that gets
+    cancelled only stops waiting; the shared call is cancelled once no waiters
+    are left.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.stats = {
+            "calls": 0,
+            "coalesced": 0,
+            "cancelled": 0
+        }
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func() once per key among concurrent callers and return its result."""
+        call = self._calls.get(key)
+        # A call abandoned by its last waiter may still be winding down
+        if call is None or call.abandoned:
+            task = asyncio.ensure_future(func())
+            call = _Call(task)
+            self._calls[key] = call
+            task.add_done_callback(lambda _task, key=key, call=call: self._forget(key, call))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        call.waiters += 1
+        try:
+            # shield() so one waiter being cancelled does not cancel the shared task
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                # Last waiter gave up: nobody needs the result any more
+                call.abandoned = True
+                call.task.cancel()
+                self.stats["cancelled"] += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Retrieve the exception so an unawaited failure is not logged as "never retrieved"
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        return {**self.stats, "in_flight": len(self._calls)}
+
+
+# Global instance shared by all AI agent instances
+llm_single_flight = SingleFlight()
@@ -0,0 +1,186 @@
+from typing import Any, Dict, List, Optional, Tuple
+import json
+
+_CLOSERS = {"{": "}", "[": "]"}
+# How many cut points parse_partial_json tries before giving up
+_MAX_REPAIR_ATTEMPTS = 32
+
+
+def _json_start(text: str) -> int:
+    """Index of the first "{" or "[" (skips markdown fences and leading prose), -1 if none."""
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    return min(starts) if starts else -1
+
+
+def _scan(text: str) -> Tuple[bool, List[str], List[Tuple[int, str]]]:
+    """
+    Walk a (possibly truncated) JSON document.
+    Returns whether it ends inside a string, the open brackets, and the cut points:
+    positions where everything before is a complete prefix once brackets are closed.
+    """
+    stack: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    in_string = False
+    escape = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+            cuts.append((index + 1, "".join(stack)))
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                break
+            cuts.append((index + 1, "".join(stack)))
+        elif char == ",":
+            cuts.append((index, "".join(stack)))
+    return in_string, stack, cuts
+
+
+def _close(prefix: str, stack: str) -> str:
+    prefix = prefix.rstrip()
+    if prefix.endswith(","):
+        prefix = prefix[:-1]
+    return prefix + "".join(_CLOSERS[bracket] for bracket in reversed(stack))
+
+
+def repair_json(text: str) -> Optional[str]:
+    """
+    Turn truncated model output into parseable JSON.
+
+    Open strings are closed, a dangling comma, key or partial literal is dropped
+    and the open brackets are closed. Returns None when nothing usable is left.
+    """
+    start = _json_start(text)
+    if start < 0:
+        return None
+    body = text[start:]
+    in_string, stack, cuts = _scan(body)
+
+    candidates = [_close(body + ('"' if in_string else ""), "".join(stack))]
+    # Fall back to the last complete values: cut at a comma or just after a bracket
+    candidates += [_close(body[:cut], cut_stack) for cut, cut_stack in reversed(cuts[-_MAX_REPAIR_ATTEMPTS:])]
+    for candidate in candidates:
+        try:
+            json.loads(candidate)
+            return candidate
+        except ValueError:
+            continue
+    return None
+
+
+def parse_partial_json(text: str) -> Any:
+    """
+    Parse JSON from model output, tolerating markdown fences, prose around the
+    document and truncation. Returns None if no JSON value can be recovered.
+    """
+    start = _json_start(text or "")
+    if start < 0:
+        return None
+    try:
+        # raw_decode ignores whatever follows the document (closing fences, notes)
+        value, _ = json.JSONDecoder().raw_decode(text[start:])
+        return value
+    except ValueError:
+        pass
+    repaired = repair_json(text)
+    return json.loads(repaired) if repaired is not None else None
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for a JSON object that arrives in chunks.
+
+    feed() only scans the new characters and parses each top-level field once its
+    value is complete, so callers can act on early fields (project_type, tech_stack)
+    while the rest is still streaming. Partial values are never exposed.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a chunk; returns the top-level keys whose values completed with it."""
+        self.text += chunk
+        completed = []
+        text = self.text
+        for index in range(self._pos, len(text)):
+            if self.complete:
+                break
+            char = text[index]
+            if self._start < 0:
+                if char == "{":
+                    self._start = index
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        try:
+                            self._key = json.loads(text[self._string_start:index + 1])
+                        except ValueError:
+                            self._key = None
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_field(index, completed)
+                    self.complete = True
+            elif self._depth == 1 and char == ":":
+                self._expect_key = False
+                self._value_start = index + 1
+            elif self._depth == 1 and char == ",":
+                self._finish_field(index, completed)
+        self._pos = len(text)
+        return completed
+
+    def _finish_field(self, end: int, completed: List[str]):
+        if self._key is not None and self._value_start is not None:
+            raw = self.text[self._value_start:end].strip()
+            try:
+                self.fields[self._key] = json.loads(raw)
+                completed.append(self._key)
+            except ValueError:
+                pass
+        self._key = None
+        self._value_start = None
+        self._expect_key = True
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """Final result: the whole document, repaired if the stream was cut short."""
+        value = parse_partial_json(self.text)
+        if isinstance(value, dict):
+            return value
+        return dict(self.fields) if self.fields else None
@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional, Tuple
+import math
+from app.core.config import settings
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # tiktoken is optional; fall back to a character/word heuristic
+    _ENCODING = None
+
+
+# Context windows (prompt + completion tokens) of the models we route to
+MODEL_CONTEXT_WINDOWS = {
+    "mistralai/mistral-7b-instruct": 32768,
+    "deepseek-chat": 65536,
+    "deepseek-coder": 16384,
+    "gemini-1.5-pro-latest": 1048576
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Completion budget per endpoint: how long a useful answer usually is
+ENDPOINT_MAX_TOKENS = {
+    "chat": 2000,
+    "explain": 2000,
+    "analysis": 1200,
+    "next_steps": 600,
+    "summary": 400,
+    "code": 4000,
+    "debug": 3000,
+    "optimize": 4000,
+    "security": 3000,
+    "architecture": 3000,
+    "documentation": 8000,
+    "improvements": 2500,
+    "default": 4000
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (exact with tiktoken, heuristic otherwise)."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    # ~4 characters per token for English prose, more tokens for dense code/JSON
+    return max(math.ceil(len(text) / 4), math.ceil(len(text.split()) * 1.3))
+
+
+class PromptSection:
+    """
+    One named part of a prompt.
+
+    priority: higher values are kept longest; required sections are never trimmed.
+    trim: "head" drops the oldest lines first (history), "tail" cuts from the end (context dumps).
+    """
+
+    def __init__(self, name: str, text: str, priority: int = 0, required: bool = False, trim: str = "tail"):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.required = required
+        self.trim = trim
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def shrink_to(self, max_tokens: int):
+        """Cut the section down to roughly max_tokens, marking what was dropped."""
+        if max_tokens <= 0:
+            self.text = ""
+            return
+        if self.tokens <= max_tokens:
+            return
+        if self.trim == "head":
+            lines = self.text.splitlines()
+            dropped = 0
+            while lines and estimate_tokens("\n".join(lines)) > max_tokens:
+                lines.pop(0)
+                dropped += 1
+            kept = "\n".join(lines)
+            self.text = f"[{dropped} earlier lines omitted]\n{kept}" if kept else ""
+        else:
+            ratio = max_tokens / max(1, self.tokens)
+            cut = max(0, int(len(self.text) * ratio) - 40)
+            self.text = self.text[:cut] + "\n... [truncated]" if cut else ""
+
+
+class TokenBudgetManager:
+    """
+    Sizes prompts against the model's context window.
+
+    The prompt gets whatever is left after reserving the endpoint's completion budget
+    (capped by LLM_MAX_PROMPT_TOKENS); when sections do not fit, the lowest-priority
+    ones are trimmed first. max_tokens is then set from the room actually left.
+    """
+
+    def __init__(self, max_prompt_tokens: int = 6000, min_output_tokens: int = 256, safety_margin: int = 128):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.min_output_tokens = min_output_tokens
+        self.safety_margin = safety_margin
+
+    def context_window(self, model: Optional[str]) -> int:
+        return MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+
+    def output_target(self, endpoint: str) -> int:
+        return ENDPOINT_MAX_TOKENS.get(endpoint, ENDPOINT_MAX_TOKENS["default"])
+
+    def prompt_budget(self, endpoint: str, context_window: int) -> int:
+        """Tokens available for the prompt once the endpoint's answer is reserved."""
+        room = context_window - self.output_target(endpoint) - self.safety_margin
+        return max(self.min_output_tokens, min(self.max_prompt_tokens, room))
+
+    def max_tokens_for(self, endpoint: str, prompt_tokens: int, context_window: int) -> int:
+        """Completion budget: the endpoint target, shrunk if the prompt leaves less room."""
+        room = context_window - prompt_tokens - self.safety_margin
+        return max(self.min_output_tokens, min(self.output_target(endpoint), room))
+
+    def fit(
+        self,
+        sections: List[PromptSection],
+        endpoint: str,
+        context_window: int,
+        fixed_tokens: int = 0
+    ) -> List[PromptSection]:
+        """
+        Trim sections in place, lowest priority first, until they fit the prompt budget.
+        fixed_tokens accounts for prompt text outside the sections (instructions, templates).
+        """
+        budget = self.prompt_budget(endpoint, context_window) - fixed_tokens
+        total = sum(section.tokens for section in sections)
+        for section in sorted(sections, key=lambda s: s.priority):
+            if total <= budget:
+                break
+            if section.required:
+                continue
+            before = section.tokens
+            section.shrink_to(max(0, before - (total - budget)))
+            total -= before - section.tokens
+        return sections
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Hard cap for a single prompt, keeping its beginning."""
+        section = PromptSection("prompt", text, trim="tail")
+        section.shrink_to(max_tokens)
+        return section.text
+
+    def plan(self, endpoint: str, system_prompt: str, user_prompt: str, context_window: int) -> Tuple[str, int]:
+        """
+        Final check before a call: cap an oversized user prompt and pick max_tokens.
+        Returns (user_prompt, max_tokens).
+        """
+        system_tokens = estimate_tokens(system_prompt)
+        user_tokens = estimate_tokens(user_prompt)
+        limit = context_window - self.min_output_tokens - self.safety_margin - system_tokens
+        if user_tokens > limit:
+            print(f"Prompt for {endpoint} is {user_tokens} tokens, truncating to {limit}")
+            user_prompt = self.truncate(user_prompt, limit)
+            user_tokens = estimate_tokens(user_prompt)
+        return user_prompt, self.max_tokens_for(endpoint, system_tokens + user_tokens, context_window)
+
+
+# Global budget manager
+token_budget = TokenBudgetManager(
+    max_prompt_tokens=settings.LLM_MAX_PROMPT_TOKENS,
+    min_output_tokens=settings.LLM_MIN_OUTPUT_TOKENS
+)
@@ -0,0 +1,288 @@
+from typing import Dict, Any, List, Optional, Tuple
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+import asyncio
+from sqlalchemy import func, and_, case, insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app.core import database
+from app.core.config import settings
+from app.models.llm_usage import LLMUsage, LLMUsageHourly, LLMUsageDaily
+
+# Who the current request is for; set per HTTP request by the attribution middleware
+llm_usage_context: ContextVar[Dict[str, Any]] = ContextVar("llm_usage_context", default={})
+
+_ROLLUP_KEY = ("user_id", "endpoint", "provider", "model")
+# Stored in the rollup key columns for calls without a user or model
+_ROLLUP_SENTINELS = {"user_id": 0, "model": ""}
+# Rollup columns a batch adds to; max_latency_ms keeps the larger value instead
+_ROLLUP_SUMS = ("calls", "errors", "prompt_tokens", "completion_tokens", "cached_tokens", "total_latency_ms")
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class UsageLedger:
+    """
+    Records one row per LLM call (tokens, latency, model, user, endpoint).
+
+    record() only puts the entry on a queue, so it never blocks a request. A
+    background task drains the queue in batches (batch_size entries or every
+    flush_interval seconds), inserts the rows and folds them into the hourly and
+    daily rollup tables in the same transaction, off the event loop.
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 2.0, max_queue: int = 10000, enabled: bool = True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enabled = enabled
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.stats = {
+            "recorded": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "failed_batches": 0
+        }
+        self.last_error: Optional[str] = None
+
+    def attribute(self, user_id: Optional[int] = None, route: Optional[str] = None):
+        """Attribute LLM calls made from the current context; returns a token for reset()."""
+        return llm_usage_context.set({"user_id": user_id, "route": route})
+
+    def reset(self, token):
+        llm_usage_context.reset(token)
+
+    def record(
+        self,
+        provider: str,
+        model: Optional[str],
+        endpoint: str,
+        usage: Optional[Dict[str, int]],
+        latency_ms: float,
+        error: Optional[str] = None
+    ):
+        """Queue one call for writing. Drops the entry (and counts it) if the queue is full."""
+        if not self.enabled or database.SessionLocal is None:
+            return
+        self._ensure_writer()
+        usage = usage or {}
+        context = llm_usage_context.get()
+        entry = {
+            "created_at": datetime.now(timezone.utc),
+            "user_id": context.get("user_id"),
+            "route": context.get("route"),
+            "endpoint": endpoint,
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "cached_tokens": usage.get("cached_tokens", 0),
+            "latency_ms": round(latency_ms, 2),
+            "success": error is None,
+            "error": error
+        }
+        try:
+            self._queue.put_nowait(entry)
+            self.stats["recorded"] += 1
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+
+    def _ensure_writer(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            self.last_error = str(e)
+            print(f"LLM usage ledger: failed to write {len(batch)} entries: {e}")
+
+    # Database writes (run in a worker thread)
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        for attempt in range(2):
+            db = database.SessionLocal()
+            try:
+                db.bulk_insert_mappings(LLMUsage, batch)
+                self._apply_rollup(db, LLMUsageHourly, self._aggregate(batch, _hour))
+                self._apply_rollup(db, LLMUsageDaily, self._aggregate(batch, _day))
+                db.commit()
+                return
+            except IntegrityError:
+                # Without an upsert, another worker created the same rollup row first; redo the batch
+                db.rollback()
+                if attempt:
+                    raise
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    @staticmethod
+    def _aggregate(batch: List[Dict[str, Any]], bucket_of) -> Dict[Tuple, Dict[str, Any]]:
+        totals: Dict[Tuple, Dict[str, Any]] = {}
+        for entry in batch:
+            key = (bucket_of(entry["created_at"]),) + tuple(
+                _ROLLUP_SENTINELS.get(name) if entry[name] is None else entry[name] for name in _ROLLUP_KEY
+            )
+            total = totals.setdefault(key, {
+                "calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "cached_tokens": 0, "total_latency_ms": 0.0, "max_latency_ms": 0.0
+            })
+            total["calls"] += 1
+            total["errors"] += 0 if entry["success"] else 1
+            total["prompt_tokens"] += entry["prompt_tokens"]
+            total["completion_tokens"] += entry["completion_tokens"]
+            total["cached_tokens"] += entry["cached_tokens"]
+            total["total_latency_ms"] += entry["latency_ms"]
+            total["max_latency_ms"] = max(total["max_latency_ms"], entry["latency_ms"])
+        return totals
+
+    @staticmethod
+    def _apply_rollup(db, model, totals: Dict[Tuple, Dict[str, Any]]):
+        """
+        Add the batch totals to the rollup rows with an atomic upsert, so workers
+        flushing the same bucket at once never overwrite each other's counts.
+        """
+        if not totals:
+            return
+        table = model.__table__
+        rows = [dict(zip(("bucket",) + _ROLLUP_KEY, key), **total) for key, total in totals.items()]
+        dialect = db.get_bind().dialect.name
+        if dialect == "mysql":
+            stmt = mysql.insert(table)
+            stmt = stmt.on_duplicate_key_update(
+                **{name: table.c[name] + stmt.inserted[name] for name in _ROLLUP_SUMS},
+                max_latency_ms=func.greatest(table.c.max_latency_ms, stmt.inserted.max_latency_ms)
+            )
+            db.execute(stmt, rows)
+        elif dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+            # SQLite's two-argument max() is its scalar greatest()
+            greatest = func.max if dialect == "sqlite" else func.greatest
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["bucket", *_ROLLUP_KEY],
+                set_={
+                    **{name: table.c[name] + stmt.excluded[name] for name in _ROLLUP_SUMS},
+                    "max_latency_ms": greatest(table.c.max_latency_ms, stmt.excluded.max_latency_ms)
+                }
+            )
+            db.execute(stmt, rows)
+        else:
+            # No upsert: increment in place, insert the rows that did not exist yet
+            for row in rows:
+                result = db.execute(
+                    update(table)
+                    .where(and_(*(table.c[name] == row[name] for name in ("bucket",) + _ROLLUP_KEY)))
+                    .values(
+                        **{name: table.c[name] + row[name] for name in _ROLLUP_SUMS},
+                        max_latency_ms=case(
+                            (table.c.max_latency_ms < row["max_latency_ms"], row["max_latency_ms"]),
+                            else_=table.c.max_latency_ms
+                        )
+                    )
+                )
+                if result.rowcount == 0:
+                    db.execute(insert(table).values(**row))
+
+    async def flush(self):
+        """Write everything still queued (used on shutdown)."""
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        if self._queue is None:
+            return
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        for start in range(0, len(batch), self.batch_size):
+            await self._flush(batch[start:start + self.batch_size])
+
+    def summarize(
+        self,
+        db,
+        period: str = "hour",
+        group_by: str = "endpoint",
+        since_hours: int = 24,
+        user_id: Optional[int] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Top consumers from the rollup tables, ordered by total tokens."""
+        model = LLMUsageDaily if period == "day" else LLMUsageHourly
+        group_column = getattr(model, group_by)
+        since = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+        since = _day(since) if period == "day" else _hour(since)
+        total_tokens = func.sum(model.prompt_tokens + model.completion_tokens)
+        query = db.query(
+            group_column,
+            func.sum(model.calls),
+            func.sum(model.errors),
+            func.sum(model.prompt_tokens),
+            func.sum(model.completion_tokens),
+            func.sum(model.cached_tokens),
+            func.sum(model.total_latency_ms),
+            func.max(model.max_latency_ms),
+            total_tokens
+        ).filter(model.bucket >= since)
+        if user_id is not None:
+            query = query.filter(model.user_id == user_id)
+        rows = query.group_by(group_column).order_by(total_tokens.desc()).limit(limit).all()
+        return [
+            {
+                group_by: None if group_by in _ROLLUP_SENTINELS and row[0] == _ROLLUP_SENTINELS[group_by] else row[0],
+                "calls": row[1] or 0,
+                "errors": row[2] or 0,
+                "prompt_tokens": row[3] or 0,
+                "completion_tokens": row[4] or 0,
+                "cached_tokens": row[5] or 0,
+                "avg_latency_ms": round((row[6] or 0) / row[1], 2) if row[1] else 0.0,
+                "max_latency_ms": row[7] or 0.0,
+                "total_tokens": row[8] or 0
+            }
+            for row in rows
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "last_error": self.last_error
+        }
+
+
+# Global usage ledger
+usage_ledger = UsageLedger(
+    batch_size=settings.LLM_USAGE_BATCH_SIZE,
+    flush_interval=settings.LLM_USAGE_FLUSH_INTERVAL,
+    max_queue=settings.LLM_USAGE_QUEUE_SIZE,
+    enabled=settings.LLM_USAGE_LEDGER_ENABLED
+)
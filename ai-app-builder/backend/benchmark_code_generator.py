@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-project template generation with and without the rendered file cache.
+
+Usage: python benchmark_code_generator.py [iterations]
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Add the backend directory to the Python path
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, backend_dir)
+
+from app.services.code_generator import CodeGenerator, RenderedFileCache
+
+PROJECTS = [
+    {"project_type": project_type, "features": features}
+    for project_type in ("web_app", "dashboard", "ecommerce", "blog", "chat", "crm")
+    for features in (["authentication", "charts"], ["user_management", "mysql"], [])
+]
+
+
+async def generate_project(generator: CodeGenerator, analysis):
+    files = {}
+    files.update(await generator.generate_react_app(analysis))
+    files.update(await generator.generate_fastapi_app(analysis))
+    files.update(await generator.generate_database_schema(analysis))
+    files.update(await generator.generate_deployment_config(analysis))
+    return files
+
+
+async def run(generator: CodeGenerator, iterations: int) -> float:
+    """Average milliseconds per generated project."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for analysis in PROJECTS:
+            await generate_project(generator, analysis)
+    return (time.perf_counter() - started) * 1000 / (iterations * len(PROJECTS))
+
+
+async def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    uncached = CodeGenerator(RenderedFileCache(enabled=False))
+    cached = CodeGenerator(RenderedFileCache(max_entries=256))
+
+    # Same output either way
+    for analysis in PROJECTS:
+        assert await generate_project(uncached, analysis) == await generate_project(cached, analysis)
+
+    before = await run(uncached, iterations)
+    after = await run(cached, iterations)
+
+    print(f"Projects per run: {len(PROJECTS)}, iterations: {iterations}")
+    print(f"Before (templates rebuilt per request): {before:.3f} ms/project")
+    print(f"After (memoized per project_type/features): {after:.3f} ms/project")
+    print(f"Speedup: {before / after:.1f}x")
+    print(f"Cache: {cached.cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
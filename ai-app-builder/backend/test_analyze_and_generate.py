@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.ai_agent import AIAgentService
+from app.services.prompt_templates import prompt_templates
+
+ANALYSIS = {
+    "project_type": "dashboard",
+    "features": ["charts", "user_authentication"],
+    "integrations": ["stripe"],
+    "tech_stack": {"frontend": "react", "backend": "fastapi", "database": "mysql"},
+    "description": "A sales dashboard",
+    "database_schema": "users, sales",
+    "deployment": "docker",
+    "security_considerations": ["authentication"],
+    "performance_requirements": "standard",
+    "scalability": "moderate",
+    "complexity": "medium",
+    "estimated_time": "2 weeks"
+}
+
+
+def streaming_agent(analysis):
+    """
+    An agent whose model streams the given analysis in small chunks, keys in the
+    order the analysis prompt asks for them, and that counts generations.
+    """
+    agent = AIAgentService()
+    order = prompt_templates.get("analysis").requested_keys()
+    text = json.dumps({key: analysis[key] for key in order if key in analysis})
+    
+    async def stream(*args, **kwargs):
+        for i in range(0, len(text), 16):
+            await asyncio.sleep(0)
+            yield text[i:i + 16]
+    
+    agent._stream_response_with_best_service = stream
+    agent.generations = 0
+    generate_project_stream = agent.generate_project_stream
+    
+    async def counted(*args, **kwargs):
+        agent.generations += 1
+        return await generate_project_stream(*args, **kwargs)
+    
+    agent.generate_project_stream = counted
+    return agent
+
+
+async def run_analyze_and_generate(analysis):
+    agent = streaming_agent(analysis)
+    final, project = await agent.analyze_and_generate("Build a sales dashboard", "sales")
+    return agent.generations, final, project
+
+
+def test_well_formed_stream_generates_once():
+    """A well-formed analysis starts generation early and keeps that result."""
+    generations, final, project = asyncio.run(run_analyze_and_generate(ANALYSIS))
+    assert generations == 1, f"expected one generation, got {generations}"
+    assert final["integrations"] == ["stripe"]
+    assert project["files"]
+
+
+def test_missing_lists_match_their_defaults():
+    """Lists the model left out compare equal to empty ones."""
+    agent = AIAgentService()
+    without = {key: value for key, value in ANALYSIS.items() if key != "integrations"}
+    assert agent._generation_inputs(without, None) == agent._generation_inputs({**without, "integrations": []}, None)
+
+
+if __name__ == "__main__":
+    print("🚀 Testing analyze_and_generate...")
+    test_well_formed_stream_generates_once()
+    test_missing_lists_match_their_defaults()
+    print("✅ A well-formed analysis stream generates the project exactly once")